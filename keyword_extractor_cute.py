@@ -1,11 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, font
 import re
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional
 import json
+import math
 import os
 import time
 import random
+import heapq
+import bisect
+import csv
+import shutil
+import hashlib
+import sqlite3
+import unicodedata
+import threading
+import queue
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from itertools import islice
+from collections import OrderedDict
 import requests
 from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
@@ -15,40 +31,158 @@ try:
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 
 # ============================================================================
 # ヘルパークラス・関数
 # ============================================================================
 
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: str = 'utf-8', fsync: bool = False):
+    """一時ファイルに書いてから置き換える（途中で失敗しても元のファイルは壊れない）
+
+    一時ファイルは同じディレクトリに一意な名前で作るため、複数のプロセスが同時に保存しても衝突しない
+    """
+    f = tempfile.NamedTemporaryFile(mode, encoding=None if 'b' in mode else encoding,
+                                    dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp', delete=False)
+    try:
+        with f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.remove(f.name)
+        except OSError:
+            pass
+        raise
+
+
+class OperationCancelled(Exception):
+    """ジョブの停止により待機・通信が中断されたことを表す例外"""
+
+
+class CancellationToken:
+    """ジョブの停止・一時停止を待機中の処理にすぐ伝えるトークン"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()  # 一時停止中はクリア
+        self._running.set()
+        self._lock = threading.Lock()
+        self._responses = set()  # 受信中のHTTPレスポンス（停止時に閉じる）
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def reset(self):
+        """新しいジョブの開始前に状態を戻す"""
+        self._cancelled.clear()
+        self._running.set()
+
+    def cancel(self):
+        """停止を要求（待機中の処理を起こし、受信中のレスポンスを閉じる）"""
+        self._cancelled.set()
+        self._running.set()
+        with self._lock:
+            responses = list(self._responses)
+        for response in responses:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def sleep(self, seconds: float) -> bool:
+        """最大seconds秒待機（停止されたら即座に戻る）。停止されたらTrueを返す"""
+        if seconds > 0:
+            self._cancelled.wait(seconds)
+        return self.cancelled
+
+    def wait_if_paused(self) -> bool:
+        """一時停止中は再開か停止まで待機。停止されたらTrueを返す"""
+        self._running.wait()
+        return self.cancelled
+
+    def checkpoint(self):
+        """一時停止中なら待機し、停止されていれば OperationCancelled を送出"""
+        if self.wait_if_paused():
+            raise OperationCancelled()
+
+    def track(self, response):
+        """受信中のレスポンスを登録（停止時に閉じて受信を中断）"""
+        with self._lock:
+            self._responses.add(response)
+
+    def untrack(self, response):
+        with self._lock:
+            self._responses.discard(response)
+
+
 class RateLimiter:
     """スクレイピングのレート制限を管理するクラス"""
 
-    def __init__(self, min_delay=4.0, max_delay=9.0, penalty=30.0):
+    def __init__(self, min_delay=4.0, max_delay=9.0, penalty=30.0, cancel_token: CancellationToken = None):
         """
         Args:
             min_delay: 最小待機時間（秒）
             max_delay: 最大待機時間（秒）
             penalty: ペナルティ時の追加待機時間（秒）
+            cancel_token: 待機を中断するためのトークン（省略時は中断しない）
         """
         self.min = min_delay
         self.max = max_delay
         self.penalty = penalty
+        self.cancel_token = cancel_token
         self.last_request_time = 0
         self.multiplier = 1.0  # 待機時間の倍率
         self.consecutive_errors = 0
+        self.lock = threading.Lock()  # 複数スレッドからのwait()で送信時刻の枠を重複させない
 
     def wait(self):
         """適切な待機時間を計算して待機"""
-        target_delay = random.uniform(self.min, self.max) * self.multiplier
-        elapsed = time.perf_counter() - self.last_request_time
-
-        if elapsed < target_delay:
-            wait_time = target_delay - elapsed
+        # 送信時刻の枠だけをロック内で予約し、待機はロックの外で行う（他のスレッドは次の枠を予約できる）
+        with self.lock:
+            target_delay = random.uniform(self.min, self.max) * self.multiplier
+            now = time.perf_counter()
+            wait_time = max(0.0, self.last_request_time + target_delay - now)
+            self.last_request_time = now + wait_time
+
+        if wait_time > 0:
             print(f"[WAIT] レート制限: {wait_time:.1f}秒待機中...")
-            time.sleep(wait_time)
-
-        self.last_request_time = time.perf_counter()
+            self.sleep(wait_time)
+
+        # 一時停止中はリクエストを送らずに待つ（再開した時刻を次の間隔の起点にする）
+        if self.cancel_token:
+            self.cancel_token.checkpoint()
+            with self.lock:
+                self.last_request_time = max(self.last_request_time, time.perf_counter())
+
+    def sleep(self, seconds: float):
+        """待機（停止されたら OperationCancelled を送出）"""
+        if self.cancel_token:
+            if self.cancel_token.sleep(seconds):
+                raise OperationCancelled()
+        else:
+            time.sleep(seconds)
 
     def penalize(self, hard=False):
         """エラー検出時に待機時間を延長"""
@@ -58,7 +192,7 @@ class RateLimiter:
             self.consecutive_errors += 1
             print(f"[WARNING] 重度エラー検出: 待機時間を{self.multiplier:.1f}倍に延長")
             # 即座にペナルティ待機
-            time.sleep(self.penalty)
+            self.sleep(self.penalty)
         else:
             # 429エラーなどの軽度のペナルティ
             self.multiplier = min(4.0, self.multiplier * 1.5)
@@ -72,6 +206,87 @@ class RateLimiter:
             self.consecutive_errors = 0
             print(f"[OK] 成功: 待機時間を{self.multiplier:.1f}倍に回復")
 
+    def expected_delay(self) -> float:
+        """現在の倍率での1リクエストあたりの平均待機時間（秒）"""
+        return (self.min + self.max) / 2 * self.multiplier
+
+
+class ThroughputMeter:
+    """処理段階ごとの処理速度を指数加重移動平均（EWMA）で測るクラス
+
+    件数と経過時間をそれぞれhalf_life秒の半減期で減衰させて速度を求めるため、
+    直近の速度が重視され、イベントがまとめて届いても平均が偏らない。
+    バッチ間クールダウンや一時停止などの分かっている待機時間は速度から除き、
+    残り時間の見積もりで別に加算する。
+    """
+
+    def __init__(self, half_life: float = 60.0):
+        """
+        Args:
+            half_life: 過去の記録の重みが半分になるまでの時間（秒）
+        """
+        self.half_life = half_life
+        self.stages = {}  # 段階名 -> [減衰した件数, 減衰した経過時間, 前回の記録時刻, 除外する待機時間]
+        self.cooldown_until = 0.0
+        self.remaining_cooldowns = 0
+
+    def record(self, stage: str, count: int = 1, now: float = None):
+        """段階の処理完了をcount件記録"""
+        now = time.perf_counter() if now is None else now
+        state = self.stages.get(stage)
+        if state is None:
+            # 最初の記録は速度の起点にするだけ
+            self.stages[stage] = [0.0, 0.0, now, 0.0]
+            return
+
+        elapsed = max(0.0, now - state[2] - state[3])
+        decay = 0.5 ** (elapsed / self.half_life)
+        state[0] = state[0] * decay + count
+        state[1] = state[1] * decay + elapsed
+        state[2] = now
+        state[3] = 0.0
+
+    def add_idle(self, seconds: float):
+        """分かっている待機時間を次の記録の経過時間から除く"""
+        for state in self.stages.values():
+            state[3] += seconds
+
+    def start_cooldown(self, seconds: float, remaining_cooldowns: int, now: float = None):
+        """バッチ間クールダウンの開始を記録"""
+        now = time.perf_counter() if now is None else now
+        self.cooldown_until = now + seconds
+        self.remaining_cooldowns = remaining_cooldowns
+        self.add_idle(seconds)
+
+    def rate(self, stage: str) -> Optional[float]:
+        """段階の処理速度（件/秒）。記録が足りなければNone"""
+        state = self.stages.get(stage)
+        if state is None or state[1] <= 0:
+            return None
+        return state[0] / state[1]
+
+    def estimate_remaining(self, stage: str, remaining: int, cooldown: float = 0.0,
+                           min_interval: float = 0.0, now: float = None) -> Optional[float]:
+        """残り時間（秒）を見積もる
+
+        Args:
+            stage: 速度を使う段階
+            remaining: 残り件数
+            cooldown: 残りのバッチ間クールダウン1回あたりの秒数
+            min_interval: 1件あたりの最短間隔（レート制限の待機時間）
+        """
+        rate = self.rate(stage)
+        if rate is None or rate <= 0:
+            return None
+        now = time.perf_counter() if now is None else now
+
+        # 測った速度と現在のレート制限のうち遅い方で残り件数を処理する
+        seconds = remaining * max(1.0 / rate, min_interval)
+        seconds += max(0.0, self.cooldown_until - now)
+        if remaining > 0:
+            seconds += self.remaining_cooldowns * cooldown
+        return seconds
+
 
 def get_random_user_agent() -> str:
     """ランダムなUser-Agentを返す"""
@@ -98,18 +313,50 @@ def get_random_user_agent() -> str:
     return random.choice(user_agents)
 
 
-def create_session_with_retry(max_retries=5, backoff_factor=1.2) -> requests.Session:
-    """リトライ設定済みのrequests.Sessionを作成"""
+class CancellableRetry(Retry):
+    """リトライ間の待機を停止で中断できるurllib3のRetry"""
+
+    cancel_token = None
+
+    def new(self, **kw):
+        # urllib3はリトライのたびに新しいインスタンスを作るため、トークンを引き継ぐ
+        retry = super().new(**kw)
+        retry.cancel_token = self.cancel_token
+        return retry
+
+    def _wait(self, seconds: float):
+        if self.cancel_token:
+            if self.cancel_token.sleep(seconds):
+                raise OperationCancelled()
+        else:
+            time.sleep(seconds)
+
+    def sleep(self, response=None):
+        """リトライ前の待機（公開APIのsleepだけを置き換え、Retry-Afterとバックオフの計算はurllib3に任せる）"""
+        if self.respect_retry_after_header and response:
+            retry_after = self.get_retry_after(response)
+            if retry_after:
+                self._wait(retry_after)
+                return
+        backoff = self.get_backoff_time()
+        if backoff > 0:
+            self._wait(backoff)
+
+
+def create_session_with_retry(max_retries=5, backoff_factor=1.2,
+                              cancel_token: CancellationToken = None) -> requests.Session:
+    """リトライ設定済みのrequests.Sessionを作成（cancel_tokenでリトライ待機を中断可能）"""
     session = requests.Session()
 
     # リトライ戦略の設定
-    retry_strategy = Retry(
+    retry_strategy = CancellableRetry(
         total=max_retries,
         backoff_factor=backoff_factor,
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST"],
         raise_on_status=False  # ステータスコードでの例外を抑制
     )
+    retry_strategy.cancel_token = cancel_token
 
     # HTTPアダプターにリトライ戦略を適用
     adapter = HTTPAdapter(max_retries=retry_strategy)
@@ -119,14 +366,1720 @@ def create_session_with_retry(max_retries=5, backoff_factor=1.2) -> requests.Ses
     return session
 
 
+class AhoCorasick:
+    """複数パターンの部分文字列を1パスで検索するオートマトン（Aho-Corasick法）"""
+
+    def __init__(self, patterns: List[str]):
+        """
+        Args:
+            patterns: 検索するパターンのリスト（空文字列は無視）
+        """
+        self.patterns = []
+        self.goto = [{}]      # ノードごとの遷移表
+        self.fail = [0]       # 失敗遷移先
+        self.output = [[]]    # ノードで終わるパターン番号（失敗リンク先の分も含む）
+
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        """パターンをトライに追加"""
+        node = 0
+        for ch in pattern:
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        """幅優先探索で失敗遷移を構築"""
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                if self.output[self.fail[child]]:
+                    self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter_matches(self, text: str):
+        """(開始位置, 終了位置, パターン番号) を出現順に返す"""
+        node = 0
+        goto = self.goto
+        fail = self.fail
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_index in self.output[node]:
+                yield i + 1 - len(self.patterns[pattern_index]), i + 1, pattern_index
+
+    def contains_any(self, text: str) -> bool:
+        """いずれかのパターンがテキストに含まれるか"""
+        node = 0
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                return True
+        return False
+
+
+class _MatchingNormalizationTable(dict):
+    """str.translate用の変換表（文字ごとのNFKC正規化＋大文字小文字の畳み込みを遅延計算）"""
+
+    def __missing__(self, code: int) -> str:
+        normalized = unicodedata.normalize('NFKC', chr(code)).casefold()
+        self[code] = normalized
+        return normalized
+
+
+_MATCHING_TABLE = _MatchingNormalizationTable()
+
+
+def normalize_for_matching(text: str) -> Tuple[str, Optional[List[int]]]:
+    """照合用にテキストを正規化し、正規化後の各文字に対応する元の文字位置を返す
+
+    全角/半角を統一し（NFKC）、大文字小文字を畳み込む。文字数が変わらない場合は
+    位置が1対1で対応するため、位置リストの代わりにNoneを返す。
+    """
+    normalized = text.translate(_MATCHING_TABLE)
+    if len(normalized) == len(text) and '\u3099' not in normalized and '\u309A' not in normalized:
+        return normalized, None
+
+    chars = []
+    offsets = []
+    for i, ch in enumerate(text):
+        for normalized_ch in _MATCHING_TABLE[ord(ch)]:
+            # 半角カナの濁点・半濁点は直前の文字と合成（ｶﾞ → ガ）
+            if normalized_ch in '\u3099\u309A' and chars:
+                composed = unicodedata.normalize('NFC', chars[-1] + normalized_ch)
+                if len(composed) == 1:
+                    chars[-1] = composed
+                    continue
+            chars.append(normalized_ch)
+            offsets.append(i)
+    return ''.join(chars), offsets
+
+
+def _is_ascii_alnum(ch: str) -> bool:
+    """ASCII英数字かどうか"""
+    return ch.isascii() and ch.isalnum()
+
+
+class BrandMatcher:
+    """ブランド辞書をまとめて照合するマッチャー（正規化・最左最長一致）"""
+
+    # キャッシュ形式を変更した場合は上げる
+    CACHE_VERSION = 2
+
+    def __init__(self, brands: List[str]):
+        """
+        Args:
+            brands: ブランド名のリスト（先に出現したものを表記の代表とする）
+        """
+        keys = {}
+        for brand in brands:
+            key, _ = normalize_for_matching(brand.strip())
+            if key and key not in keys:
+                keys[key] = brand.strip()
+        self.brands = list(keys.values())
+        self.automaton = AhoCorasick(list(keys))
+
+    def find_span(self, title: str) -> Tuple[int, int]:
+        """タイトル中で最も左にあり、その中で最も長いブランド名の元の位置 (開始, 終了) を返す（なければ (-1, -1)）"""
+        normalized, offsets = normalize_for_matching(title)
+        best_start = best_end = -1
+
+        for start, end, _ in self.automaton.iter_matches(normalized):
+            # 英数字のブランドは単語の途中に一致させない（例: "HP" と "SHAMPOO"）
+            if start > 0 and _is_ascii_alnum(normalized[start]) and _is_ascii_alnum(normalized[start - 1]):
+                continue
+            if end < len(normalized) and _is_ascii_alnum(normalized[end - 1]) and _is_ascii_alnum(normalized[end]):
+                continue
+            if best_start < 0 or start < best_start or (start == best_start and end > best_end):
+                best_start, best_end = start, end
+
+        if best_start < 0 or offsets is None:
+            return best_start, best_end
+        original_end = offsets[best_end] if best_end < len(offsets) else len(title)
+        return offsets[best_start], original_end
+
+    def find(self, title: str) -> str:
+        """タイトル中で最も左にあり、その中で最も長いブランド名を元の表記のまま返す"""
+        start, end = self.find_span(title)
+        return title[start:end] if start >= 0 else ""
+
+    @classmethod
+    def load(cls, brands: List[str], cache_path: str = ".brand_matcher.cache") -> 'BrandMatcher':
+        """コンパイル済みマッチャーをディスクキャッシュから読み込み（辞書が変わっていれば再構築）
+
+        キャッシュはJSON（読み込みでコードが実行されることはない）。表の形が合わなければ再構築する
+        """
+        signature = hashlib.sha1(
+            f"{cls.CACHE_VERSION}\n".encode('utf-8') + '\n'.join(brands).encode('utf-8')
+        ).hexdigest()
+
+        try:
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                automaton = cached.get('automaton') if isinstance(cached, dict) else None
+                if cached.get('signature') == signature and isinstance(automaton, dict) \
+                        and len(automaton['goto']) == len(automaton['fail']) == len(automaton['output']):
+                    # オートマトンの表だけを保存しているので、構築処理を省いて復元できる
+                    matcher = cls.__new__(cls)
+                    matcher.brands = cached['brands']
+                    matcher.automaton = AhoCorasick.__new__(AhoCorasick)
+                    matcher.automaton.patterns = automaton['patterns']
+                    matcher.automaton.goto = automaton['goto']
+                    matcher.automaton.fail = automaton['fail']
+                    matcher.automaton.output = automaton['output']
+                    return matcher
+        except Exception as e:
+            print(f"[WARNING] ブランド辞書キャッシュ読み込みエラー: {e}")
+
+        matcher = cls(brands)
+        try:
+            cached = {
+                'signature': signature,
+                'brands': matcher.brands,
+                'automaton': {
+                    'patterns': matcher.automaton.patterns,
+                    'goto': matcher.automaton.goto,
+                    'fail': matcher.automaton.fail,
+                    'output': matcher.automaton.output,
+                },
+            }
+            with atomic_write(cache_path) as f:
+                json.dump(cached, f, ensure_ascii=False, separators=(',', ':'))
+        except Exception as e:
+            print(f"[WARNING] ブランド辞書キャッシュ保存エラー: {e}")
+        return matcher
+
+
+class BrandStore:
+    """スクレイピングで取得したブランド名の学習ストア（出現回数付き、ブランド名順でディスク保存）
+
+    1回しか見ていない名前や短すぎる名前・ブランドでない表記は記録だけして照合には使わない
+    """
+
+    MIN_COUNT = 2  # 照合に使うまでに必要な出現回数
+    MIN_LENGTH = 2  # 照合に使う名前の最短文字数
+    # ブランド欄に入っていてもブランド名ではない表記（NFKC・小文字で比較）
+    STOPLIST = {
+        'ノーブランド', 'ノーブランド品', 'ノンブランド', 'ブランド不明', 'ブランドなし', 'なし',
+        'その他', '不明', '汎用', '汎用品', 'generic', 'unbranded', 'no brand', 'nobrand',
+        'none', 'unknown', 'other', 'n/a', 'na', 'not applicable',
+    }
+
+    def __init__(self, filepath: str = "learned_brands.json"):
+        """
+        Args:
+            filepath: 保存先のJSONファイル
+        """
+        self.filepath = filepath
+        self.counts = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """保存済みのブランドと出現回数を読み込み"""
+        try:
+            if os.path.exists(self.filepath):
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.counts = {brand: count for brand, count in data.get('brands', [])}
+                print(f"[OK] 学習済みブランドを読み込みました: {len(self.counts)}件 ({self.filepath})")
+        except Exception as e:
+            print(f"[WARNING] 学習済みブランド読み込みエラー: {e}")
+            self.counts = {}
+
+    def add(self, brand: str) -> bool:
+        """ブランドの出現を記録（この出現で照合に使えるようになったらTrue）"""
+        brand = brand.strip()
+        if not brand or len(brand) > 50:
+            return False
+        count = self.counts.get(brand, 0) + 1
+        self.counts[brand] = count
+        self.dirty = True
+        return count == self.MIN_COUNT and self.is_usable(brand, count)
+
+    def is_usable(self, brand: str, count: int) -> bool:
+        """照合に使えるブランドか（出現回数・文字数・除外リスト）"""
+        if count < self.MIN_COUNT or len(brand) < self.MIN_LENGTH:
+            return False
+        return unicodedata.normalize('NFKC', brand).lower() not in self.STOPLIST
+
+    def brands(self) -> List[str]:
+        """照合に使えるブランド名をブランド名順で返す（実行ごとに順序が変わらずマッチャーのキャッシュが効く）"""
+        return sorted(brand for brand, count in self.counts.items() if self.is_usable(brand, count))
+
+    def save(self):
+        """ブランド名順のソート済み配列として保存（一時ファイルに書いてから置き換え）"""
+        if not self.dirty:
+            return
+        try:
+            data = {'brands': sorted([brand, count] for brand, count in self.counts.items())}
+            with atomic_write(self.filepath) as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            self.dirty = False
+            print(f"[OK] 学習済みブランド保存: {len(self.counts)}件 ({self.filepath})")
+        except Exception as e:
+            print(f"[WARNING] 学習済みブランド保存エラー: {e}")
+
+
+class TranslationCache:
+    """翻訳結果の永続キャッシュ（(テキスト, 翻訳元, 翻訳先) → 翻訳結果）"""
+
+    def __init__(self, filepath: str = ".translation_cache.json"):
+        """
+        Args:
+            filepath: 保存先のJSONファイル
+        """
+        self.filepath = filepath
+        self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # 翻訳ステージのワーカーから同時に読み書きされるため（件数の集計も含む）
+        self.load()
+
+    @staticmethod
+    def _key(text: str, src: str, dest: str) -> str:
+        return f"{src}\t{dest}\t{text}"
+
+    def load(self):
+        """保存済みの翻訳結果を読み込み"""
+        try:
+            if os.path.exists(self.filepath):
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                print(f"[OK] 翻訳キャッシュを読み込みました: {len(self.entries)}件 ({self.filepath})")
+        except Exception as e:
+            print(f"[WARNING] 翻訳キャッシュ読み込みエラー: {e}")
+            self.entries = {}
+
+    def get(self, text: str, src: str, dest: str):
+        """キャッシュ済みの翻訳結果を返す（なければNone）"""
+        key = self._key(text, src, dest)
+        with self.lock:
+            translated = self.entries.get(key)
+            if translated is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return translated
+
+    def put(self, text: str, src: str, dest: str, translated: str):
+        """翻訳結果を記録"""
+        with self.lock:
+            self.entries[self._key(text, src, dest)] = translated
+            self.dirty = True
+
+    def save(self):
+        """キャッシュを保存（一時ファイルに書いてから置き換え）"""
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = dict(self.entries)
+            self.dirty = False
+        try:
+            with atomic_write(self.filepath) as f:
+                json.dump(entries, f, ensure_ascii=False, separators=(',', ':'))
+        except Exception as e:
+            self.dirty = True
+            print(f"[WARNING] 翻訳キャッシュ保存エラー: {e}")
+
+
+# 組み込みの対訳辞書（glossary.txt で追加・上書き可能）
+GLOSSARY_JA_TO_EN = {
+    '靴': 'Shoes', 'バッグ': 'Bag', '時計': 'Watch', 'スマホ': 'Phone',
+    'カメラ': 'Camera', 'ノートパソコン': 'Laptop', 'タブレット': 'Tablet',
+    'ヘッドホン': 'Headphones', 'スピーカー': 'Speaker', 'ジャケット': 'Jacket',
+    'シャツ': 'Shirt', 'パンツ': 'Pants', 'ドレス': 'Dress', 'ワンピース': 'Dress',
+    '化粧品': 'Cosmetic', '香水': 'Perfume', 'おもちゃ': 'Toy', '本': 'Book',
+    'ゲーム': 'Game', '黒': 'Black', '白': 'White', '赤': 'Red', '青': 'Blue',
+    '緑': 'Green', '黄': 'Yellow', 'ピンク': 'Pink', '紫': 'Purple',
+    'オレンジ': 'Orange', '茶': 'Brown', '灰': 'Gray', '銀': 'Silver', '金': 'Gold'
+}
+GLOSSARY_EN_TO_JA = {
+    'Shoes': '靴', 'Bag': 'バッグ', 'Watch': '時計', 'Phone': 'スマホ',
+    'Camera': 'カメラ', 'Laptop': 'ノートパソコン', 'Tablet': 'タブレット',
+    'Headphones': 'ヘッドホン', 'Speaker': 'スピーカー', 'Jacket': 'ジャケット',
+    'Shirt': 'シャツ', 'Pants': 'パンツ', 'Dress': 'ドレス',
+    'Cosmetic': '化粧品', 'Perfume': '香水', 'Toy': 'おもちゃ', 'Book': '本',
+    'Game': 'ゲーム', 'Black': '黒', 'White': '白', 'Red': '赤', 'Blue': '青',
+    'Green': '緑', 'Yellow': '黄', 'Pink': 'ピンク', 'Purple': '紫',
+    'Orange': 'オレンジ', 'Brown': '茶', 'Gray': '灰', 'Silver': '銀', 'Gold': '金'
+}
+
+# 辞書で置換されなかった部分に残る文字（これがあれば辞書だけでは訳せていない）
+UNTRANSLATED_CHAR_PATTERN = re.compile(r'[^\W\d_]')
+# 漢字1文字の見出し語（「本」「金」など、数字の後では助数詞、他の漢字と続けば熟語の一部になる）
+KANJI_CHARS = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+SINGLE_KANJI_PATTERN = re.compile(f'[{KANJI_CHARS}]')
+
+
+class Glossary:
+    """オフライン対訳辞書（方向ごとに1つの正規表現にまとめて1パスで置換）"""
+
+    def __init__(self, filepath: str = "glossary.txt"):
+        """
+        Args:
+            filepath: ユーザー辞書（1行に「日本語=English」、#以降はコメント）
+        """
+        self.filepath = filepath
+        self.tables = {
+            ('ja', 'en'): dict(GLOSSARY_JA_TO_EN),
+            ('en', 'ja'): {en.lower(): ja for en, ja in GLOSSARY_EN_TO_JA.items()},
+        }
+        self.load()
+        self.patterns = {direction: self._compile(direction, table)
+                         for direction, table in self.tables.items()}
+
+    def load(self):
+        """ユーザー辞書を読み込み（組み込みの訳語より優先）"""
+        try:
+            if not os.path.exists(self.filepath):
+                return
+            count = 0
+            with open(self.filepath, 'r', encoding='utf-8-sig') as f:
+                for line in f:
+                    entry = line.split('#', 1)[0]
+                    if '=' not in entry:
+                        continue
+                    ja, en = (part.strip() for part in entry.split('=', 1))
+                    if not ja or not en:
+                        continue
+                    self.tables[('ja', 'en')][ja] = en
+                    self.tables[('en', 'ja')][en.lower()] = ja
+                    count += 1
+            print(f"[OK] 対訳辞書を読み込みました: {count}件 ({self.filepath})")
+        except Exception as e:
+            print(f"[WARNING] 対訳辞書読み込みエラー: {e}")
+
+    @staticmethod
+    def _compile(direction: Tuple[str, str], table: Dict[str, str]):
+        """見出し語を長い順に並べた1つの選択パターンにコンパイル"""
+        if not table:
+            return None
+        if direction[0] == 'en':
+            # 英語は大文字小文字を区別せず、英数字の単語の途中には一致させない
+            alternation = '|'.join(re.escape(term) for term in sorted(table, key=len, reverse=True))
+            return re.compile(rf'(?<![A-Za-z0-9])(?:{alternation})(?![A-Za-z0-9])', re.IGNORECASE)
+
+        # 漢字1文字の見出し語は単独の場合だけ一致させる（「5本」の助数詞や「日本」の一部は訳さない）
+        single_kanji = [term for term in table if SINGLE_KANJI_PATTERN.fullmatch(term)]
+        terms = [term for term in table if not SINGLE_KANJI_PATTERN.fullmatch(term)]
+        alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        if single_kanji:
+            standalone = rf'(?<![0-9０-９{KANJI_CHARS}])[{"".join(single_kanji)}](?![{KANJI_CHARS}])'
+            alternation = f'{alternation}|{standalone}' if alternation else standalone
+        return re.compile(alternation)
+
+    def translate(self, text: str, src: str, dest: str) -> Optional[str]:
+        """辞書だけで訳しきれる場合は訳文を、そうでなければNoneを返す"""
+        table = self.tables.get((src, dest))
+        pattern = self.patterns.get((src, dest))
+        if pattern is None:
+            return None
+
+        # 完全一致は辞書引きのみ
+        translated = table.get(text.lower() if src == 'en' else text)
+        if translated is not None:
+            return translated
+
+        parts = []
+        last = 0
+        for match in pattern.finditer(text):
+            gap = text[last:match.start()]
+            if UNTRANSLATED_CHAR_PATTERN.search(gap):
+                return None
+            self._append(parts, gap, dest)
+            term = match.group(0)
+            self._append(parts, table[term.lower() if src == 'en' else term], dest)
+            last = match.end()
+        if not parts or UNTRANSLATED_CHAR_PATTERN.search(text, last):
+            return None
+        self._append(parts, text[last:], dest)
+        return ''.join(parts)
+
+    @staticmethod
+    def _append(parts: List[str], piece: str, dest: str):
+        """訳文に続けて追加（英語は英数字どうしが続く場合に空白を挟む: ピンク黒 → Pink Black）"""
+        if not piece:
+            return
+        if dest == 'en' and parts and _is_ascii_alnum(parts[-1][-1]) and _is_ascii_alnum(piece[0]):
+            parts.append(' ')
+        parts.append(piece)
+
+
+# ASINの形式（英大文字・数字10文字）
+ASIN_PATTERN = re.compile(r'^[A-Z0-9]{10}$')
+
+
+class InputSource:
+    """入力ファイル（TXT/CSV/TSV）から1行ずつASINまたはタイトルを読み出す入力ソース
+
+    ファイル全体をメモリやテキストエリアに読み込まず、反復するたびにファイルを先頭から読む。
+    ASINは読みながら正規化（大文字化）と形式チェックを行い、無効な行は飛ばして件数を数える
+    """
+
+    def __init__(self, path: str, kind: str = 'asin', column: int = 0, skip_header: bool = False,
+                 encoding: str = 'utf-8-sig'):
+        """
+        Args:
+            path: 入力ファイル（拡張子 .csv はカンマ区切り、.tsv はタブ区切り、それ以外は1行1件）
+            kind: 'asin' または 'title'
+            column: CSV/TSVで使う列番号（0始まり）
+            skip_header: CSV/TSVの1行目を見出しとして飛ばすか
+            encoding: 文字コード
+        """
+        self.path = path
+        self.kind = kind
+        self.column = column
+        self.skip_header = skip_header
+        self.encoding = encoding
+        ext = os.path.splitext(path)[1].lower()
+        self.delimiter = {'.csv': ',', '.tsv': '\t'}.get(ext)
+        self.invalid_count = 0  # 直前の反復で飛ばした無効な行の数
+        self._count = None
+        self._fingerprint = None
+
+    def read_header(self) -> List[str]:
+        """1行目の列（列の選択用）"""
+        with open(self.path, 'r', encoding=self.encoding, newline='') as f:
+            if self.delimiter:
+                return next(csv.reader(f, delimiter=self.delimiter), [])
+            line = f.readline().rstrip('\r\n')
+            return [line] if line else []
+
+    def _rows(self, f):
+        # 各行から使う列の値を取り出す
+        if not self.delimiter:
+            for line in f:
+                yield line
+            return
+        reader = csv.reader(f, delimiter=self.delimiter)
+        if self.skip_header:
+            next(reader, None)
+        column = self.column
+        for row in reader:
+            yield row[column] if column < len(row) else ''
+
+    def __iter__(self):
+        self.invalid_count = 0
+        with open(self.path, 'r', encoding=self.encoding, errors='replace', newline='') as f:
+            for line_no, value in enumerate(self._rows(f), 1):
+                value = value.strip()
+                if not value:
+                    continue
+                if self.kind == 'asin':
+                    value = value.upper()
+                    if not ASIN_PATTERN.match(value):
+                        self.invalid_count += 1
+                        if self.invalid_count <= 10:
+                            print(f"警告: 無効なASIN（{line_no}行目）: {value[:40]}")
+                        continue
+                yield value
+        if self.invalid_count:
+            print(f"[WARNING] 無効な行を{self.invalid_count}件スキップしました: {self.path}")
+
+    def _scan(self):
+        # 件数と内容のハッシュを1回の読み込みで計算
+        digest = hashlib.sha1(self.kind.encode('utf-8'))
+        count = 0
+        for value in self:
+            digest.update(value.encode('utf-8'))
+            digest.update(b'\n')
+            count += 1
+        self._count = count
+        self._fingerprint = digest.hexdigest()
+
+    def count(self) -> int:
+        """有効な行の件数"""
+        if self._count is None:
+            self._scan()
+        return self._count
+
+    def fingerprint(self) -> str:
+        """有効な行の内容のハッシュ（ジョブの識別に使用）"""
+        if self._fingerprint is None:
+            self._scan()
+        return self._fingerprint
+
+    def describe(self) -> Dict:
+        """ジョブ設定に保存する入力ソースの情報"""
+        return {
+            'path': os.path.abspath(self.path),
+            'kind': self.kind,
+            'column': self.column,
+            'skip_header': self.skip_header,
+            'encoding': self.encoding
+        }
+
+    @classmethod
+    def from_description(cls, description: Dict) -> 'InputSource':
+        return cls(**description)
+
+
+# 取得失敗理由の分類（not_found: 商品ページなし / blocked: ブロック・制限 / transient: 一時的な失敗）
+NOT_FOUND_FETCH_ERRORS = {'invalid_asin', 'http_404', 'http_410', 'not_found_page', 'not_found_cached'}
+BLOCKED_FETCH_ERRORS = {'http_429', 'http_403', 'http_503', 'captcha'}
+DEAD_LETTER_REPORT_LIMIT = 20  # 処理完了時に表示する取得できなかったASINの件数
+
+# Amazonの「ページが見つかりません」（犬の画像）ページの目印
+NOT_FOUND_PAGE_MARKERS = ('ページが見つかりません', "Sorry! We couldn't find that page", 'Page Not Found')
+
+# ブランド名だけを取得する場合の受信の打ち切り位置
+# （po-brandの行を受信し終えたか、bylineとproductOverviewより後にある商品の特徴欄が始まったら）
+BRAND_SECTION_END_PATTERN = re.compile(
+    rb'<tr[^>]*po-brand[^>]*>.*?</tr>|id="(?:featurebullets_feature_div|feature-bullets)"', re.S)
+STOP_PATTERN_OVERLAP = 8192  # チャンクの境目をまたいで検索するバイト数
+# 打ち切り後の残りがこのバイト数以下なら読み捨てて接続を再利用する（それより多い・不明なら閉じる）
+DRAIN_LIMIT = 65536
+
+
+def classify_fetch_error(reason: str) -> str:
+    """取得失敗理由を not_found / blocked / transient に分類"""
+    if reason in NOT_FOUND_FETCH_ERRORS:
+        return 'not_found'
+    if reason in BLOCKED_FETCH_ERRORS:
+        return 'blocked'
+    return 'transient'
+
+
+class NegativeCache:
+    """存在しない（販売終了・削除済み）ASINの永続キャッシュ（有効期限付き）"""
+
+    def __init__(self, filepath: str = ".negative_cache.json", ttl_days: float = 30.0):
+        """
+        Args:
+            filepath: 保存先のJSONファイル
+            ttl_days: 記録の有効期限（日）
+        """
+        self.filepath = filepath
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.entries = {}  # "リージョン:ASIN" → {'reason': 理由, 'expires': 期限}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """保存済みのキャッシュを読み込み"""
+        try:
+            if os.path.exists(self.filepath):
+                with open(self.filepath, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                print(f"[OK] 存在しないASINのキャッシュを読み込みました: {len(self.entries)}件 ({self.filepath})")
+        except Exception as e:
+            print(f"[WARNING] 存在しないASINのキャッシュ読み込みエラー: {e}")
+            self.entries = {}
+
+    def get(self, asin: str, region: str) -> Optional[str]:
+        """期限内に記録されていれば失敗理由を返す"""
+        key = f"{region}:{asin}"
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires'] < time.time():
+            del self.entries[key]
+            self.dirty = True
+            return None
+        return entry['reason']
+
+    def add(self, asin: str, region: str, reason: str):
+        """存在しないASINを記録"""
+        self.entries[f"{region}:{asin}"] = {'reason': reason, 'expires': time.time() + self.ttl}
+        self.dirty = True
+
+    def save(self):
+        """キャッシュを保存（一時ファイルに書いてから置き換え）"""
+        if not self.dirty:
+            return
+        try:
+            with atomic_write(self.filepath) as f:
+                json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'))
+            self.dirty = False
+        except Exception as e:
+            print(f"[WARNING] 存在しないASINのキャッシュ保存エラー: {e}")
+
+
+class TranslationStage:
+    """キーワード翻訳をスクレイピングと並行してバックグラウンドで行うステージ
+
+    投入された結果はグループ（既定ではバッチ）ごとにまとめ、キーワードの重複を除いて一括で翻訳する
+    """
+
+    WAIT_SLICE = 0.2  # 完了待ちの間に停止を確認する間隔（秒）
+
+    def __init__(self, extractor: 'KeywordExtractor', max_workers: int = 2, group_size: int = 25):
+        """
+        Args:
+            extractor: 翻訳に使うKeywordExtractor
+            max_workers: 翻訳ワーカー数
+            group_size: この件数たまったらまとめて翻訳に回す（drain(wait=True)でも残りを回す）
+        """
+        self.extractor = extractor
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translate')
+        self.group_size = group_size
+        self.buffer = []  # まだ翻訳に回していない (result, payload)
+        self.pending = []  # (future, [(result, payload), ...])
+
+    def submit(self, result: Dict, payload=None):
+        """結果のキーワード翻訳を投入（完了後にdrainで受け取る）"""
+        self.buffer.append((result, payload))
+        if len(self.buffer) >= self.group_size:
+            self.flush()
+
+    def flush(self):
+        """たまった結果のキーワードをまとめて翻訳に回す"""
+        if not self.buffer:
+            return
+        entries, self.buffer = self.buffer, []
+        # ワーカーには結果の写し（翻訳方向を決めるタイトルとキーワード）だけを渡す
+        groups = [{'original_title': result['original_title'], 'keywords': list(result['keywords'])}
+                  for result, _ in entries]
+        future = self.executor.submit(self._translate, groups)
+        self.pending.append((future, entries))
+
+    def _translate(self, groups: List[Dict]) -> List[List[str]]:
+        # 翻訳方向ごとにグループ全体のキーワードを重複を除いて一括翻訳し、結果ごとに振り分ける
+        self.extractor.translate_results(groups)
+        return [group['translated_keywords'] for group in groups]
+
+    def drain(self, wait: bool = False) -> List[Tuple[Dict, object, Optional[str]]]:
+        """翻訳が完了した結果に translated_keywords を格納し、(結果, payload, エラー) を返す
+
+        wait=Trueならたまった結果も翻訳に回して全件完了を待つ（停止されたら待つのをやめ、完了した分だけを返す）
+        翻訳に失敗したグループの結果も捨てずに返す（translated_keywordsは原文のキーワード、エラーは失敗理由）
+        """
+        if wait:
+            self.flush()
+            token = self.extractor.cancel_token
+            not_done = [future for future, _ in self.pending]
+            while not_done and not token.cancelled:
+                _, not_done = futures_wait(not_done, timeout=self.WAIT_SLICE)
+
+        ready = []
+        still_pending = []
+        for future, entries in self.pending:
+            if not future.done():
+                still_pending.append((future, entries))
+                continue
+            try:
+                translated_lists = future.result()
+                error = None
+            except Exception as e:
+                # translate_manyが翻訳できなかったテキストを原文のまま返すのと同じく、原文のキーワードを残す
+                print(f"[WARNING] 翻訳ステージエラー: {len(entries)}件を原文のまま保存します ({e})")
+                translated_lists = [list(result['keywords']) for result, _ in entries]
+                error = str(e) or type(e).__name__
+            for (result, payload), translated in zip(entries, translated_lists):
+                result['translated_keywords'] = translated
+                ready.append((result, payload, error))
+        self.pending = still_pending
+        return ready
+
+    def shutdown(self, cancel: bool = False):
+        """ワーカーを停止（cancel=Trueなら未開始の翻訳を破棄）"""
+        if cancel:
+            for future, _ in self.pending:
+                future.cancel()
+            self.pending = []
+            self.buffer = []
+        self.executor.shutdown(wait=not cancel)
+
+
+class ProgressJournal:
+    """処理済みASINの追記型ジャーナル（JSONL追記ログ＋チェックポイント）
+
+    処理済みASINはジャーナル（.jsonl）にだけ追記する。スナップショット（.json）には統計と
+    チェックポイント（ジャーナルのどこまでを確定したか）だけを書き、統合のたびに全件を書き直さない。
+    処理済みASINの一覧はメモリに持たず、必要な時にiter_processed_asinsでファイルから少しずつ読み出す
+    """
+
+    def __init__(self, snapshot_path: str = ".progress.json", commit_every: int = 20,
+                 commit_interval: float = 2.0, compact_every: int = 1000):
+        """
+        Args:
+            snapshot_path: スナップショット（統計とチェックポイント）
+            commit_every: この件数たまったらジャーナルに書き出す
+            commit_interval: 前回の書き出しからこの秒数が経過したら書き出す
+            compact_every: 前回のチェックポイントからこの件数を追記したらチェックポイントを書く
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + '.jsonl'
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.compact_every = compact_every
+        self.count = 0  # 記録済みの件数
+        self.legacy_asins = []  # 旧形式のスナップショットに入っていたASIN（次のチェックポイントでジャーナルへ移す）
+        self.stats = None
+        self.buffer = []
+        self.journal_count = 0  # 前回のチェックポイント以降に追記した件数
+        self.checkpoint_offset = 0  # チェックポイント時点のジャーナルのバイト数
+        self.torn_tail = False
+        self.last_commit = time.perf_counter()
+
+    def exists(self) -> bool:
+        """進捗データが存在するか"""
+        return os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)
+
+    def load(self) -> Dict:
+        """スナップショット（統計・チェックポイント）を読み込み、ジャーナルの件数を数える"""
+        self.legacy_asins = []
+        self.checkpoint_offset = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.legacy_asins = snapshot.get('processed_asins', [])
+            self.checkpoint_offset = snapshot.get('journal_offset', 0)
+            self.stats = snapshot.get('stats')
+
+        self.journal_count = 0
+        if os.path.exists(self.journal_path):
+            if os.path.getsize(self.journal_path) < self.checkpoint_offset:
+                print(f"[WARNING] ジャーナルがチェックポイントより短くなっています: {self.journal_path}")
+                self.checkpoint_offset = 0
+            for _ in self._read_journal():
+                self.journal_count += 1
+        self.count = len(self.legacy_asins) + self.journal_count
+        return {'processed_count': self.count, 'stats': self.stats}
+
+    def _read_journal(self):
+        # ジャーナルのASINを1行ずつ返す（書き込み途中で中断された最終行は無視）
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # 改行で終わらない最終行の後ろに追記しないよう記録
+                self.torn_tail = not line.endswith('\n')
+                try:
+                    yield json.loads(line)['asin']
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    def iter_processed_asins(self, batch_size: int = 16384):
+        """記録済みのASINを記録順に batch_size 件ずつのリストで返す（一覧をメモリに載せない）
+
+        旧形式からの移行途中で中断した場合などは同じASINが複数回返ることがある
+        """
+        for i in range(0, len(self.legacy_asins), batch_size):
+            yield self.legacy_asins[i:i+batch_size]
+        if os.path.exists(self.journal_path):
+            asin_iter = self._read_journal()
+            while True:
+                batch = list(islice(asin_iter, batch_size))
+                if not batch:
+                    break
+                yield batch
+        if self.buffer:
+            yield list(self.buffer)
+
+    def append(self, asin: str):
+        """処理済みASINを記録（まとめて書き出す）"""
+        self.count += 1
+        self.buffer.append(asin)
+        if (len(self.buffer) >= self.commit_every or
+                time.perf_counter() - self.last_commit >= self.commit_interval):
+            self.flush()
+
+    def flush(self):
+        """バッファをジャーナルに追記（一定件数ごとにチェックポイントも書く）"""
+        self._write_buffer()
+        if self.journal_count >= self.compact_every:
+            self.compact(self.stats)
+
+    def _write_buffer(self):
+        self.last_commit = time.perf_counter()
+        if not self.buffer:
+            return
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        lines = ''.join(json.dumps({'asin': asin, 'time': timestamp}) + '\n' for asin in self.buffer)
+        if self.torn_tail:
+            lines = '\n' + lines
+            self.torn_tail = False
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_count += len(self.buffer)
+        self.buffer = []
+
+    def _migrate_legacy(self):
+        # 旧形式のスナップショットのASINをジャーナルの先頭に移す（1回だけ全件を書く）
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        with atomic_write(self.journal_path, fsync=True) as f:
+            for asin in self.legacy_asins:
+                f.write(json.dumps({'asin': asin, 'time': timestamp}) + '\n')
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'r', encoding='utf-8') as journal:
+                    shutil.copyfileobj(journal, f)
+        self.legacy_asins = []
+
+    def compact(self, stats: Dict = None):
+        """バッファを書き出し、統計とジャーナルの長さをチェックポイントとしてスナップショットに保存
+
+        ジャーナルは書き直さないため、書き込み量は記録した件数に比例する（一時ファイルに書いてから置き換え）
+        """
+        self._write_buffer()
+        if stats is not None:
+            self.stats = stats
+        if self.legacy_asins:
+            self._migrate_legacy()
+        self.checkpoint_offset = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+        progress_data = {
+            'processed_count': self.count,
+            'journal_offset': self.checkpoint_offset,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'stats': self.stats
+        }
+        with atomic_write(self.snapshot_path, fsync=True) as f:
+            json.dump(progress_data, f, ensure_ascii=False)
+        self.journal_count = 0
+
+    def clear(self):
+        """スナップショットとジャーナルを削除"""
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.count = 0
+        self.legacy_asins = []
+        self.buffer = []
+        self.journal_count = 0
+        self.checkpoint_offset = 0
+        self.torn_tail = False
+
+
+class BloomFilter:
+    """メモリ使用量を抑えた集合判定（偽陽性はあるが偽陰性はない）"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: 登録する件数の見込み
+            error_rate: 許容する偽陽性率
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @staticmethod
+    def _digest(item: str) -> bytes:
+        return hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+
+    def _positions(self, item: str):
+        # 1回のハッシュから2つの値を取り出し、二重ハッシュ法でk個の位置を作る
+        digest = self._digest(item)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [((h1 + i * h2) & 0xFFFFFFFFFFFFFFFF) % self.size for i in range(self.hash_count)]
+
+    def _positions_many(self, items: List[str]):
+        # _positionsと同じ位置をNumPyでまとめて計算（どちらも2^64を法として計算）
+        hashes = np.frombuffer(b''.join(map(self._digest, items)), dtype='<u8').reshape(-1, 2)
+        h1 = hashes[:, 0:1]
+        h2 = hashes[:, 1:2] | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            return (h1 + steps * h2) % np.uint64(self.size)
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def add_many(self, items: List[str]):
+        """まとめて登録"""
+        if not NUMPY_AVAILABLE:
+            for item in items:
+                self.add(item)
+            return
+        for i in range(0, len(items), 16384):
+            positions = self._positions_many(items[i:i+16384]).ravel()
+            bits = np.frombuffer(self.bits, dtype=np.uint8)
+            np.bitwise_or.at(bits, positions >> np.uint64(3),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def contains_many(self, items: List[str]) -> List[bool]:
+        """まとめて判定"""
+        if not NUMPY_AVAILABLE or not items:
+            return [item in self for item in items]
+        positions = self._positions_many(items)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        hits = bits[positions >> np.uint64(3)] & np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        return hits.all(axis=1).tolist()
+
+
+class JobStore:
+    """ASINごとの処理結果を保存するSQLiteジョブストア（再開時に結果ごと復元）"""
+
+    def __init__(self, filepath: str = ".progress.db"):
+        """
+        Args:
+            filepath: SQLiteデータベースファイル
+        """
+        self.filepath = filepath
+        self.conn = sqlite3.connect(filepath)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                asin TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                title TEXT,
+                brand TEXT,
+                keywords TEXT,
+                translated_keywords TEXT,
+                started_at REAL,
+                finished_at REAL,
+                attempts INTEGER DEFAULT 1,
+                error TEXT
+            )
+        """)
+        # 試行回数・失敗理由の列がない古いデータベースには列を追加
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if 'attempts' not in columns:
+            self.conn.execute("ALTER TABLE results ADD COLUMN attempts INTEGER DEFAULT 1")
+        if 'error' not in columns:
+            self.conn.execute("ALTER TABLE results ADD COLUMN error TEXT")
+        self.conn.commit()
+
+    def record(self, result: Dict, status: str, started_at: float, finished_at: float,
+               attempts: int = 1, error: str = ''):
+        """1件の処理結果を保存
+
+        status: 'completed'（完了）・'retry'（再試行待ち）・'failed'（再試行上限に達した失敗）
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(asin, status, title, brand, keywords, translated_keywords, started_at, finished_at, attempts, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (result['asin'], status, result.get('original_title', ''), result.get('brand', ''),
+             json.dumps(result.get('keywords', []), ensure_ascii=False),
+             json.dumps(result.get('translated_keywords', []), ensure_ascii=False),
+             started_at, finished_at, attempts, error)
+        )
+        self.conn.commit()
+
+    def update_translation(self, asin: str, translated_keywords: List[str]):
+        """後から完了した翻訳キーワードを保存"""
+        self.conn.execute(
+            "UPDATE results SET translated_keywords = ? WHERE asin = ?",
+            (json.dumps(translated_keywords, ensure_ascii=False), asin)
+        )
+        self.conn.commit()
+
+    def count(self) -> int:
+        """処理済み（再試行待ちを除く）の件数"""
+        return self.conn.execute("SELECT COUNT(*) FROM results WHERE status != 'retry'").fetchone()[0]
+
+    def existing(self, asins: List[str]) -> set:
+        """指定したASINのうち処理済みのものを返す（主キー索引で照合）"""
+        found = set()
+        asins = list(asins)
+        for i in range(0, len(asins), 500):
+            chunk = asins[i:i+500]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT asin FROM results WHERE asin IN ({placeholders}) AND status != 'retry'", chunk))
+        return found
+
+    def processed_asins(self) -> List[str]:
+        """処理済み（完了または再試行上限に達した失敗）のASIN"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT asin FROM results WHERE status != 'retry' ORDER BY rowid")]
+
+    def iter_processed_asins(self, batch_size: int = 16384):
+        """処理済みASINを記録順に batch_size 件ずつのリストで返す（一覧をメモリに載せない）"""
+        cursor = self.conn.execute("SELECT asin FROM results WHERE status != 'retry' ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [asin for (asin,) in rows]
+
+    def retry_attempts(self) -> Dict[str, int]:
+        """再試行待ちのASINとこれまでの試行回数"""
+        return dict(self.conn.execute("SELECT asin, attempts FROM results WHERE status = 'retry'"))
+
+    def dead_letters(self) -> List[Dict]:
+        """再試行上限に達したASINと失敗理由"""
+        return [{'asin': asin, 'attempts': attempts, 'error': error}
+                for asin, attempts, error in self.conn.execute(
+                    "SELECT asin, attempts, error FROM results WHERE status = 'failed' ORDER BY rowid")]
+
+    def iter_results(self, batch_size: int = 1000):
+        """保存済み（再試行待ちを除く）の結果を記録順に少しずつ返す（全件をメモリに載せない）"""
+        cursor = self.conn.execute(
+            "SELECT asin, status, title, brand, keywords, translated_keywords, started_at, finished_at "
+            "FROM results WHERE status != 'retry' ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for asin, status, title, brand, keywords, translated_keywords, started_at, finished_at in rows:
+                yield {
+                    'asin': asin,
+                    'status': status,
+                    'original_title': title,
+                    'translated_title': '',
+                    'brand': brand or '',
+                    'keywords': json.loads(keywords or '[]'),
+                    'translated_keywords': json.loads(translated_keywords or '[]'),
+                    'elapsed': (finished_at - started_at) if started_at and finished_at else None
+                }
+
+    def load_results(self, asins: List[str] = None) -> List[Dict]:
+        """指定したASINの保存済み結果を入力順に返す（asinsを省略すると全件を記録順に返す）"""
+        if asins is None:
+            return list(self.iter_results())
+        wanted = set(asins)
+        rows = {result['asin']: result for result in self.iter_results() if result['asin'] in wanted}
+        return [rows[asin] for asin in dict.fromkeys(asins) if asin in rows]
+
+    def iter_export_rows(self, batch_size: int = 1000):
+        """出力用の行（ASIN・タイトル・ブランド・キーワード・翻訳キーワード）を記録順に少しずつ返す"""
+        cursor = self.conn.execute(
+            "SELECT asin, title, brand, keywords, translated_keywords "
+            "FROM results WHERE status != 'retry' ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for asin, title, brand, keywords, translated_keywords in rows:
+                yield [asin, title or '', brand or '',
+                       ' '.join(json.loads(keywords or '[]')),
+                       ' '.join(json.loads(translated_keywords or '[]'))]
+
+    def close(self):
+        """接続を閉じる"""
+        self.conn.close()
+
+    @staticmethod
+    def delete_files(filepath: str = ".progress.db"):
+        """データベースファイル（WAL・共有メモリファイルを含む）を削除"""
+        for path in (filepath, filepath + '-wal', filepath + '-shm'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# 翻訳モード（none: 翻訳なし / auto: タイトルの言語から翻訳方向を自動判定）
+TRANSLATE_MODES = ('none', 'auto')
+# 旧バージョンの方向指定の翻訳モード（タイトルの言語で方向を決めるautoで処理する）
+LEGACY_TRANSLATE_MODES = {'ja_to_en': 'auto', 'en_to_ja': 'auto'}
+
+
+# 出力する列（JSONL・SQLiteのキー）とCSVの見出し
+EXPORT_COLUMNS = ['asin', 'title', 'brand', 'keywords', 'translated_keywords']
+EXPORT_HEADERS = ['ASIN', '商品タイトル', 'ブランド', 'キーワード', '翻訳キーワード']
+
+
+class ResultExporter:
+    """結果をCSV・TSV・JSONL・SQLiteに1行ずつ書き出すエクスポーター
+
+    行はその場で書き出すため件数に関係なくメモリ使用量は一定。flushすれば処理中でも
+    出力ファイルを読める（tail -f などで追跡可能）
+    """
+
+    FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.jsonl': 'jsonl',
+               '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}
+
+    def __init__(self, path: str, fmt: str = None, batch_size: int = 1000):
+        """
+        Args:
+            path: 出力ファイル（既存のファイルは上書き。SQLiteは以前の出力ファイルだけを上書きし、
+                  ジョブストアなど他のデータベースを指定した場合は ValueError を送出）
+            fmt: 'csv' / 'tsv' / 'jsonl' / 'sqlite'（省略時は拡張子から判定、不明ならcsv）
+            batch_size: SQLiteにまとめて書き込む件数
+        """
+        self.path = path
+        self.fmt = fmt or self.FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+        self.batch_size = batch_size
+        self.count = 0
+        self.file = None
+        self.conn = None
+        self.pending = []
+
+        if self.fmt == 'sqlite':
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            if not self._is_replaceable():
+                self.conn.close()
+                self.conn = None
+                raise ValueError(f"既存のデータベースには出力できません（別のファイル名を指定してください）: {path}")
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("DROP TABLE IF EXISTS results")
+            self.conn.execute(
+                "CREATE TABLE results (id INTEGER PRIMARY KEY, "
+                + ', '.join(f"{column} TEXT" for column in EXPORT_COLUMNS) + ")")
+            self.conn.commit()
+        elif self.fmt == 'jsonl':
+            self.file = open(path, 'w', encoding='utf-8')
+        else:
+            # ExcelでそのままCSVを開けるようBOM付きUTF-8
+            self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+            self.writer = csv.writer(self.file, delimiter='\t' if self.fmt == 'tsv' else ',')
+            self.writer.writerow(EXPORT_HEADERS)
+
+    def _is_replaceable(self) -> bool:
+        """SQLiteの出力先が空か、以前に出力したファイル（resultsテーブルだけで列も同じ）か"""
+        tables = [name for (name,) in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'")]
+        if not tables:
+            return True
+        if tables != ['results']:
+            return False
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+        return columns == ['id'] + EXPORT_COLUMNS
+
+    def write(self, values):
+        """1行を書き出す（値の順番はEXPORT_COLUMNS）"""
+        if self.fmt == 'sqlite':
+            self.pending.append(tuple(values))
+            if len(self.pending) >= self.batch_size:
+                self._write_pending()
+        elif self.fmt == 'jsonl':
+            self.file.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False) + '\n')
+        else:
+            self.writer.writerow(values)
+        self.count += 1
+
+    def write_many(self, rows) -> int:
+        """複数行を順に書き出して書き出した件数を返す"""
+        start = self.count
+        for values in rows:
+            self.write(values)
+        return self.count - start
+
+    def _write_pending(self):
+        if self.pending:
+            self.conn.executemany(
+                f"INSERT INTO results ({', '.join(EXPORT_COLUMNS)}) VALUES ({', '.join('?' * len(EXPORT_COLUMNS))})",
+                self.pending)
+            self.conn.commit()
+            self.pending = []
+
+    def flush(self):
+        """書き出した行をファイルに反映"""
+        if self.conn:
+            self._write_pending()
+        else:
+            self.file.flush()
+
+    def close(self):
+        """残りを書き出して閉じる"""
+        if self.conn:
+            self._write_pending()
+            self.conn.close()
+            self.conn = None
+        elif self.file:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TitleIndex:
+    """キーワード検証用のタイトルインデックス（タイトルごとに1回だけ構築）"""
+
+    def __init__(self, title: str, title_words: List[str]):
+        """
+        Args:
+            title: 商品タイトル
+            title_words: タイトルから抽出した単語のリスト
+        """
+        self.title_lower = title.lower()
+        words_lower = [word.lower() for word in title_words]
+        self.word_set = set(words_lower)
+        # 単語は空白を含まないため、改行区切りで連結しても単語をまたいだ一致は起きない
+        self.joined_words = '\n'.join(words_lower)
+        self.word_automaton = AhoCorasick(words_lower)
+        self._word_cache = {}
+
+    def contains_phrase(self, phrase_lower: str) -> bool:
+        """フレーズ全体がタイトルに含まれるか"""
+        return phrase_lower in self.title_lower
+
+    def has_word(self, word_lower: str) -> bool:
+        """単語がタイトルの単語と一致・包含関係にあるか"""
+        cached = self._word_cache.get(word_lower)
+        if cached is not None:
+            return cached
+
+        exists = (
+            word_lower in self.word_set                        # 完全一致
+            or word_lower in self.joined_words                 # タイトル単語の一部
+            or self.word_automaton.contains_any(word_lower)    # タイトル単語を含む
+        )
+        self._word_cache[word_lower] = exists
+        return exists
+
+
+# タイトルの区切り文字（スペース、カンマ、スラッシュ、パイプ、括弧など）
+TITLE_SEPARATOR_CHARS = r'\s,，、。・/／｜|\[\]()（）【】「」『』'
+# 日本語文字（ひらがな・カタカナ・漢字）
+JAPANESE_CHARS = r'\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF'
+# タイトルを1パスで単語に分割するパターン
+#   1. 日本語を含まない部分（区切り文字から区切り文字まで）はそのまま1単語
+#   2. 日本語を含む部分はカタカナの連続、漢字の連続、英数字の連続を単語とする
+#      （「・」はカタカナのブロックに含まれるが区切り文字として扱う）
+TITLE_TOKEN_PATTERN = re.compile(
+    rf'(?:(?<=[{TITLE_SEPARATOR_CHARS}])|^)[^{TITLE_SEPARATOR_CHARS}{JAPANESE_CHARS}]+(?![^{TITLE_SEPARATOR_CHARS}])'
+    r'|[\u30A0-\u30FA\u30FC-\u30FF]+|[\u4E00-\u9FAF]+|[A-Za-z0-9\-_]+'
+)
+JAPANESE_CHAR_PATTERN = re.compile(rf'[{JAPANESE_CHARS}]')
+DIGIT_PATTERN = re.compile(r'\d')
+ALL_CAPS_PATTERN = re.compile(r'^[A-Z]{2,}$')
+CAPITALIZED_PATTERN = re.compile(r'^[A-Z]')
+BRACKET_BRAND_PATTERNS = (re.compile(r'【([^】]+)】'), re.compile(r'\[([^\]]+)\]'))
+CAPS_BRAND_PATTERN = re.compile(r'\b[A-Z]{2,10}\b')
+KATAKANA_RUN_PATTERN = re.compile(r'^[\u30A0-\u30FF]+$')
+KANJI_RUN_PATTERN = re.compile(r'^[\u4E00-\u9FAF]+$')
+LATIN_RUN_PATTERN = re.compile(r'^[A-Za-z0-9\-_]+$')
+
+# 緩めモードでキーワードに含める大手ブランド
+LOOSE_MODE_MAJOR_BRANDS = ['Intel', 'AMD', 'NVIDIA', 'GIGABYTE', 'ASUS', 'MSI', 'Apple', 'Samsung', 'Sony']
+
+
+def tokenize_title(title: str) -> List[Tuple[str, int, int]]:
+    """タイトルを単語に分割し、(単語, 開始位置, 終了位置) のリストを返す（重複は最初の出現のみ）"""
+    tokens = []
+    seen = set()
+    for match in TITLE_TOKEN_PATTERN.finditer(title):
+        token = match.group()
+        if token not in seen:
+            seen.add(token)
+            tokens.append((token, match.start(), match.end()))
+    return tokens
+
+
+def extract_words_from_title(title: str) -> List[str]:
+    """タイトルから実際に存在する単語を抽出する（位置が不要な場合の高速版）"""
+    return list(dict.fromkeys(TITLE_TOKEN_PATTERN.findall(title)))
+
+
+def find_pattern_brand(title: str) -> str:
+    """【ブランド名】→[ブランド名]→大文字の連続（2-10文字）の順でブランド名を推定"""
+    for pattern in BRACKET_BRAND_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            return match.group(1)
+
+    match = CAPS_BRAND_PATTERN.search(title)
+    if match:
+        return match.group(0)
+
+    return ""
+
+
+def classify_script(token: str) -> str:
+    """トークンの文字種を判定（katakana / kanji / latin / mixed）"""
+    if KATAKANA_RUN_PATTERN.match(token):
+        return 'katakana'
+    if KANJI_RUN_PATTERN.match(token):
+        return 'kanji'
+    if LATIN_RUN_PATTERN.match(token):
+        return 'latin'
+    return 'mixed'
+
+
+class AnalyzedTitle:
+    """1つのタイトルの解析結果（全ての抽出ステージで共有する読み取り専用データ）"""
+
+    def __init__(self, title: str):
+        """
+        Args:
+            title: 商品タイトル
+        """
+        self.title = title
+        self.language = 'ja' if JAPANESE_CHAR_PATTERN.search(title) else 'en'
+
+        # トークンとトークンごとの特徴量（インデックスで対応）
+        spans = tokenize_title(title)
+        self.tokens = tuple(token for token, _, _ in spans)
+        self.offsets = tuple((start, end) for _, start, end in spans)
+        self.tokens_lower = tuple(token.lower() for token in self.tokens)
+        self.scripts = tuple(classify_script(token) for token in self.tokens)
+        self.has_digit = tuple(bool(DIGIT_PATTERN.search(token)) for token in self.tokens)
+        self.has_hyphen = tuple('-' in token or '_' in token for token in self.tokens)
+        self.all_caps = tuple(bool(ALL_CAPS_PATTERN.match(token)) for token in self.tokens)
+        self.capitalized = tuple(bool(CAPITALIZED_PATTERN.match(token)) for token in self.tokens)
+
+        self._index = None
+        self._pattern_brand = None
+
+    @property
+    def index(self) -> TitleIndex:
+        """キーワード検証用インデックス（初回アクセス時に構築）"""
+        if self._index is None:
+            self._index = TitleIndex(self.title, self.tokens)
+        return self._index
+
+    @property
+    def pattern_brand(self) -> str:
+        """【】・[]・大文字の連続から推定したブランド名（初回アクセス時に計算）"""
+        if self._pattern_brand is None:
+            self._pattern_brand = find_pattern_brand(self.title)
+        return self._pattern_brand
+
+
+# タイトル入力の処理で重複タイトルの結果を使い回す直近のタイトル数（解析のLRUキャッシュと同じ件数）
+TITLE_DEDUP_WINDOW = 4096
+
+
+@lru_cache(maxsize=4096)
+def analyze_title(title: str) -> AnalyzedTitle:
+    """タイトルを解析（同じタイトルはLRUキャッシュから返す）"""
+    return AnalyzedTitle(title)
+
+
+# 絞り込み用の単語の区切り（タイトルの区切り文字と同じ）
+RESULT_TOKEN_PATTERN = re.compile(rf'[^{TITLE_SEPARATOR_CHARS}]+')
+
+
+def tokenize_for_search(text: str) -> List[str]:
+    """絞り込み用に全角/半角・大文字小文字をそろえて単語に分割"""
+    return RESULT_TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text).lower())
+
+
+class ResultIndex:
+    """結果の転置インデックス（単語 → 行番号）と列ごとの並び順のキャッシュ
+
+    行の追加・セルの更新に合わせて差分だけを反映する。絞り込みは各単語の前方一致で、
+    複数の単語はすべてを含む行（AND）に絞り込む
+    """
+
+    # 前方一致する単語がこれより多い短い単語は、索引の和集合ではなく行の単語列を走査する
+    SCAN_THRESHOLD = 2000
+
+    def __init__(self):
+        self.postings = {}  # 単語 → 行番号の集合
+        self.vocabulary = []  # 前方一致検索用にソートした単語の一覧
+        self.new_tokens = []  # まだvocabularyに入れていない新しい単語（検索時にまとめてソート）
+        self.row_texts = []  # 行ごとの単語を空白でつないだ文字列（短い単語の走査用）
+        self.sorted_orders = {}  # 列番号 → (並べ替え済みの行数, 行番号の並び)
+
+    def _tokens(self, values) -> set:
+        tokens = set()
+        for value in values:
+            tokens.update(tokenize_for_search(value))
+        return tokens
+
+    def _add_tokens(self, row_index: int, tokens: set):
+        postings = self.postings
+        for token in tokens:
+            rows = postings.get(token)
+            if rows is None:
+                rows = postings[token] = set()
+                self.new_tokens.append(token)
+            rows.add(row_index)
+
+    def add(self, row_index: int, values):
+        """行を索引に追加"""
+        tokens = self._tokens(values)
+        self._add_tokens(row_index, tokens)
+        self.row_texts.append(' ' + ' '.join(tokens) + ' ')
+
+    def update(self, row_index: int, column: int, old_value: str, values):
+        """セルの更新を反映（valuesは更新後の行）"""
+        tokens = self._tokens(values)
+        for token in set(tokenize_for_search(old_value)) - tokens:
+            self.postings[token].discard(row_index)
+        self._add_tokens(row_index, tokens)
+        self.row_texts[row_index] = ' ' + ' '.join(tokens) + ' '
+        self.sorted_orders.pop(column, None)
+
+    def clear(self):
+        self.postings = {}
+        self.vocabulary = []
+        self.new_tokens = []
+        self.row_texts = []
+        self.sorted_orders = {}
+
+    def search(self, query: str) -> Optional[set]:
+        """クエリの全単語に前方一致する行番号の集合（クエリが空ならNone）"""
+        terms = tokenize_for_search(query)
+        if not terms:
+            return None
+
+        # 追加された単語をまとめてソート済みの一覧に入れる（ほぼ整列済みのため高速）
+        if self.new_tokens:
+            self.vocabulary.extend(self.new_tokens)
+            self.vocabulary.sort()
+            self.new_tokens = []
+
+        matched = None
+        vocabulary = self.vocabulary
+        # 長い（一致する行が少ない）単語から絞り込む
+        for term in sorted(set(terms), key=len, reverse=True):
+            start = bisect.bisect_left(vocabulary, term)
+            end = bisect.bisect_left(vocabulary, term + '\U0010ffff', start)
+            if matched is not None and len(matched) < self.SCAN_THRESHOLD or end - start > self.SCAN_THRESHOLD:
+                # 候補が少ない、または一致する単語が多すぎる場合は行の単語列を直接調べる
+                needle = ' ' + term
+                candidates = matched if matched is not None else range(len(self.row_texts))
+                rows = {index for index in candidates if needle in self.row_texts[index]}
+            else:
+                rows = set()
+                for token in vocabulary[start:end]:
+                    rows |= self.postings[token]
+            matched = rows if matched is None else matched & rows
+            if not matched:
+                break
+        return matched
+
+    def sort_order(self, column: int, rows: List[List[str]]) -> List[int]:
+        """列の値で昇順に並べた行番号（前回以降に追加された行だけを並べ替えてマージ）"""
+        key = lambda index: rows[index][column].casefold()
+        sorted_count, order = self.sorted_orders.get(column, (0, []))
+        if sorted_count < len(rows):
+            new_rows = sorted(range(sorted_count, len(rows)), key=key)
+            order = list(heapq.merge(order, new_rows, key=key)) if order else new_rows
+            self.sorted_orders[column] = (len(rows), order)
+        return order
+
+
+class VirtualResultTable:
+    """結果テーブルの仮想化（全行はリストに保持し、Treeviewには表示中の行だけを置く）
+
+    絞り込み・並べ替えは ResultIndex から表示する行番号の並び（view）を作って行う。
+    仮想化するのは描画だけで、行の値と絞り込み用の索引はメモリに持つ（1行あたり約1.7KB、
+    10万行で約170MB）。それ以上の件数はライブ出力やジョブからのファイル出力で扱う
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar):
+        """
+        Args:
+            tree: 表示に使うTreeview
+            scrollbar: 縦スクロールバー（Treeviewではなくこのクラスがスクロール位置を管理）
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = []  # 全行の値（追加順）
+        self.index = ResultIndex()
+        self.query = ''  # 絞り込みの文字列
+        self.sort_column = None  # 並べ替える列（Noneなら追加順）
+        self.sort_descending = False
+        self.view = None  # 表示する行番号の並び（絞り込み・並べ替えなしならNone）
+        self.view_dirty = False
+        self.items = []  # 表示用に使い回すTreeviewの行ID
+        self.top = 0  # 表示中の先頭の位置
+        self.visible_count = 20
+        self.follow_tail = True  # 末尾を表示中なら追加に合わせて自動スクロール
+        self.render_pending = False
+
+        scrollbar.config(command=self.yview)
+        tree.bind('<Configure>', lambda e: self.update_visible_count())
+        tree.bind('<MouseWheel>', self.on_mousewheel)
+        tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        tree.bind('<Button-5>', lambda e: self.scroll(3))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def display_count(self) -> int:
+        """表示対象の行数（絞り込み後）"""
+        return len(self.view) if self.view is not None else len(self.rows)
+
+    def append(self, values) -> int:
+        """行を追加して行番号を返す（描画はまとめて行う）"""
+        row_index = len(self.rows)
+        self.rows.append(list(values))
+        self.index.add(row_index, self.rows[row_index])
+        if self.view is not None:
+            self.view_dirty = True
+        elif self.follow_tail:
+            self.top = max(0, len(self.rows) - self.visible_count)
+        self.schedule_render()
+        return row_index
+
+    def set_cell(self, index: int, column: int, value: str):
+        """1セルの値を更新"""
+        old_value = self.rows[index][column]
+        self.rows[index][column] = value
+        self.index.update(index, column, old_value, self.rows[index])
+        if self.view is not None:
+            self.view_dirty = True
+            self.schedule_render()
+        elif self.top <= index < self.top + self.visible_count:
+            self.schedule_render()
+
+    def clear(self):
+        """全行を削除（絞り込み・並べ替えの設定は残す）"""
+        self.rows = []
+        self.index.clear()
+        self.top = 0
+        self.follow_tail = True
+        self.view_dirty = True
+        self.render()
+
+    def set_filter(self, query: str):
+        """絞り込みの文字列を設定"""
+        self.query = query
+        self.view_dirty = True
+        self.top = 0
+        self.follow_tail = False  # 先頭から表示
+        self.schedule_render()
+
+    def set_sort(self, column: Optional[int], descending: bool = False):
+        """並べ替える列を設定（Noneなら追加順）"""
+        self.sort_column = column
+        self.sort_descending = descending
+        self.view_dirty = True
+        self.top = 0
+        self.follow_tail = False  # 先頭から表示
+        self.schedule_render()
+
+    def update_view(self):
+        """絞り込み・並べ替えの結果から表示する行番号の並びを作り直す"""
+        self.view_dirty = False
+        matched = self.index.search(self.query)
+        if self.sort_column is None:
+            self.view = sorted(matched) if matched is not None else None
+        else:
+            order = self.index.sort_order(self.sort_column, self.rows)
+            if matched is not None:
+                order = [index for index in order if index in matched]
+            self.view = order[::-1] if self.sort_descending else order
+        if self.follow_tail:
+            self.top = max(0, self.display_count() - self.visible_count)
+
+    def item_index(self, item_id: str) -> Optional[int]:
+        """表示中の行IDから行番号を返す"""
+        if item_id not in self.items:
+            return None
+        position = self.top + self.items.index(item_id)
+        if position >= self.display_count():
+            return None
+        return self.view[position] if self.view is not None else position
+
+    def schedule_render(self):
+        # 連続した追加・更新は次のアイドル時に1回だけ描画
+        if not self.render_pending:
+            self.render_pending = True
+            self.tree.after_idle(self.render)
+
+    def render(self):
+        """表示範囲の行だけをTreeviewに反映"""
+        self.render_pending = False
+        if self.view_dirty:
+            self.update_view()
+        count = max(0, min(self.visible_count, self.display_count() - self.top))
+
+        # 表示用の行を必要数だけ用意（余った行は削除）
+        while len(self.items) < count:
+            self.items.append(self.tree.insert('', 'end'))
+        while len(self.items) > count:
+            self.tree.delete(self.items.pop())
+
+        view = self.view
+        for offset, item_id in enumerate(self.items):
+            position = self.top + offset
+            row_index = view[position] if view is not None else position
+            # 交互の背景色は表示位置から決める
+            tags = ('oddrow',) if position % 2 == 0 else ('evenrow',)
+            self.tree.item(item_id, values=self.rows[row_index], tags=tags)
+
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = self.display_count()
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_count) / total))
+
+    def update_visible_count(self):
+        """ウィジェットの高さから表示できる行数を計算"""
+        row_height = 20
+        header_height = 25
+        if self.items:
+            bbox = self.tree.bbox(self.items[0])
+            if bbox:
+                header_height, row_height = bbox[1], bbox[3]
+        visible_count = max(1, (self.tree.winfo_height() - header_height) // max(1, row_height))
+        if visible_count != self.visible_count:
+            self.visible_count = visible_count
+            self.scroll_to(self.top)
+
+    def scroll_to(self, top: int):
+        """指定した位置が先頭になるようにスクロール"""
+        if self.view_dirty:
+            self.update_view()
+        max_top = max(0, self.display_count() - self.visible_count)
+        self.top = max(0, min(top, max_top))
+        self.follow_tail = self.top >= max_top
+        self.render()
+
+    def scroll(self, delta: int):
+        self.scroll_to(self.top + delta)
+        return 'break'
+
+    def yview(self, *args):
+        """スクロールバーからの操作"""
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.display_count()))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_count
+            self.scroll(amount)
+
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+
 # ============================================================================
 # メインクラス
 # ============================================================================
 
 class KeywordExtractor:
     def __init__(self):
-        self.translator = None  # Google Translate APIを一時的に無効化
-        self.common_brands = self.load_brands()
+        self.jobs_dir = ".jobs"  # ジョブごとの進捗・結果の保存先
+        # ジョブの停止・一時停止（レート制限・リトライ・クールダウン・翻訳の待機と受信中の通信を中断）
+        self.cancel_token = CancellationToken()
+        self.last_fetch_error = ''  # 直前の商品ページ取得の失敗理由
+        self.last_job_id = None  # 直前のprocess_asinsのジョブID（結果の出力に使う）
+        self.negative_cache = NegativeCache()
+        self.translators = threading.local()  # Google翻訳クライアント（スレッドごとに初回翻訳時に作成）
+        self.translation_cache = TranslationCache()
+        self.glossary = Glossary()
+        # 翻訳リクエスト用のレート制限（スクレイピングとは独立）
+        self.translation_rate_limiter = RateLimiter(min_delay=0.5, max_delay=1.0, penalty=10.0,
+                                                    cancel_token=self.cancel_token)
+        # ブランド辞書（組み込み＋外部辞書＋スクレイピングで学習したブランド）
+        self.brand_store = BrandStore()
+        self.common_brands = self.load_brands() + self.load_brand_dictionary() + self.brand_store.brands()
+        self.common_brand_set = set(self.common_brands)  # 学習時の重複チェック用
+        self.brand_matcher = BrandMatcher.load(self.common_brands)
+        # 今回の実行中に新しく学習したブランド（次回起動時に辞書へ統合）
+        self.session_brands = []
+        self.session_brand_matcher = None
         self.gemini_model = None
         self.use_ai = False
 
@@ -136,12 +2089,14 @@ class KeywordExtractor:
         # スクレイピング用のセッションとレート制限
         self.session = create_session_with_retry(
             max_retries=self.scraping_config['max_retries'],
-            backoff_factor=self.scraping_config['backoff_factor']
+            backoff_factor=self.scraping_config['backoff_factor'],
+            cancel_token=self.cancel_token
         )
         self.rate_limiter = RateLimiter(
             min_delay=self.scraping_config['min_delay'],
             max_delay=self.scraping_config['max_delay'],
-            penalty=self.scraping_config['penalty_delay']
+            penalty=self.scraping_config['penalty_delay'],
+            cancel_token=self.cancel_token
         )
 
         # メトリクス追跡
@@ -150,7 +2105,8 @@ class KeywordExtractor:
             'success': 0,
             'failed': 0,
             'captcha_count': 0,
-            'http_errors': 0
+            'http_errors': 0,
+            'not_found_skipped': 0
         }
 
         self.setup_gemini()
@@ -165,6 +2121,7 @@ class KeywordExtractor:
             'penalty_delay': 30.0,
             'batch_size': 25,
             'batch_cooldown': 60,
+            'brand_batch_cooldown': 0,
             'max_retries': 5,
             'backoff_factor': 1.2
         }
@@ -209,6 +2166,30 @@ class KeywordExtractor:
             "ニトリ", "ダイソー", "セリア", "カインズ"
         ]
 
+    def learn_brand(self, brand: str):
+        """商品ページから取得したブランド名を学習ストアに記録"""
+        brand = brand.strip()
+        # 照合に使える回数に達したブランドは今回の実行中から照合に使う
+        if self.brand_store.add(brand) and brand not in self.common_brand_set:
+            self.common_brand_set.add(brand)
+            self.session_brands.append(brand)
+            self.session_brand_matcher = None  # 次回照合時に再構築
+
+    def load_brand_dictionary(self, filepath: str = "brands.txt") -> List[str]:
+        """外部ブランド辞書（1行に1ブランド、#以降はコメント）を読み込み"""
+        brands = []
+        try:
+            if os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8-sig') as f:
+                    for line in f:
+                        brand = line.split('#', 1)[0].strip()
+                        if brand:
+                            brands.append(brand)
+                print(f"[OK] ブランド辞書を読み込みました: {len(brands)}件 ({filepath})")
+        except Exception as e:
+            print(f"[WARNING] ブランド辞書読み込みエラー: {e}")
+        return brands
+
     def setup_gemini(self):
         """Gemini APIを設定"""
         if not GEMINI_AVAILABLE:
@@ -263,46 +2244,16 @@ class KeywordExtractor:
 
     def _extract_words_from_title(self, title: str) -> List[str]:
         """タイトルから実際に存在する単語を抽出する"""
-        words = []
+        return list(self.analyze_title(title).tokens)
 
-        # 基本的な区切り文字で分割
-        # スペース、カンマ、スラッシュ、パイプ、括弧などで分割
-        import re
-
-        # 複数の区切り文字で分割
-        # 日本語の場合は助詞なども考慮
-        pattern = r'[\s,，、。・/／｜|\[\]()（）【】「」『』]+'
-        parts = re.split(pattern, title)
-
-        for part in parts:
-            if not part:
-                continue
-
-            # 日本語が含まれる場合の処理
-            if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', part):
-                # 日本語の単語抽出
-                # カタカナの連続、漢字の連続、英数字の連続を単語として抽出
-                japanese_words = re.findall(r'[\u30A0-\u30FF]+|[\u4E00-\u9FAF]+|[A-Za-z0-9\-_]+', part)
-                words.extend(japanese_words)
-            else:
-                # 英語の場合はそのまま追加
-                if part and len(part) > 0:
-                    words.append(part)
-
-        # 空文字列を除去し、重複を排除（順序を保持）
-        seen = set()
-        result = []
-        for word in words:
-            if word and word not in seen:
-                seen.add(word)
-                result.append(word)
-
-        return result
+    def analyze_title(self, title: str) -> 'AnalyzedTitle':
+        """タイトルの解析結果を取得（LRUキャッシュ済み）"""
+        return analyze_title(title)
 
     def detect_language(self, text: str) -> str:
         """テキストの言語を検出"""
         # 日本語文字が含まれているかチェック
-        if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', text):
+        if JAPANESE_CHAR_PATTERN.search(text):
             return 'ja'
         return 'en'
 
@@ -310,71 +2261,150 @@ class KeywordExtractor:
         """テキストを指定言語に翻訳"""
         if not text:
             return ""
+        return self.translate_many([text], target_lang)[0]
 
-        # ENダッシュのみを置換（最小限の対策）
-        text = text.replace('\u2013', '-')
-
-        try:
+    def get_translator(self):
+        """このスレッド用の翻訳クライアント（googletransのTranslatorはスレッド間で共有しない）"""
+        translator = getattr(self.translators, 'translator', None)
+        if translator is None:
             from googletrans import Translator
-            translator = Translator()
+            translator = self.translators.translator = Translator()
+        return translator
+
+    def translate_many(self, texts: List[str], target_lang: str) -> List[str]:
+        """複数のテキストをまとめて翻訳（キャッシュ済みは再翻訳せず、未翻訳分は重複を除いて1件ずつ送信）"""
+        if target_lang == 'en':
+            src, dest = 'ja', 'en'
+        elif target_lang == 'ja':
+            src, dest = 'en', 'ja'
+        else:
+            return list(texts)
 
-            if target_lang == 'en':
-                result = translator.translate(text, src='ja', dest='en')
-            elif target_lang == 'ja':
-                result = translator.translate(text, src='en', dest='ja')
-            else:
-                return text
+        # ENダッシュのみを置換（最小限の対策）
+        normalized = [text.replace('\u2013', '-') for text in texts]
 
-            return result.text if result and result.text else text
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return text
+        translations = {}
+        pending = []
+        for text in dict.fromkeys(normalized):
+            if not text:
+                translations[text] = ""
+                continue
+            # 対訳辞書で訳しきれるものはネットワークを使わない
+            offline = self.glossary.translate(text, src, dest)
+            if offline is not None:
+                translations[text] = offline
+                continue
+            cached = self.translation_cache.get(text, src, dest)
+            if cached is None:
+                pending.append(text)
+            else:
+                translations[text] = cached
 
-    def extract_brand(self, title: str) -> str:
+        if pending:
+            cached_count = len(translations)
+            try:
+                translator = self.get_translator()
+
+                # googletrans 4.0.0rc1のtranslate()は文字列1件だけを受け付ける（リストを渡すと
+                # 1つのリクエストにまとめられ、結果も1件しか返らない）ため、レート制限の間隔で1件ずつ送信
+                translated_count = 0
+                for text in pending:
+                    # レート制限の待機はロックの外で行い、待機中も他の翻訳ワーカーを止めない
+                    self.translation_rate_limiter.wait()
+                    try:
+                        result = translator.translate(text, src=src, dest=dest)
+                    except Exception as e:
+                        print(f"Translation error: {text}: {e}")
+                        continue
+                    if result and isinstance(result.text, str) and result.text:
+                        translations[text] = result.text
+                        self.translation_cache.put(text, src, dest, result.text)
+                        translated_count += 1
+                print(f"[TRANSLATE] {translated_count}/{len(pending)}件を翻訳（キャッシュ利用: {cached_count}件）")
+            except OperationCancelled:
+                print("[STOP] 翻訳を中断しました")
+            except Exception as e:
+                print(f"Translation error: {e}")
+
+        # 翻訳できなかったテキストは原文のまま返す
+        return [translations.get(text, text) for text in normalized]
+
+    def translate_results(self, results: List[Dict]):
+        """複数の結果のキーワードをまとめて翻訳し、translated_keywords に格納"""
+        # タイトルの言語（解析済みのAnalyzedTitleの値）で翻訳方向を決め、方向ごとに全結果のキーワードを一括翻訳
+        by_target = {'en': [], 'ja': []}
+        for result in results:
+            language = self.analyze_title(result['original_title']).language
+            target_lang = 'en' if language == 'ja' else 'ja'
+            by_target[target_lang].append(result)
+
+        for target_lang, target_results in by_target.items():
+            if not target_results:
+                continue
+            texts = [kw for result in target_results for kw in result['keywords']]
+            translated = iter(self.translate_many(texts, target_lang))
+            for result in target_results:
+                result['translated_keywords'] = [next(translated) for _ in result['keywords']]
+
+    def save_caches(self):
+        """学習済みブランド・翻訳キャッシュ・存在しないASINのキャッシュを保存"""
+        self.brand_store.save()
+        self.translation_cache.save()
+        self.negative_cache.save()
+
+    def extract_brand(self, title: str, analyzed: 'AnalyzedTitle' = None) -> str:
         """商品タイトルからブランド名を抽出"""
-        title_upper = title.upper()
-
-        for brand in self.common_brands:
-            brand_upper = brand.upper()
-            if brand_upper in title_upper:
-                # 元のタイトルから正しい大文字小文字を取得
-                start_index = title_upper.index(brand_upper)
-                return title[start_index:start_index + len(brand)]
-
-        # ブランド名の一般的なパターンを検索
-        # 【ブランド名】パターン
-        match = re.search(r'【([^】]+)】', title)
-        if match:
-            return match.group(1)
-
-        # [ブランド名]パターン
-        match = re.search(r'\[([^\]]+)\]', title)
-        if match:
-            return match.group(1)
-
-        # 大文字の連続（2-10文字）をブランド名として検出
-        match = re.search(r'\b[A-Z]{2,10}\b', title)
-        if match:
-            return match.group(0)
-
-        return ""
-
-    def fetch_product_info_from_asin(self, asin: str, region: str = "jp") -> tuple:
-        """ASINからAmazonの商品タイトルとブランド名を取得（改善版）"""
+        # ブランド辞書との照合（全角/半角・大文字小文字を区別せず、最左最長一致）
+        start, end = self.brand_matcher.find_span(title)
+
+        # 今回の実行中に学習したブランドとも照合
+        if self.session_brands:
+            if self.session_brand_matcher is None:
+                self.session_brand_matcher = BrandMatcher(self.session_brands)
+            session_start, session_end = self.session_brand_matcher.find_span(title)
+            if session_start >= 0 and (start < 0 or session_start < start
+                                       or (session_start == start and session_end > end)):
+                start, end = session_start, session_end
+
+        if start >= 0:
+            # 元のタイトルの表記のまま返す
+            return title[start:end]
+
+        # ブランド名の一般的なパターン（【ブランド名】→[ブランド名]→大文字の連続）
+        return analyzed.pattern_brand if analyzed else find_pattern_brand(title)
+
+    def fetch_product_info_from_asin(self, asin: str, region: str = "jp", brand_only: bool = False) -> tuple:
+        """ASINからAmazonの商品タイトルとブランド名を取得（改善版）
+
+        失敗時は self.last_fetch_error に理由を記録する（分類は classify_fetch_error）。
+        存在しないと分かっているASINは取得せずにすぐ返す。
+        brand_only=Trueの場合はブランド欄（byline・po-brand）まで受信したら残りを読まない
+        """
+        self.last_fetch_error = ''
 
         if not asin:
             print(f"ASINが空です")
+            self.last_fetch_error = 'invalid_asin'
             self.scraping_stats['failed'] += 1
             return "", ""
 
         asin = asin.strip().upper()  # ASINを大文字に正規化
         if len(asin) != 10:
             print(f"ASIN長さエラー: {asin} (長さ: {len(asin)})")
+            self.last_fetch_error = 'invalid_asin'
             self.scraping_stats['failed'] += 1
             return "", ""
 
-        # メトリクス更新
-        self.scraping_stats['total'] += 1
+        # 存在しないと記録済みのASINはリクエストもレート制限の待機もしない
+        if self.negative_cache.get(asin, region):
+            print(f"[SKIP] 商品ページなし（記録済み）: {asin}")
+            self.last_fetch_error = 'not_found_cached'
+            self.scraping_stats['not_found_skipped'] += 1
+            return "", ""
+
+        # メトリクスの取得件数は応答を受信し終えた時点（または失敗が確定した時点）で数える
+        # （停止で中断した取得は数えない）
+        counted = False
 
         try:
             # レート制限による待機
@@ -399,18 +2429,32 @@ class KeywordExtractor:
             }
 
             # セッションを使用してリクエスト（自動リトライ機能付き）
-            response = self.session.get(url, headers=headers, timeout=15)
+            # 本文は分割して受信し、停止されたら受信途中でも中断する
+            response = self.session.get(url, headers=headers, timeout=15, stream=True)
+            self.read_response_body(response, stop_pattern=BRAND_SECTION_END_PATTERN if brand_only else None)
+            self.scraping_stats['total'] += 1
+            counted = True
 
             # HTTPエラーチェック（429などの場合）
             if response.status_code == 429:
                 print(f"[WARNING] レート制限エラー (429) 検出: {asin}")
                 self.rate_limiter.penalize(hard=False)
+                self.last_fetch_error = 'http_429'
                 self.scraping_stats['http_errors'] += 1
                 self.scraping_stats['failed'] += 1
                 return "", ""
 
             response.raise_for_status()
 
+            # 「ページが見つかりません」ページ（ステータス200で返る場合）
+            if any(marker in response.text for marker in NOT_FOUND_PAGE_MARKERS) and \
+                    'productTitle' not in response.text:
+                print(f"[WARNING] 商品ページなし: {asin}")
+                self.last_fetch_error = 'not_found_page'
+                self.negative_cache.add(asin, region, self.last_fetch_error)
+                self.scraping_stats['failed'] += 1
+                return "", ""
+
             soup = BeautifulSoup(response.content, 'html.parser')
 
             # CAPTCHAチェック
@@ -418,6 +2462,7 @@ class KeywordExtractor:
                 print(f"[WARNING] CAPTCHA検出 ({asin}): Amazonがボット対策でブロックしています")
                 print(f"[INFO] 対策: しばらく待機してから再試行します...")
                 self.rate_limiter.penalize(hard=True)  # 重度のペナルティ
+                self.last_fetch_error = 'captcha'
                 self.scraping_stats['captcha_count'] += 1
                 self.scraping_stats['failed'] += 1
                 return "", ""
@@ -446,6 +2491,7 @@ class KeywordExtractor:
 
             if not title:
                 print(f"[WARNING] タイトル取得失敗: {asin} (すべてのセレクターで失敗)")
+                self.last_fetch_error = 'no_title'
 
             # ブランド名を取得（複数のセレクターを順に試す）
             brand = ""
@@ -474,6 +2520,9 @@ class KeywordExtractor:
                             print(f"[OK] ブランド取得成功 ({selector}): {brand}")
                         except UnicodeEncodeError:
                             print(f"[OK] ブランド取得成功 ({selector})")
+                        # ブランド欄（po-brand・bylineInfo）から取れた名前はタイトル照合用に学習
+                        if 'po-brand' in selector or 'bylineInfo' in selector or selector == '#brand':
+                            self.learn_brand(brand)
                         break
 
             if not brand:
@@ -488,27 +2537,100 @@ class KeywordExtractor:
 
             return title, brand
 
+        except OperationCancelled:
+            print(f"[STOP] 取得を中断しました: {asin}")
+            self.last_fetch_error = 'cancelled'
+            return "", ""
         except requests.exceptions.HTTPError as e:
             print(f"HTTP エラー ({asin}): {e.response.status_code} - {e}")
+            self.last_fetch_error = f'http_{e.response.status_code}'
             self.scraping_stats['http_errors'] += 1
             self.scraping_stats['failed'] += 1
-            self.rate_limiter.penalize(hard=False)
+            if classify_fetch_error(self.last_fetch_error) == 'not_found':
+                # 存在しないASINは記録して次回以降は取得しない（レート制限のペナルティも不要）
+                self.negative_cache.add(asin, region, self.last_fetch_error)
+            else:
+                self.rate_limiter.penalize(hard=False)
             return "", ""
         except requests.exceptions.Timeout as e:
             print(f"タイムアウト エラー ({asin}): {e}")
+            self.last_fetch_error = 'timeout'
+            if not counted:
+                self.scraping_stats['total'] += 1
             self.scraping_stats['failed'] += 1
             return "", ""
         except requests.exceptions.RequestException as e:
             print(f"リクエスト エラー ({asin}): {e}")
+            self.last_fetch_error = 'request_error'
+            if not counted:
+                self.scraping_stats['total'] += 1
             self.scraping_stats['failed'] += 1
             return "", ""
         except Exception as e:
             print(f"予期しないエラー ({asin}): {type(e).__name__} - {e}")
+            self.last_fetch_error = f'unexpected_{type(e).__name__}'
             import traceback
             traceback.print_exc()
+            if not counted:
+                self.scraping_stats['total'] += 1
             self.scraping_stats['failed'] += 1
             return "", ""
 
+    def read_response_body(self, response: requests.Response, chunk_size: int = 16384,
+                           stop_pattern: 're.Pattern' = None):
+        """stream=Trueのレスポンス本文を読み込む（停止されたら OperationCancelled を送出）
+
+        読み込んだ本文はresponse.content・response.textからそのまま参照できる。
+        stop_patternを指定すると、一致する部分を受信した時点で残りを読まずに接続を閉じる
+        （残りの長さが分かっていてDRAIN_LIMIT以下なら、読み捨ててkeep-aliveの接続をプールに戻す）
+        """
+        token = self.cancel_token
+        token.track(response)
+        try:
+            if hasattr(response.raw, 'read1'):
+                # urllib3 2.x: 届いた分だけ読み込む（chunk_size分そろうまで待たない）
+                stream = iter(lambda: response.raw.read1(chunk_size, decode_content=True), b'')
+            else:
+                stream = response.iter_content(chunk_size=chunk_size)
+
+            chunks = []
+            tail = b''  # チャンクの境目をまたぐ一致を見逃さないよう前のチャンクの末尾も検索
+            for chunk in stream:
+                if token.cancelled:
+                    raise OperationCancelled()
+                chunks.append(chunk)
+                if stop_pattern is not None:
+                    window = tail + chunk
+                    if stop_pattern.search(window):
+                        self.release_stopped_response(response)
+                        break
+                    tail = window[-STOP_PATTERN_OVERLAP:]
+            # 以降の処理は通常のレスポンスと同じようにcontent・textを使う
+            response._content = b''.join(chunks)
+        except OperationCancelled:
+            response.close()
+            raise
+        except Exception:
+            # 停止時にレスポンスを閉じたことによる受信エラー
+            if token.cancelled:
+                raise OperationCancelled()
+            raise
+        finally:
+            token.untrack(response)
+
+    @staticmethod
+    def release_stopped_response(response: requests.Response):
+        """受信を打ち切ったレスポンスの接続を返す（残りが少なければ読み捨てて再利用）"""
+        # chunked転送などで残りの長さが分からない場合は、読み切るまで待たずに接続ごと閉じる
+        remaining = getattr(response.raw, 'length_remaining', None)
+        if remaining is not None and remaining <= DRAIN_LIMIT and hasattr(response.raw, 'drain_conn'):
+            try:
+                response.raw.drain_conn()
+                return
+            except Exception:
+                pass
+        response.close()
+
     def fetch_product_title_from_asin(self, asin: str) -> str:
         """後方互換性のためのメソッド"""
         title, _ = self.fetch_product_info_from_asin(asin)
@@ -519,49 +2641,286 @@ class KeywordExtractor:
     # ============================================================================
 
     def save_progress(self, processed_asins: List[str], filepath: str = ".progress.json"):
-        """処理済みASINをJSONファイルに保存"""
+        """処理済みASINでジャーナルを作り直し、チェックポイントを保存"""
         try:
-            progress_data = {
-                'processed_asins': processed_asins,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'stats': self.scraping_stats.copy()
-            }
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(progress_data, f, indent=2, ensure_ascii=False)
+            journal = ProgressJournal(filepath)
+            journal.clear()
+            journal.buffer = list(processed_asins)
+            journal.count = len(journal.buffer)
+            journal.compact(self.scraping_stats.copy())
             print(f"[OK] 進捗保存: {len(processed_asins)}件 ({filepath})")
         except Exception as e:
             print(f"[WARNING] 進捗保存エラー: {e}")
 
-    def load_progress(self, filepath: str = ".progress.json") -> Dict:
-        """保存された進捗をJSONファイルから読み込み"""
+    def load_progress(self, filepath: str = ".progress.json", journal: 'ProgressJournal' = None) -> Dict:
+        """保存された進捗の件数と統計を読み込み（journalを渡すとそのまま追記に使える）
+
+        処理済みASINの一覧は読み込まない（journal.iter_processed_asins()で少しずつ読み出す）
+        """
         try:
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    progress_data = json.load(f)
-                print(f"[OK] 進捗読み込み: {len(progress_data.get('processed_asins', []))}件 ({filepath})")
+            journal = journal or ProgressJournal(filepath)
+            if journal.exists():
+                progress_data = journal.load()
+                print(f"[OK] 進捗読み込み: {progress_data['processed_count']}件 ({filepath})")
                 return progress_data
             else:
                 print(f"[INFO] 進捗ファイルが存在しません: {filepath}")
-                return {'processed_asins': [], 'stats': None}
+                return {'processed_count': 0, 'stats': None}
         except Exception as e:
             print(f"[WARNING] 進捗読み込みエラー: {e}")
-            return {'processed_asins': [], 'stats': None}
+            return {'processed_count': 0, 'stats': None}
+
+    def processed_checker(self, job_store: 'JobStore', journal_batches,
+                          bloom_threshold: int = 1000000):
+        """処理済み判定を作成し、(判定関数, 処理済み件数) を返す
+
+        journal_batchesはジャーナルのASINをリストに分けて返すイテラブル
+        （ProgressJournal.iter_processed_asins()）で、1バッチずつストアと照合する。
+        判定関数はASINのチャンクを受け取り、そのうち処理済みのASINの集合を返す。
+        ジョブストアの処理済みが bloom_threshold 件以上なら、ストアから直接作ったブルームフィルタで
+        候補を絞り込み、ストアで正確に確認する（処理済みの一覧をメモリに持たない）
+        """
+        store_count = job_store.count()
+
+        # ジャーナルにだけ記録されているASIN（ジョブストア導入前の進捗など。通常は結果と同時に
+        # ストアへ記録されるため空）。ジャーナルはバッチごとに読み出し、一覧をメモリに載せない
+        journal_only = set()
+        for batch in journal_batches:
+            journal_only.update(set(batch) - job_store.existing(batch))
+        processed_count = store_count + len(journal_only)
+
+        if store_count >= bloom_threshold:
+            bloom = BloomFilter(store_count)
+            for batch in job_store.iter_processed_asins():
+                bloom.add_many(batch)
+            print(f"[INFO] ブルームフィルタで照合: 処理済み{store_count}件")
+
+            def check(chunk: List[str]) -> set:
+                candidates = [asin for asin, hit in zip(chunk, bloom.contains_many(chunk)) if hit]
+                return job_store.existing(candidates) | journal_only.intersection(chunk)
+        else:
+            processed = journal_only
+            for batch in job_store.iter_processed_asins():
+                processed.update(batch)
+
+            def check(chunk: List[str]) -> set:
+                return processed.intersection(chunk)
+
+        return check, processed_count
+
+    @staticmethod
+    def iter_unprocessed_asins(asins, check, chunk_size: int = 4096):
+        """入力順に未処理のASINだけを返す（処理済み判定は一定件数ずつまとめて行う）"""
+        asin_iter = iter(asins)
+        while True:
+            chunk = list(islice(asin_iter, chunk_size))
+            if not chunk:
+                return
+            processed = check(chunk)
+            for asin in chunk:
+                if asin not in processed:
+                    yield asin
+
+    def get_unprocessed_asins(self, all_asins: List[str], processed_asins: List[str],
+                              job_store: 'JobStore' = None,
+                              bloom_threshold: int = 1000000) -> List[str]:
+        """未処理のASINリストを返す
+
+        job_storeを指定した場合はジョブストアとprocessed_asins（ジャーナル）の両方を処理済みとし、
+        処理済みが多ければブルームフィルタで照合する（processed_checker参照）
+        """
+        if job_store is not None:
+            check, _ = self.processed_checker(job_store, [processed_asins], bloom_threshold)
+        else:
+            processed = set(processed_asins)
+
+            def check(chunk: List[str]) -> set:
+                return processed.intersection(chunk)
+        unprocessed = list(self.iter_unprocessed_asins(all_asins, check))
 
-    def get_unprocessed_asins(self, all_asins: List[str], processed_asins: List[str]) -> List[str]:
-        """未処理のASINリストを返す"""
-        unprocessed = [asin for asin in all_asins if asin not in processed_asins]
         print(f"[INFO] 未処理ASIN: {len(unprocessed)}件 / 全体: {len(all_asins)}件")
         return unprocessed
 
     def clear_progress(self, filepath: str = ".progress.json"):
-        """進捗ファイルを削除"""
+        """進捗ファイル（スナップショットとジャーナル）と全ジョブを削除"""
         try:
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            journal = ProgressJournal(filepath)
+            if journal.exists():
+                journal.clear()
                 print(f"[OK] 進捗ファイルを削除しました: {filepath}")
+            JobStore.delete_files()
+            for job in self.list_jobs():
+                self.delete_job(job['id'])
         except Exception as e:
             print(f"[WARNING] 進捗ファイル削除エラー: {e}")
 
+    # ============================================================================
+    # ジョブ管理関数
+    # ============================================================================
+
+    @staticmethod
+    def input_fingerprint(asins) -> str:
+        """入力リスト（またはInputSource）の内容のハッシュ
+
+        リストもInputSource.fingerprintと同じ計算にするため、同じASINのリストとファイルは同じ値になる
+        """
+        if isinstance(asins, InputSource):
+            return asins.fingerprint()
+        digest = hashlib.sha1(b'asin')
+        for asin in asins:
+            digest.update(asin.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def job_fingerprint(self, asins, region: str, mode: str, translate_mode: str,
+                        include_brand: bool, use_ai: bool = None) -> str:
+        """入力の内容・リージョン・抽出モード・翻訳モード・ブランドの扱い・プロンプトテンプレートからジョブIDを作成"""
+        if use_ai is None:
+            use_ai = self.use_ai
+        template = self.get_current_prompt_template() if use_ai else None
+        payload = json.dumps([self.input_fingerprint(asins), region, mode, translate_mode, include_brand, template],
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def job_paths(self, job_id: str) -> Dict[str, str]:
+        """ジョブごとのファイルパス（設定・進捗・結果ストア）"""
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        return {
+            'dir': job_dir,
+            'meta': os.path.join(job_dir, 'job.json'),
+            'progress': os.path.join(job_dir, 'progress.json'),
+            'store': os.path.join(job_dir, 'progress.db'),
+            'input': os.path.join(job_dir, 'input.txt'),
+        }
+
+    def create_job(self, asins, mode: str, translate_mode: str, include_brand: bool,
+                   region: str = "jp", use_ai: bool = None, name: str = None) -> str:
+        """ジョブを作成（同じ入力・設定のジョブがあればそれを使う）してジョブIDを返す
+
+        設定には件数と入力のハッシュ・入力ファイルの情報だけを保存する。
+        asinsがリストの場合はジョブのディレクトリに入力ファイル（1行1件）として書き出し、再開時はそこから読む
+        """
+        if use_ai is None:
+            use_ai = self.use_ai
+        job_id = self.job_fingerprint(asins, region, mode, translate_mode, include_brand, use_ai)
+        paths = self.job_paths(job_id)
+        if os.path.exists(paths['meta']):
+            return job_id
+
+        os.makedirs(paths['dir'], exist_ok=True)
+        created_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        total = asins.count() if isinstance(asins, InputSource) else len(asins)
+        meta = {
+            'id': job_id,
+            'name': name or f"{created_at} ({total}件)",
+            'created_at': created_at,
+            'region': region,
+            'mode': mode,
+            'translate_mode': translate_mode,
+            'include_brand': include_brand,
+            'use_ai': use_ai,
+            'total': total,
+            'input_hash': self.input_fingerprint(asins)
+        }
+        if isinstance(asins, InputSource):
+            meta['source'] = asins.describe()
+        else:
+            with atomic_write(paths['input']) as f:
+                for asin in asins:
+                    f.write(asin + '\n')
+            meta['source'] = InputSource(paths['input']).describe()
+        with atomic_write(paths['meta']) as f:
+            json.dump(meta, f, ensure_ascii=False)
+        print(f"[OK] ジョブを作成しました: {meta['name']} ({job_id})")
+        return job_id
+
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        """ジョブの設定を読み込み"""
+        meta_path = self.job_paths(job_id)['meta']
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_jobs(self) -> List[Dict]:
+        """ジョブ一覧（作成日時順、処理済み件数付き）"""
+        jobs = []
+        if not os.path.isdir(self.jobs_dir):
+            return jobs
+        for job_id in os.listdir(self.jobs_dir):
+            try:
+                meta = self.load_job(job_id)
+            except Exception as e:
+                print(f"[WARNING] ジョブ読み込みエラー: {job_id} ({e})")
+                continue
+            if meta is None:
+                continue
+
+            store_path = self.job_paths(job_id)['store']
+            processed = 0
+            if os.path.exists(store_path):
+                job_store = JobStore(store_path)
+                processed = job_store.count()
+                job_store.close()
+
+            jobs.append({
+                'id': job_id,
+                'name': meta['name'],
+                'created_at': meta['created_at'],
+                'region': meta['region'],
+                'mode': meta['mode'],
+                'total': meta['total'] if 'total' in meta else len(meta['asins']),
+                'processed': processed
+            })
+        jobs.sort(key=lambda job: job['created_at'])
+        return jobs
+
+    def resume_job(self, job_id: str, progress_callback=None, should_stop_callback=None,
+                   **options) -> List[Dict]:
+        """保存済みのジョブを同じ設定で再開"""
+        meta = self.load_job(job_id)
+        if meta is None:
+            print(f"[WARNING] ジョブが見つかりません: {job_id}")
+            return []
+        # 入力ファイル（リストから作ったジョブはジョブのディレクトリに保存した入力）を読み直す
+        if 'source' in meta:
+            asins = InputSource.from_description(meta['source'])
+        else:
+            asins = meta['asins']
+        return self.process_asins(
+            asins=asins,
+            mode=meta['mode'],
+            translate_mode=meta['translate_mode'],
+            include_brand=meta['include_brand'],
+            region=meta['region'],
+            use_ai=meta['use_ai'],
+            progress_callback=progress_callback,
+            should_stop_callback=should_stop_callback,
+            **options
+        )
+
+    def delete_job(self, job_id: str):
+        """ジョブの進捗と結果を削除"""
+        job_dir = self.job_paths(job_id)['dir']
+        if os.path.isdir(job_dir):
+            shutil.rmtree(job_dir)
+            print(f"[OK] ジョブを削除しました: {job_id}")
+
+    def export_job(self, job_id: str, path: str, fmt: str = None) -> int:
+        """ジョブストアの結果をファイルに出力（少しずつ読み出すため件数に関係なくメモリ使用量は一定）"""
+        store_path = self.job_paths(job_id)['store']
+        if not os.path.exists(store_path):
+            print(f"[WARNING] ジョブの結果がありません: {job_id}")
+            return 0
+        job_store = JobStore(store_path)
+        try:
+            with ResultExporter(path, fmt) as exporter:
+                count = exporter.write_many(job_store.iter_export_rows())
+        finally:
+            job_store.close()
+        print(f"[OK] ジョブの結果を出力しました: {count}件 ({path})")
+        return count
+
     def load_prompt_templates(self):
         """プロンプトテンプレートを読み込み"""
         template_path = "prompt_templates.json"
@@ -610,14 +2969,16 @@ class KeywordExtractor:
             current = 'デフォルト' if 'デフォルト' in self.prompt_data['templates'] else list(self.prompt_data['templates'].keys())[0]
         return self.prompt_data['templates'][current]
 
-    def validate_ai_keywords(self, keywords: List[str], title: str) -> List[str]:
-        """AIが生成したキーワード（フレーズ）がタイトルに実際に存在するかを検証"""
-        # タイトルを小文字化（検証用）
-        title_lower = title.lower()
+    def build_title_index(self, title: str) -> TitleIndex:
+        """キーワード検証用のタイトルインデックスを構築"""
+        return self.analyze_title(title).index
 
-        # タイトルから実際の単語を抽出
-        title_words = self._extract_words_from_title(title)
-        title_words_lower = [word.lower() for word in title_words]
+    def validate_ai_keywords(self, keywords: List[str], title: str,
+                             title_index: TitleIndex = None) -> List[str]:
+        """AIが生成したキーワード（フレーズ）がタイトルに実際に存在するかを検証"""
+        # タイトルインデックス（小文字化・単語抽出・部分一致オートマトン）は1回だけ構築
+        if title_index is None:
+            title_index = self.build_title_index(title)
 
         validated_keywords = []
 
@@ -639,33 +3000,16 @@ class KeywordExtractor:
                 continue
 
             # フレーズの検証
-            is_valid = False
-
             # 1. フレーズ全体がタイトルに含まれているかチェック
-            if keyword_lower in title_lower:
+            # 2. フレーズを単語に分割して、すべての単語がタイトルの単語と
+            #    一致・包含関係にあるかチェック
+            if title_index.contains_phrase(keyword_lower):
                 is_valid = True
             else:
-                # 2. フレーズを単語に分割して、すべての単語がタイトルに存在するかチェック
                 keyword_words = keyword.split()
-                if keyword_words:
-                    # すべての単語がタイトルに存在するか確認
-                    all_words_exist = True
-                    for kw_word in keyword_words:
-                        kw_word_lower = kw_word.lower()
-                        word_exists = False
-
-                        # タイトルの単語と照合
-                        for title_word in title_words_lower:
-                            if kw_word_lower == title_word or kw_word_lower in title_word or title_word in kw_word_lower:
-                                word_exists = True
-                                break
-
-                        if not word_exists:
-                            all_words_exist = False
-                            break
-
-                    if all_words_exist:
-                        is_valid = True
+                is_valid = bool(keyword_words) and all(
+                    title_index.has_word(kw_word.lower()) for kw_word in keyword_words
+                )
 
             if is_valid:
                 validated_keywords.append(keyword)
@@ -729,12 +3073,24 @@ class KeywordExtractor:
 
         return cleansed_phrases
 
-    def extract_keywords_strict(self, title: str, include_brand: bool, brand: str) -> List[str]:
+    def extract_keywords_rule_based(self, title: str, mode: str, include_brand: bool, brand: str,
+                                    analyzed: 'AnalyzedTitle' = None) -> List[str]:
+        """モードに応じたルールベースのキーワード抽出"""
+        if mode == 'strict':
+            return self.extract_keywords_strict(title, include_brand, brand, analyzed)
+        elif mode == 'moderate':
+            return self.extract_keywords_moderate(title, include_brand, brand, analyzed)
+        else:  # loose
+            return self.extract_keywords_loose(title, include_brand, brand, analyzed)
+
+    def extract_keywords_strict(self, title: str, include_brand: bool, brand: str,
+                                analyzed: 'AnalyzedTitle' = None) -> List[str]:
         """厳しめモード：ほぼ同じ商品を探すためのキーワード抽出（タイトルの単語をそのまま使う）"""
         keywords = []
 
-        # タイトルから実際の単語を抽出
-        words = self._extract_words_from_title(title)
+        # タイトルから実際の単語を抽出（解析済みのトークンと特徴量を使用）
+        analyzed = analyzed or self.analyze_title(title)
+        words = analyzed.tokens
 
         # ブランド名を追加
         if include_brand and brand:
@@ -743,32 +3099,33 @@ class KeywordExtractor:
                 keywords.append(brand)
             # ブランドを含む単語がある場合
             else:
-                for word in words:
-                    if brand.lower() in word.lower():
+                brand_lower = brand.lower()
+                for word, word_lower in zip(words, analyzed.tokens_lower):
+                    if brand_lower in word_lower:
                         keywords.append(word)
                         break
 
         # 型番・品番を優先的に抽出
-        for word in words:
+        for word, has_digit in zip(words, analyzed.has_digit):
             if word not in keywords:
                 # 数字を含む単語（型番の可能性が高い）
-                if re.search(r'\d', word):
+                if has_digit:
                     keywords.append(word)
                     if len(keywords) >= 8:
                         break
 
         # ハイフンやアンダースコアを含む単語（品番の可能性）
-        for word in words:
+        for word, has_hyphen in zip(words, analyzed.has_hyphen):
             if word not in keywords:
-                if '-' in word or '_' in word:
+                if has_hyphen:
                     keywords.append(word)
                     if len(keywords) >= 8:
                         break
 
         # 大文字の略語（2文字以上）
-        for word in words:
+        for word, all_caps in zip(words, analyzed.all_caps):
             if word not in keywords:
-                if re.match(r'^[A-Z]{2,}$', word):
+                if all_caps:
                     keywords.append(word)
                     if len(keywords) >= 8:
                         break
@@ -783,12 +3140,14 @@ class KeywordExtractor:
 
         return keywords[:8]  # 最大8個
 
-    def extract_keywords_moderate(self, title: str, include_brand: bool, brand: str) -> List[str]:
+    def extract_keywords_moderate(self, title: str, include_brand: bool, brand: str,
+                                  analyzed: 'AnalyzedTitle' = None) -> List[str]:
         """標準モード：バランスの良いキーワード抽出（タイトルの単語から3〜5個）"""
         keywords = []
 
-        # タイトルから実際の単語を抽出
-        words = self._extract_words_from_title(title)
+        # タイトルから実際の単語を抽出（解析済みのトークンと特徴量を使用）
+        analyzed = analyzed or self.analyze_title(title)
+        words = analyzed.tokens
 
         # 単語数の半分程度を目標にする（3〜5個）
         target_count = min(5, max(3, len(words) // 2))
@@ -798,21 +3157,22 @@ class KeywordExtractor:
             if brand in words:
                 keywords.append(brand)
             else:
-                for word in words:
-                    if brand.lower() in word.lower():
+                brand_lower = brand.lower()
+                for word, word_lower in zip(words, analyzed.tokens_lower):
+                    if brand_lower in word_lower:
                         keywords.append(word)
                         break
 
         # 数字を含む重要な単語（型番など）
-        for word in words:
-            if word not in keywords and re.search(r'\d', word):
+        for word, has_digit in zip(words, analyzed.has_digit):
+            if word not in keywords and has_digit:
                 keywords.append(word)
                 if len(keywords) >= target_count:
                     break
 
         # 大文字で始まる単語（固有名詞）
-        for word in words:
-            if word not in keywords and re.match(r'^[A-Z]', word) and len(word) >= 3:
+        for word, capitalized in zip(words, analyzed.capitalized):
+            if word not in keywords and capitalized and len(word) >= 3:
                 keywords.append(word)
                 if len(keywords) >= target_count:
                     break
@@ -827,29 +3187,31 @@ class KeywordExtractor:
 
         return keywords[:target_count]
 
-    def extract_keywords_loose(self, title: str, include_brand: bool, brand: str) -> List[str]:
+    def extract_keywords_loose(self, title: str, include_brand: bool, brand: str,
+                               analyzed: 'AnalyzedTitle' = None) -> List[str]:
         """緩めモード：大まかなカテゴリでの検索（タイトルの単語から2〜3個）"""
         keywords = []
 
-        # タイトルから実際の単語を抽出
-        words = self._extract_words_from_title(title)
+        # タイトルから実際の単語を抽出（解析済みのトークンと特徴量を使用）
+        analyzed = analyzed or self.analyze_title(title)
+        words = analyzed.tokens
 
         # ブランド名を含める場合（大手ブランドのみ）
         if include_brand and brand:
-            major_brands = ['Intel', 'AMD', 'NVIDIA', 'GIGABYTE', 'ASUS', 'MSI', 'Apple', 'Samsung', 'Sony']
-            for major_brand in major_brands:
+            for major_brand in LOOSE_MODE_MAJOR_BRANDS:
                 if major_brand.lower() == brand.lower():
                     if brand in words:
                         keywords.append(brand)
                         break
-                    for word in words:
-                        if brand.lower() in word.lower():
+                    brand_lower = brand.lower()
+                    for word, word_lower in zip(words, analyzed.tokens_lower):
+                        if brand_lower in word_lower:
                             keywords.append(word)
                             break
                     break
 
         # カテゴリを表す長い単語（数字を含まない）
-        non_numeric = [w for w in words if not re.search(r'\d', w)]
+        non_numeric = [w for w, has_digit in zip(words, analyzed.has_digit) if not has_digit]
         sorted_words = sorted(non_numeric, key=len, reverse=True)
 
         for word in sorted_words:
@@ -868,16 +3230,136 @@ class KeywordExtractor:
 
         return keywords[:3]  # 最大3個
 
-    def extract_keywords_with_ai(self, title: str, mode: str, include_brand: bool, brand: str) -> List[str]:
+    def extract_many(self, titles: List[str], mode: str, include_brand: bool = True,
+                     brands: List[str] = None) -> List[List[str]]:
+        """複数タイトルのルールベースキーワード抽出を一括処理
+
+        バッチ全体のトークン特徴量テーブル（長さ・数字・ハイフン・大文字など）を1回だけ作り、
+        モードごとの選択を配列演算で行う。結果は extract_keywords_strict / moderate / loose と同一。
+
+        Args:
+            titles: 商品タイトルのリスト
+            mode: 抽出モード（'strict' / 'moderate' / 'loose'）
+            include_brand: キーワードにブランド名を含めるか
+            brands: タイトルごとのブランド名（省略時は extract_brand で抽出）
+
+        Returns:
+            タイトルごとのキーワードリスト
+        """
+        if brands is None:
+            brands = [self.extract_brand(title) for title in titles] if include_brand else [''] * len(titles)
+
+        # NumPyがない場合はタイトルごとの処理にフォールバック
+        if not NUMPY_AVAILABLE:
+            return [self.extract_keywords_rule_based(title, mode, include_brand, brand)
+                    for title, brand in zip(titles, brands)]
+
+        title_count = len(titles)
+        if title_count == 0:
+            return []
+
+        # 1) トークン化と語彙ID化（同じ単語の特徴量は語彙ごとに1回だけ計算）
+        vocab = {}
+        add_word = vocab.setdefault
+        title_words = [extract_words_from_title(title) for title in titles]
+        token_ids = [add_word(word, len(vocab)) for words in title_words for word in words]
+        vocab_words = list(vocab)
+        vocab_size = len(vocab_words)
+
+        vocab_length = np.fromiter(map(len, vocab_words), dtype=np.int64, count=vocab_size)
+        vocab_digit = np.fromiter((DIGIT_PATTERN.search(w) is not None for w in vocab_words), dtype=bool, count=vocab_size)
+        vocab_hyphen = np.fromiter(('-' in w or '_' in w for w in vocab_words), dtype=bool, count=vocab_size)
+        vocab_caps = np.fromiter((ALL_CAPS_PATTERN.match(w) is not None for w in vocab_words), dtype=bool, count=vocab_size)
+        vocab_capitalized = np.fromiter((CAPITALIZED_PATTERN.match(w) is not None for w in vocab_words), dtype=bool, count=vocab_size)
+
+        # 2) トークン単位の特徴量テーブル
+        ids = np.array(token_ids, dtype=np.int64)
+        counts = np.fromiter(map(len, title_words), dtype=np.int64, count=title_count)
+        starts = np.cumsum(counts) - counts
+        title_of = np.repeat(np.arange(title_count), counts)
+        position = np.arange(len(ids)) - starts[title_of]
+        length = vocab_length[ids]
+        has_digit = vocab_digit[ids]
+
+        # 3) ブランド名に対応する単語の位置（タイトルごと）
+        brand_position = np.full(title_count, -1, dtype=np.int64)
+        if include_brand:
+            major_brands = {major_brand.lower() for major_brand in LOOSE_MODE_MAJOR_BRANDS}
+            for i, (words, brand) in enumerate(zip(title_words, brands)):
+                if not brand or (mode == 'loose' and brand.lower() not in major_brands):
+                    continue
+                if brand in words:
+                    brand_position[i] = words.index(brand)
+                else:
+                    brand_lower = brand.lower()
+                    for j, word in enumerate(words):
+                        if brand_lower in word.lower():
+                            brand_position[i] = j
+                            break
+        has_brand = brand_position >= 0
+        brand_count = has_brand.astype(np.int64)
+        is_brand = np.zeros(len(ids), dtype=bool)
+        is_brand[starts[has_brand] + brand_position[has_brand]] = True
+
+        # 4) モードごとの優先カテゴリ（小さいほど優先）とカテゴリ内の並び順
+        excluded = 9
+        if mode == 'strict':
+            category = np.full(len(ids), excluded, dtype=np.int8)
+            category[length >= 2] = 3                   # 残りは長い単語から
+            category[vocab_caps[ids]] = 2               # 大文字の略語
+            category[vocab_hyphen[ids]] = 1             # ハイフン・アンダースコアを含む単語
+            category[has_digit] = 0                     # 数字を含む単語
+            secondary = np.where(category == 3, -length, 0)
+            limit = np.full(title_count, 8, dtype=np.int64)
+        elif mode == 'moderate':
+            category = np.full(len(ids), excluded, dtype=np.int8)
+            category[length >= 3] = 2                   # 長い単語
+            category[vocab_capitalized[ids] & (length >= 3)] = 1   # 大文字で始まる単語
+            category[has_digit] = 0                     # 数字を含む単語
+            secondary = np.where(category == 2, -length, 0)
+            limit = np.clip(counts // 2, 3, 5)
+        else:  # loose
+            # 数字を含まない4文字以上の単語。2個に満たない場合は3文字以上まで広げる
+            non_numeric = ~has_digit & ~is_brand
+            long_count = np.bincount(title_of[non_numeric & (length >= 4)], minlength=title_count)
+            allow_short = brand_count + np.minimum(long_count, 3 - brand_count) < 2
+            candidate = non_numeric & ((length >= 4) | ((length == 3) & allow_short[title_of]))
+            category = np.where(candidate, 0, excluded).astype(np.int8)
+            secondary = -length
+            limit = np.full(title_count, 3, dtype=np.int64)
+        category[is_brand] = excluded
+
+        # 5) タイトル → カテゴリ → 並び順 → 出現位置 でソートし、上限までを選択
+        candidates = np.flatnonzero(category < excluded)
+        order = np.lexsort((position[candidates], secondary[candidates],
+                            category[candidates], title_of[candidates]))
+        ranked = candidates[order]
+        ranked_title = title_of[ranked]
+        group_first = np.flatnonzero(np.r_[True, ranked_title[1:] != ranked_title[:-1]]) if len(ranked) else np.zeros(0, dtype=np.int64)
+        group_sizes = np.diff(np.r_[group_first, len(ranked)])
+        rank = np.arange(len(ranked)) - np.repeat(group_first, group_sizes)
+        chosen = ranked[rank < (limit - brand_count)[ranked_title]]
+
+        # 6) タイトルごとのキーワードリストに組み立て
+        chosen_words = [vocab_words[word_id] for word_id in ids[chosen].tolist()]
+        chosen_bounds = np.r_[0, np.cumsum(np.bincount(title_of[chosen], minlength=title_count))].tolist()
+        brand_positions = brand_position.tolist()
+
+        results = []
+        for i, words in enumerate(title_words):
+            keywords = [words[brand_positions[i]]] if brand_positions[i] >= 0 else []
+            keywords.extend(chosen_words[chosen_bounds[i]:chosen_bounds[i + 1]])
+            results.append(keywords)
+        return results
+
+    def extract_keywords_with_ai(self, title: str, mode: str, include_brand: bool, brand: str,
+                                 analyzed: 'AnalyzedTitle' = None) -> List[str]:
         """Gemini APIを使用したキーワード抽出"""
+        analyzed = analyzed or self.analyze_title(title)
+
         if not self.use_ai or not self.gemini_model:
             # AIが使用できない場合は通常の抽出にフォールバック
-            if mode == 'strict':
-                return self.extract_keywords_strict(title, include_brand, brand)
-            elif mode == 'moderate':
-                return self.extract_keywords_moderate(title, include_brand, brand)
-            else:
-                return self.extract_keywords_loose(title, include_brand, brand)
+            return self.extract_keywords_rule_based(title, mode, include_brand, brand, analyzed)
 
         try:
             # 現在のプロンプトテンプレートを取得
@@ -918,12 +3400,7 @@ class KeywordExtractor:
             if not keywords_text:
                 print(f"AIの応答が空でした。タイトル: {title[:50]}...")
                 # フォールバック処理
-                if mode == 'strict':
-                    return self.extract_keywords_strict(title, include_brand, brand)
-                elif mode == 'moderate':
-                    return self.extract_keywords_moderate(title, include_brand, brand)
-                else:
-                    return self.extract_keywords_loose(title, include_brand, brand)
+                return self.extract_keywords_rule_based(title, mode, include_brand, brand, analyzed)
 
             print(f"AIレスポンス: {keywords_text}")
             keywords = [kw.strip() for kw in keywords_text.split(',')]
@@ -936,7 +3413,7 @@ class KeywordExtractor:
             keywords = [kw for kw in keywords if kw]
 
             # AI結果の検証：タイトルに存在しない単語や説明文をフィルタリング
-            validated_keywords = self.validate_ai_keywords(keywords, title)
+            validated_keywords = self.validate_ai_keywords(keywords, title, analyzed.index)
             if len(validated_keywords) < len(keywords):
                 print(f"AIキーワード検証: {len(keywords)}個中{len(validated_keywords)}個が有効でした")
                 print(f"無効なキーワード: {[kw for kw in keywords if kw not in validated_keywords]}")
@@ -944,12 +3421,7 @@ class KeywordExtractor:
             # 検証後もキーワードが空の場合はフォールバック
             if not validated_keywords:
                 print(f"検証後にキーワードが0個になりました。フォールバックします。")
-                if mode == 'strict':
-                    return self.extract_keywords_strict(title, include_brand, brand)
-                elif mode == 'moderate':
-                    return self.extract_keywords_moderate(title, include_brand, brand)
-                else:
-                    return self.extract_keywords_loose(title, include_brand, brand)
+                return self.extract_keywords_rule_based(title, mode, include_brand, brand, analyzed)
 
             # キーワードのクレンジング（重複削除・語数制限）
             cleansed_keywords = self.cleanse_keywords(validated_keywords, mode)
@@ -959,139 +3431,359 @@ class KeywordExtractor:
             # クレンジング後もキーワードが空の場合はフォールバック
             if not cleansed_keywords:
                 print(f"クレンジング後にキーワードが0個になりました。フォールバックします。")
-                if mode == 'strict':
-                    return self.extract_keywords_strict(title, include_brand, brand)
-                elif mode == 'moderate':
-                    return self.extract_keywords_moderate(title, include_brand, brand)
-                else:
-                    return self.extract_keywords_loose(title, include_brand, brand)
+                return self.extract_keywords_rule_based(title, mode, include_brand, brand, analyzed)
 
             return cleansed_keywords
 
         except Exception as e:
             print(f"AIキーワード抽出エラー: {e}")
             # エラー時は通常の抽出にフォールバック
-            if mode == 'strict':
-                return self.extract_keywords_strict(title, include_brand, brand)
-            elif mode == 'moderate':
-                return self.extract_keywords_moderate(title, include_brand, brand)
-            else:
-                return self.extract_keywords_loose(title, include_brand, brand)
+            return self.extract_keywords_rule_based(title, mode, include_brand, brand, analyzed)
 
-    def process_asins(self, asins: List[str], mode: str, translate_mode: str,
+    def process_asins(self, asins, mode: str, translate_mode: str,
                      include_brand: bool, region: str = "jp", use_ai: bool = None,
                      batch_size: int = 25, batch_cooldown: int = 60,
                      enable_progress_save: bool = True,
                      progress_callback=None,
-                     should_stop_callback=None) -> List[Dict]:
-        """複数のASINを処理してタイトルとブランド名を取得後、キーワード抽出（改善版）"""
+                     should_stop_callback=None,
+                     job_name: str = None,
+                     max_attempts: int = 3,
+                     retry_backoff: float = 60.0,
+                     collect_results: bool = True) -> List[Dict]:
+        """複数のASINを処理してタイトルとブランド名を取得後、キーワード抽出（改善版）
+
+        進捗と結果は入力リスト・設定ごとのジョブ（.jobs/<ジョブID>/）に保存される。
+        取得に失敗したASINは再試行キューに入れ、待機時間（retry_backoffから倍々に延長）が
+        過ぎたら本処理の合間に、残りは最後にまとめて再試行する。max_attempts回失敗したものは
+        失敗理由とともにデッドレターとして記録する。
+        再試行キューに入れた時はprogress_callbackに'retry'を通知する（resultは失敗結果に
+        attempt・max_attempts・delay・reasonを加えた辞書）
+        自動判定翻訳の完了は'translated'、翻訳ステージの失敗は'translation_failed'で通知する
+        （失敗した結果のtranslated_keywordsは原文のキーワード）
+        asinsにはリストのほか、入力ファイルを1行ずつ読むInputSourceも渡せる（一覧をメモリに載せない）
+        mode='brand'の場合はブランド名だけを取得する（商品ページはブランド欄まで受信し、抽出・翻訳はしない）
+        collect_results=Falseなら結果はジョブストアとprogress_callbackに1件ずつ渡すだけで保持せず、
+        空のリストを返す（メモリに残るのは件数だけ。結果はexport_jobでジョブストアから出力できる）
+        """
+        streaming = isinstance(asins, InputSource)
+        brand_only = mode == 'brand'
+        translate_mode = self.normalize_translate_mode(translate_mode)
+        skip_check = None  # 入力ファイルの場合の処理済み判定（processed_checker参照）
+        processed_count = 0
         results = []
-        processed_asins = []
-
-        # 進捗再開モードの確認
+        processed_now = 0  # 今回処理済みにした件数（失敗を含む）
+        completed_count = 0  # 今回取得できた件数
+        dead_letter_count = 0
+        dead_letters = []  # 最後に表示する取得できなかったASIN（先頭DEAD_LETTER_REPORT_LIMIT件）
+        previous_attempts = {}
+
+        # 進捗再開モードの確認（同じ入力・設定のジョブがあれば続きから）
+        job_store = None
+        progress_journal = None
+        restored_count = 0
+        self.last_job_id = None
         if enable_progress_save:
-            progress_data = self.load_progress()
-            already_processed = progress_data.get('processed_asins', [])
-            if already_processed:
-                print(f"[RESUME] 進捗再開モード: {len(already_processed)}件スキップ")
-                # すでに処理済みのASINはスキップ
-                asins_to_process = self.get_unprocessed_asins(asins, already_processed)
+            job_id = self.create_job(asins, mode, translate_mode, include_brand, region, use_ai, job_name)
+            self.last_job_id = job_id
+            paths = self.job_paths(job_id)
+            progress_journal = ProgressJournal(paths['progress'])
+            self.load_progress(paths['progress'], progress_journal)
+            job_store = JobStore(paths['store'])
+            # 前回再試行待ちのまま終わったASINは試行回数を引き継いで処理し直す
+            previous_attempts = job_store.retry_attempts()
+            # ジャーナルとジョブストアのどちらかに記録済みなら処理済み
+            processed_check, processed_count = self.processed_checker(
+                job_store, progress_journal.iter_processed_asins())
+            if processed_count:
+                print(f"[RESUME] 進捗再開モード: {processed_count}件スキップ")
+                # すでに処理済みのASINはスキップ（入力ファイルはバッチごとに読み出しながら判定）
+                if streaming:
+                    skip_check = processed_check
+                else:
+                    asins_to_process = list(self.iter_unprocessed_asins(asins, processed_check))
+                    print(f"[INFO] 未処理ASIN: {len(asins_to_process)}件 / 全体: {len(asins)}件")
+
+                # 保存済みの結果を復元（再取得せずに表示・エクスポートに含める）
+                # ジョブストアにはこのジョブの結果だけが入っているため、全件を記録順に少しずつ読み出す
+                input_count = asins.count() if streaming else len(asins)
+                restored_total = 0
+                for result in job_store.iter_results():
+                    status = result.pop('status')
+                    result.pop('elapsed')
+                    restored_total += 1
+                    if status == 'completed':
+                        if collect_results:
+                            results.append(result)
+                        restored_count += 1
+                    if progress_callback:
+                        progress_callback('restored', 0, input_count, result['asin'], result)
+                print(f"[RESUME] 保存済みの結果を復元: {restored_total}件")
             else:
                 asins_to_process = asins
         else:
             asins_to_process = asins
 
-        total_asins = len(asins_to_process)
-        if total_asins == 0:
+        if streaming:
+            # 入力ファイルは読み直さず、ジョブ作成時に数えた件数から未処理の件数を見積もり、
+            # 未処理のASINはバッチごとに読み出しながら判定する（件数は進捗表示・バッチ数の目安）
+            total_asins = max(0, asins.count() - processed_count)
+            if skip_check:
+                asins_to_process = self.iter_unprocessed_asins(asins, skip_check)
+            else:
+                asins_to_process = iter(asins)
+        else:
+            total_asins = len(asins_to_process)
+
+        # 最初のバッチを読み出し、未処理のASINがなければ終了
+        asin_iter = iter(asins_to_process)
+        batch_asins = list(islice(asin_iter, batch_size))
+        if not batch_asins:
             print("[OK] すべてのASINが処理済みです")
+            if job_store:
+                job_store.close()
             return results
+        total_asins = max(total_asins, len(batch_asins))
 
         print(f"[START] 処理開始: {total_asins}件のASIN（バッチサイズ: {batch_size}）")
 
-        # バッチ処理
-        for batch_idx, i in enumerate(range(0, total_asins, batch_size), 1):
-            batch_asins = asins_to_process[i:i+batch_size]
-            total_batches = (total_asins + batch_size - 1) // batch_size
+        # 翻訳はバッチごとにまとめてバックグラウンドのステージで行う（キーワードの重複を除いて一括翻訳）
+        translation_stage = TranslationStage(self, group_size=batch_size) if translate_mode == 'auto' and not brand_only else None
 
-            print(f"\n[BATCH] バッチ {batch_idx}/{total_batches} 処理中... ({len(batch_asins)}件)")
+        # 再試行キュー（再試行時刻, ASIN, 試行回数, 表示上の番号）のヒープ
+        retry_queue = []
 
-            for idx, asin in enumerate(batch_asins, 1):
-                # 停止チェック
-                if should_stop_callback and should_stop_callback():
-                    print("\n[STOP] ユーザーによる処理中断")
-                    return results
+        def emit_translated(wait=False):
+            if not translation_stage:
+                return
+            for translated_result, current_index, error in translation_stage.drain(wait):
+                if job_store:
+                    job_store.update_translation(translated_result['asin'],
+                                                 translated_result['translated_keywords'])
+                if progress_callback:
+                    # 翻訳に失敗した結果も原文のキーワードで行を確定させ、失敗したことを通知
+                    progress_callback('translation_failed' if error else 'translated', current_index, total_asins,
+                                      translated_result['asin'], translated_result)
+
+        def stop_requested():
+            # 完了した翻訳を反映してから停止チェック（一時停止中はトークンで再開か停止まで待機）
+            emit_translated()
+            if self.cancel_token.wait_if_paused():
+                return True
+            return bool(should_stop_callback and should_stop_callback())
+
+        def stop_processing():
+            print("\n[STOP] ユーザーによる処理中断")
+            if translation_stage:
+                translation_stage.shutdown(cancel=True)
+            if enable_progress_save:
+                progress_journal.compact(self.scraping_stats.copy())
+                job_store.close()
+            self.save_caches()
+            return results
 
-                if not asin.strip():
-                    continue
+        def process_one(asin, current_index, attempt):
+            nonlocal processed_now, completed_count, dead_letter_count
+            print(f"\n[{current_index}/{total_asins}] 処理中: {asin}" + (f"（再試行 {attempt}回目）" if attempt > 1 else ""))
 
-                asin = asin.strip()
-                current_index = i + idx
-                print(f"\n[{current_index}/{total_asins}] 処理中: {asin}")
+            # 進捗コールバック（処理開始）
+            if progress_callback:
+                progress_callback('processing', current_index, total_asins, asin, None)
 
-                # 進捗コールバック（処理開始）
-                if progress_callback:
-                    progress_callback('processing', current_index, total_asins, asin, None)
+            # ASINから商品タイトルとブランド名を取得
+            started_at = time.time()
+            title, brand_from_asin = self.fetch_product_info_from_asin(asin, region, brand_only=brand_only)
+            if not title and self.last_fetch_error == 'cancelled':
+                # 停止による中断は処理済みにも再試行にもしない（次回再開時に取得し直す）
+                return
+            if not title and not (brand_only and brand_from_asin):
+                reason = self.last_fetch_error or 'no_title'
+                failure_class = classify_fetch_error(reason)
+                print(f"[WARNING] タイトル取得失敗: {asin} ({reason})")
+                failed_result = {
+                    'asin': asin,
+                    'original_title': f"商品ページなし: {asin}" if failure_class == 'not_found' else f"取得失敗: {asin}",
+                    'brand': '',
+                    'keywords': [],
+                    'translated_keywords': [],
+                    'status': failure_class
+                }
 
-                # ASINから商品タイトルとブランド名を取得
-                title, brand_from_asin = self.fetch_product_info_from_asin(asin, region)
-                if not title:
-                    print(f"[WARNING] タイトル取得失敗: {asin}")
-                    # 失敗してもprocessed_asinsに追加（無限ループ防止）
-                    processed_asins.append(asin)
+                # 存在しないASIN以外は、上限に達していなければ待機時間を置いて再試行キューへ
+                if failure_class != 'not_found' and attempt < max_attempts:
+                    delay = retry_backoff * (2 ** (attempt - 1))
+                    heapq.heappush(retry_queue, (time.time() + delay, asin, attempt + 1, current_index))
+                    print(f"[RETRY] {delay:.0f}秒後に再試行します: {asin} ({attempt}/{max_attempts}回目)")
+                    if enable_progress_save:
+                        job_store.record(failed_result, 'retry', started_at, time.time(), attempt, reason)
 
-                    # 進捗コールバック（失敗）
+                    # 進捗コールバック（再試行待ち）
                     if progress_callback:
-                        failed_result = {
-                            'asin': asin,
-                            'original_title': f"取得失敗: {asin}",
-                            'brand': '',
-                            'keywords': [],
-                            'translated_keywords': []
-                        }
-                        progress_callback('failed', current_index, total_asins, asin, failed_result)
-                    continue
+                        progress_callback('retry', current_index, total_asins, asin, dict(
+                            failed_result, attempt=attempt, max_attempts=max_attempts, delay=delay, reason=reason))
+                    return
+
+                # 存在しないASIN・上限に達したものはデッドレターとして処理済みにする（無限ループ防止）
+                processed_now += 1
+                dead_letter_count += 1
+                if len(dead_letters) < DEAD_LETTER_REPORT_LIMIT:
+                    dead_letters.append((asin, attempt, reason))
+                if enable_progress_save:
+                    job_store.record(failed_result, 'failed', started_at, time.time(), attempt, reason)
+                    progress_journal.append(asin)
+
+                # 進捗コールバック（失敗）
+                if progress_callback:
+                    progress_callback('failed', current_index, total_asins, asin, failed_result)
+                return
 
-                # 通常のタイトル処理と同じ処理を実行
-                result = self.process_single_title(title, mode, translate_mode, include_brand, use_ai)
+            if brand_only:
+                # ブランド名取得モード: ASINとブランド名だけを記録
+                result = {
+                    'asin': asin,
+                    'original_title': '',  # 商品タイトルは表示しない
+                    'brand': brand_from_asin or '',
+                    'keywords': [],
+                    'translated_keywords': []
+                }
+            else:
+                # 通常のタイトル処理と同じ処理を実行（翻訳は翻訳ステージに任せる）
+                stage_translate_mode = 'none' if translation_stage else translate_mode
+                result = self.process_single_title(title, mode, stage_translate_mode, include_brand, use_ai)
 
                 # ASINから取得したブランド名がある場合はそれを優先
                 if brand_from_asin:
                     result['brand'] = brand_from_asin
 
                 result['asin'] = asin  # ASINも結果に保存
+            if collect_results:
                 results.append(result)
-                processed_asins.append(asin)
+            processed_now += 1
+            completed_count += 1
 
-                # 進捗保存（各ASIN処理後）
-                if enable_progress_save:
-                    all_processed = already_processed + processed_asins if enable_progress_save else processed_asins
-                    self.save_progress(all_processed)
+            # 進捗保存（結果はジョブストアへ、処理済みASINはジャーナルへ追記）
+            if enable_progress_save:
+                job_store.record(result, 'completed', started_at, time.time(), attempt)
+                progress_journal.append(asin)
 
-                # メトリクス表示
-                success_rate = (self.scraping_stats['success'] / self.scraping_stats['total'] * 100) if self.scraping_stats['total'] > 0 else 0
-                print(f"[PROGRESS] 進捗: {len(processed_asins)}/{total_asins} | 成功率: {success_rate:.1f}% | CAPTCHA: {self.scraping_stats['captcha_count']}回")
+            # メトリクス表示
+            success_rate = (self.scraping_stats['success'] / self.scraping_stats['total'] * 100) if self.scraping_stats['total'] > 0 else 0
+            print(f"[PROGRESS] 進捗: {processed_now}/{total_asins} | 成功率: {success_rate:.1f}% | CAPTCHA: {self.scraping_stats['captcha_count']}回")
 
-                # 進捗コールバック（完了）
-                if progress_callback:
-                    progress_callback('completed', current_index, total_asins, asin, result)
+            # 進捗コールバック（完了）
+            if progress_callback:
+                progress_callback('completed', current_index, total_asins, asin, result)
+
+            if translation_stage:
+                translation_stage.submit(result, current_index)
+
+        # バッチ処理（入力ファイルの場合も1バッチ分ずつ読み出し、次のバッチがなくなるまで続ける）
+        total_batches = (total_asins + batch_size - 1) // batch_size
+        batch_idx = 0
+        while batch_asins:
+            batch_idx += 1
+            total_batches = max(total_batches, batch_idx)  # 見積もりより多かった場合
+            i = (batch_idx - 1) * batch_size
+
+            print(f"\n[BATCH] バッチ {batch_idx}/{total_batches} 処理中... ({len(batch_asins)}件)")
+            if progress_callback:
+                progress_callback('batch', batch_idx, total_batches, '', None)
+
+            for idx, asin in enumerate(batch_asins, 1):
+                # 停止チェック
+                if stop_requested():
+                    return stop_processing()
+
+                if not asin.strip():
+                    continue
+
+                asin = asin.strip()
+                process_one(asin, i + idx, previous_attempts.get(asin, 0) + 1)
+
+                # 待機時間が過ぎた再試行を本処理の合間に実行
+                while retry_queue and retry_queue[0][0] <= time.time():
+                    if stop_requested():
+                        return stop_processing()
+                    _, retry_asin, attempt, current_index = heapq.heappop(retry_queue)
+                    process_one(retry_asin, current_index, attempt)
+
+            # バッチ内の翻訳を待って反映（待った時間はクールダウンに含める）
+            wait_start = time.perf_counter()
+            emit_translated(wait=True)
+            translation_wait = time.perf_counter() - wait_start
+
+            # 進捗・学習したブランド・翻訳キャッシュをバッチごとに保存
+            if enable_progress_save:
+                progress_journal.flush()
+            self.save_caches()
 
             # バッチ間のクールダウン（最後のバッチ以外）
-            if batch_idx < total_batches and batch_cooldown > 0:
-                print(f"\n[COOLDOWN] バッチ間クールダウン: {batch_cooldown}秒待機中...")
-                time.sleep(batch_cooldown)
+            next_batch = list(islice(asin_iter, batch_size))
+            if next_batch and batch_cooldown > 0:
+                remaining_cooldown = max(0.0, batch_cooldown - translation_wait)
+                print(f"\n[COOLDOWN] バッチ間クールダウン: {remaining_cooldown:.0f}秒待機中...")
+                if progress_callback:
+                    progress_callback('cooldown', batch_idx, total_batches, '', remaining_cooldown)
+                # 停止されたらクールダウン途中でも中断
+                if self.cancel_token.sleep(remaining_cooldown):
+                    return stop_processing()
+            batch_asins = next_batch
+
+        # 残った再試行を待機時間が過ぎたものから実行
+        if retry_queue:
+            print(f"\n[RETRY] 再試行待ち: {len(retry_queue)}件")
+        while retry_queue:
+            if stop_requested():
+                return stop_processing()
+            wait_time = retry_queue[0][0] - time.time()
+            if wait_time > 0:
+                # 停止されたら待機途中でも中断（翻訳の反映と一時停止の確認のため1秒ずつ）
+                self.cancel_token.sleep(min(1.0, wait_time))
+                continue
+            _, retry_asin, attempt, current_index = heapq.heappop(retry_queue)
+            process_one(retry_asin, current_index, attempt)
+
+        emit_translated(wait=True)
+        if translation_stage:
+            translation_stage.shutdown()
+        self.save_caches()
 
-        print(f"\n[COMPLETE] 処理完了: {len(results)}件成功 / {total_asins}件")
-        print(f"[STATS] 最終メトリクス: 成功={self.scraping_stats['success']}, 失敗={self.scraping_stats['failed']}, CAPTCHA={self.scraping_stats['captcha_count']}")
+        # 最後にスナップショットへ統合
+        if enable_progress_save:
+            progress_journal.compact(self.scraping_stats.copy())
+            job_store.close()
+            print(f"[OK] 進捗保存: {progress_journal.count}件 ({progress_journal.snapshot_path})")
+
+        print(f"\n[COMPLETE] 処理完了: {completed_count}件成功 / {total_asins}件（復元: {restored_count}件）")
+        if dead_letter_count:
+            print(f"[DEAD] 取得できなかったASIN: {dead_letter_count}件")
+            for asin, attempts, reason in dead_letters:
+                print(f"  {asin}: {attempts}回失敗 ({reason})")
+            if dead_letter_count > len(dead_letters):
+                print(f"  ...ほか{dead_letter_count - len(dead_letters)}件")
+        print(f"[STATS] 最終メトリクス: 成功={self.scraping_stats['success']}, 失敗={self.scraping_stats['failed']}, CAPTCHA={self.scraping_stats['captcha_count']}, 商品ページなし(スキップ)={self.scraping_stats['not_found_skipped']}")
 
         return results
 
+    @staticmethod
+    def normalize_translate_mode(translate_mode: str) -> str:
+        """翻訳モードを 'none' か 'auto' にそろえる（旧バージョンの方向指定はautoに、不明なモードはValueError）"""
+        if translate_mode in TRANSLATE_MODES:
+            return translate_mode
+        if translate_mode in LEGACY_TRANSLATE_MODES:
+            return LEGACY_TRANSLATE_MODES[translate_mode]
+        raise ValueError(f"不明な翻訳モードです: {translate_mode}（{' / '.join(TRANSLATE_MODES)}）")
+
     def process_single_title(self, title: str, mode: str, translate_mode: str,
                            include_brand: bool, use_ai: bool = None) -> Dict:
         """単一のタイトルを処理"""
+        translate_mode = self.normalize_translate_mode(translate_mode)
+        # タイトルの解析は1回だけ（ブランド抽出・キーワード抽出・検証で共有）
+        analyzed = self.analyze_title(title)
+
         result = {
             'original_title': title,
             'translated_title': '',
-            'brand': self.extract_brand(title),
+            'brand': self.extract_brand(title, analyzed),
             'keywords': [],
             'translated_keywords': []
         }
@@ -1101,13 +3793,9 @@ class KeywordExtractor:
             use_ai = self.use_ai
 
         if use_ai:
-            keywords = self.extract_keywords_with_ai(title, mode, include_brand, result['brand'])
-        elif mode == 'strict':
-            keywords = self.extract_keywords_strict(title, include_brand, result['brand'])
-        elif mode == 'moderate':
-            keywords = self.extract_keywords_moderate(title, include_brand, result['brand'])
-        else:  # loose
-            keywords = self.extract_keywords_loose(title, include_brand, result['brand'])
+            keywords = self.extract_keywords_with_ai(title, mode, include_brand, result['brand'], analyzed)
+        else:
+            keywords = self.extract_keywords_rule_based(title, mode, include_brand, result['brand'], analyzed)
 
         # 翻訳モードに応じた処理
         if translate_mode == 'none':  # 翻訳なし
@@ -1116,90 +3804,127 @@ class KeywordExtractor:
         elif translate_mode == 'auto':  # 自動判定翻訳
             result['keywords'] = keywords
 
-            # 抽出されたキーワードの言語を判定
-            keywords_text = ' '.join(keywords)
-            detected_lang = self.detect_language(keywords_text)
-
-            if detected_lang == 'ja':
+            # タイトルの言語は解析時に判定済み
+            if analyzed.language == 'ja':
                 # 日本語→英語に翻訳
-                translated_kw = [self.translate_text(kw, 'en') for kw in keywords]
+                translated_kw = self.translate_many(keywords, 'en')
                 result['translated_keywords'] = translated_kw
                 print(f"日本語キーワードを英語に翻訳: {keywords} → {translated_kw}")
             else:
                 # 英語→日本語に翻訳
-                translated_kw = [self.translate_text(kw, 'ja') for kw in keywords]
+                translated_kw = self.translate_many(keywords, 'ja')
                 result['translated_keywords'] = translated_kw
                 print(f"英語キーワードを日本語に翻訳: {keywords} → {translated_kw}")
 
         return result
 
-    def process_titles(self, titles: List[str], mode: str, translate_mode: str,
-                      include_brand: bool, use_ai: bool = None) -> List[Dict]:
-        """複数の商品タイトルを処理"""
-        results = []
+    def process_titles(self, titles, mode: str, translate_mode: str,
+                      include_brand: bool, use_ai: bool = None, batch_size: int = 500,
+                      progress_callback=None, should_stop_callback=None,
+                      collect_results: bool = True) -> List[Dict]:
+        """複数の商品タイトルを処理（商品ページは取得しない）
+
+        タイトルはbatch_size件ずつ処理する。ルールベース抽出はextract_manyで一括、翻訳はバッチ内の
+        キーワードを重複除去して一括で行い、直近TITLE_DEDUP_WINDOW件に出てきた同じタイトルは再処理しない。
+        progress_callbackにはprocess_asinsと同じ形式で通知する（ASINは空文字）。
+        titlesにはリストのほか、入力ファイルを1行ずつ読むInputSourceも渡せる。
+        collect_results=Falseなら結果はprogress_callbackで1件ずつ渡すだけで保持せず、空のリストを返す
+        （メモリに残るのは件数と直近のタイトルの結果だけ）
+        """
+        if use_ai is None:
+            use_ai = self.use_ai
+        translate_mode = self.normalize_translate_mode(translate_mode)
 
-        # 翻訳モードの解析
-        if translate_mode != 'none':
-            source_lang, target_lang = translate_mode.split('_to_')
+        if isinstance(titles, InputSource):
+            total = titles.count()
         else:
-            source_lang = target_lang = None
+            titles = [title.strip() for title in titles if title.strip()]
+            total = len(titles)
+        title_iter = iter(titles)
+        results = []
+        recent = OrderedDict()  # 直近のタイトル → 結果（重複タイトルは再処理しない）
+        completed_count = 0
+        extracted_count = 0
 
-        for idx, title in enumerate(titles):
-            if not title.strip():
-                continue
+        def stop_requested():
+            return self.cancel_token.wait_if_paused() or bool(should_stop_callback and should_stop_callback())
+
+        print(f"[START] タイトル処理開始: {total}件（バッチサイズ: {batch_size}）")
+
+        for start in range(0, total, batch_size):
+            if stop_requested():
+                print("\n[STOP] ユーザーによる処理中断")
+                break
 
-            print(f"処理中 {idx+1}/{len(titles)}: {title[:50]}...")  # デバッグ出力
+            batch = list(islice(title_iter, batch_size))
+            if progress_callback:
+                progress_callback('processing', start + 1, total, '', None)
+
+            # バッチ内の未処理タイトルだけを解析・抽出
+            new_titles = [title for title in dict.fromkeys(batch) if title not in recent]
+            analyzed_titles = [self.analyze_title(title) for title in new_titles]
+            brands = [self.extract_brand(title, analyzed) for title, analyzed in zip(new_titles, analyzed_titles)]
+
+            if use_ai:
+                keywords_list = []
+                for title, brand, analyzed in zip(new_titles, brands, analyzed_titles):
+                    if stop_requested():
+                        break
+                    keywords_list.append(self.extract_keywords_with_ai(title, mode, include_brand, brand, analyzed))
+            else:
+                keywords_list = self.extract_many(new_titles, mode, include_brand, brands)
 
-            result = {
+            batch_results = [{
                 'original_title': title,
                 'translated_title': '',
-                'brand': '',
-                'keywords': [],
+                'brand': brand,
+                'keywords': keywords,
                 'translated_keywords': []
-            }
+            } for title, brand, keywords in zip(new_titles, brands, keywords_list)]
 
-            # ブランド抽出
-            result['brand'] = self.extract_brand(title)
+            # 自動判定翻訳はバッチ内のキーワードを重複除去して一括翻訳
+            if translate_mode == 'auto':
+                self.translate_results(batch_results)
+            recent.update((result['original_title'], result) for result in batch_results)
+            extracted_count += len(batch_results)
+
+            for current_index, title in enumerate(batch, start + 1):
+                if title not in recent:  # AI抽出の途中で停止した場合
+                    break
+                recent.move_to_end(title)
+                # 重複タイトルも行ごとに別の結果として返す
+                result = dict(recent[title])
+                completed_count += 1
+                if collect_results:
+                    results.append(result)
+                if progress_callback:
+                    progress_callback('completed', current_index, total, '', result)
 
-            # キーワード抽出（AIを使用するかどうかを決定）
-            if use_ai is None:
-                use_ai = self.use_ai
+            # 直近のタイトルだけを残す
+            while len(recent) > TITLE_DEDUP_WINDOW:
+                recent.popitem(last=False)
 
-            if use_ai:
-                keywords = self.extract_keywords_with_ai(title, mode, include_brand, result['brand'])
-            elif mode == 'strict':
-                keywords = self.extract_keywords_strict(title, include_brand, result['brand'])
-            elif mode == 'moderate':
-                keywords = self.extract_keywords_moderate(title, include_brand, result['brand'])
-            else:  # loose
-                keywords = self.extract_keywords_loose(title, include_brand, result['brand'])
-
-            # 翻訳モードに応じた処理
-            if translate_mode == 'none':  # 翻訳なし
-                result['keywords'] = keywords
-                result['translated_keywords'] = []
-            elif translate_mode == 'auto':  # 自動判定翻訳
-                result['keywords'] = keywords
-
-                # 抽出されたキーワードの言語を判定
-                keywords_text = ' '.join(keywords)
-                detected_lang = self.detect_language(keywords_text)
-
-                if detected_lang == 'ja':
-                    # 日本語→英語に翻訳
-                    translated_kw = [self.translate_text(kw, 'en') for kw in keywords]
-                    result['translated_keywords'] = translated_kw
-                else:
-                    # 英語→日本語に翻訳
-                    translated_kw = [self.translate_text(kw, 'ja') for kw in keywords]
-                    result['translated_keywords'] = translated_kw
+            print(f"[PROGRESS] タイトル処理: {completed_count}/{total}件")
 
-            results.append(result)
+        if translate_mode == 'auto':
+            self.translation_cache.save()
 
+        print(f"\n[COMPLETE] タイトル処理完了: {completed_count}件（重複を除いた処理: {extracted_count}件）")
         return results
 
 
 class CuteKeywordExtractorGUI:
+    # ワーカーからのイベントを取り出す間隔（約60fps）と1回に反映する最大件数
+    EVENT_POLL_INTERVAL_MS = 16
+    EVENT_BATCH_LIMIT = 200
+    # 進捗バー・統計・ステータスの再描画間隔（この間の変更は最新の状態だけを描画）
+    RENDER_INTERVAL_MS = 100
+    # イベントが届かない間（クールダウン・レート制限の待機中）も残り時間と処理速度パネルを更新する間隔
+    THROUGHPUT_TICK_MS = 1000
+    # 出力ファイルの種類（拡張子で形式を判定）
+    EXPORT_FILETYPES = [("CSVファイル", "*.csv"), ("TSVファイル", "*.tsv"), ("JSONLファイル", "*.jsonl"),
+                        ("SQLiteデータベース", "*.db"), ("すべてのファイル", "*.*")]
+
     def __init__(self, root):
         self.root = root
         self.root.title("✨ キーワード抽出ツール ✨")
@@ -1265,6 +3990,9 @@ class CuteKeywordExtractorGUI:
         self.ui_widgets = []  # 更新が必要なウィジェットを保存
         self.is_paused = False  # 一時停止フラグ
         self.processing = False  # 処理中フラグ
+        self.input_file = None  # 読み込んだ入力ファイルの設定（テキストエリアより優先、内容は処理時に1行ずつ読む）
+        self.live_exporter = None  # ライブ出力先（ResultExporter）
+        self.live_pending = {}  # 翻訳待ちでライブ出力を保留している行（ASIN → 行番号）
 
     def center_window(self):
         """ウィンドウを画面中央に配置"""
@@ -1366,21 +4094,11 @@ class CuteKeywordExtractorGUI:
                           highlightthickness=0)
         canvas.pack()
 
-        # 角丸四角形を描画する関数
-        def create_rounded_rect(x1, y1, x2, y2, radius=15, **kwargs):
-            points = []
-            for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1),
-                        (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
-                        (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
-                        (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
-                points.extend([x, y])
-            return canvas.create_polygon(points, smooth=True, **kwargs)
-
         # 角丸背景
-        rect_id = create_rounded_rect(2, 2, width-2, 43,
-                                      radius=12,
-                                      fill=bg_color,
-                                      outline='')
+        rect_id = canvas.create_polygon(self.rounded_rect_coords(2, 2, width-2, 43, radius=12),
+                                        smooth=True,
+                                        fill=bg_color,
+                                        outline='')
 
         # テキスト（読みやすい大きさ）
         text_id = canvas.create_text(width/2, 22,
@@ -1449,6 +4167,16 @@ class CuteKeywordExtractorGUI:
             self._enable_frame(self.brand_frame)
             self._enable_frame(self.ai_frame)
 
+        # タイトル入力モードは商品ページを取得しないため地域選択は不要
+        if mode == 'title':
+            self.input_label.config(text="タイトル入力")
+            self.input_hint.config(text="(1行に1タイトル)")
+            self._disable_frame(self.region_frame)
+        else:
+            self.input_label.config(text="ASIN入力")
+            self.input_hint.config(text="(1行に1ASIN)")
+            self._enable_frame(self.region_frame)
+
     def _disable_frame(self, frame):
         """フレーム内のすべてのウィジェットを無効化"""
         for child in frame.winfo_children():
@@ -1546,6 +4274,20 @@ class CuteKeywordExtractorGUI:
                                  command=self.on_process_mode_change)
         brand_rb.pack(anchor='w', pady=2)
 
+        # タイトルからキーワード抽出モード（商品ページを取得しない）
+        title_rb = tk.Radiobutton(process_mode_frame,
+                                 text="タイトルから抽出（取得なし）",
+                                 variable=self.process_mode,
+                                 value='title',
+                                 bg=self.colors['bg_secondary'],
+                                 fg=self.colors['text_primary'],
+                                 selectcolor=self.colors['bg_main'],
+                                 activebackground=self.colors['bg_secondary'],
+                                 activeforeground=self.colors['text_primary'],
+                                 font=self.get_scaled_font('label'),
+                                 command=self.on_process_mode_change)
+        title_rb.pack(anchor='w', pady=2)
+
         # 翻訳モード
         trans_frame = tk.Frame(left_panel, bg=self.colors['bg_secondary'])
         trans_frame.pack(fill='x', padx=20, pady=10)
@@ -1763,40 +4505,31 @@ class CuteKeywordExtractorGUI:
                                         highlightthickness=0)
         self.progress_canvas.pack(fill='x', pady=2)
 
-        # 角丸の四角形を描画する関数
-        def create_rounded_rect_for_progress(canvas, x1, y1, x2, y2, radius=4, **kwargs):
-            points = [
-                x1 + radius, y1,
-                x2 - radius, y1,
-                x2, y1,
-                x2, y1 + radius,
-                x2, y2 - radius,
-                x2, y2,
-                x2 - radius, y2,
-                x1 + radius, y2,
-                x1, y2,
-                x1, y2 - radius,
-                x1, y1 + radius,
-                x1, y1
-            ]
-            return canvas.create_polygon(points, smooth=True, **kwargs)
-
         # 左右のパディング
         padding = 5
 
         # 背景バー（角丸）
-        self.progress_bg_rect = create_rounded_rect_for_progress(
-            self.progress_canvas,
-            padding, 2, 250 - padding, 10,
-            radius=4,
+        self.progress_bg_rect = self.progress_canvas.create_polygon(
+            self.rounded_rect_coords(padding, 2, 250 - padding, 10, radius=4),
+            smooth=True,
             fill=self.colors['bg_main'],
             outline=''
         )
 
-        # 進捗バー（角丸）- 初期状態では非表示
-        self.progress_fill_rect = None
+        # 進捗バー（角丸）- 初期状態では非表示。以降は座標だけを更新して使い回す
+        self.progress_fill_rect = self.progress_canvas.create_polygon(
+            self.rounded_rect_coords(padding, 2, padding + 8, 10, radius=4),
+            smooth=True,
+            fill=self.colors['accent'],
+            outline='',
+            state='hidden'
+        )
         self.progress_padding = padding  # 保存しておく
 
+        # まとめて描画する変更（schedule_render参照）
+        self.pending_render = {}
+        self.render_scheduled = False
+
         self.progress_text = tk.Label(progress_frame,
                                     text="0 / 0 (0%)",
                                     font=self.get_scaled_font('small'),
@@ -1812,6 +4545,15 @@ class CuteKeywordExtractorGUI:
                                             fg=self.colors['text_secondary'])
         self.time_remaining_label.pack(anchor='w')
 
+        # 処理速度パネル（速度・成功率・CAPTCHA率・キャッシュ命中率）
+        self.throughput_label = tk.Label(progress_frame,
+                                         text="",
+                                         font=self.get_scaled_font('small'),
+                                         bg=self.colors['bg_tertiary'],
+                                         fg=self.colors['text_secondary'],
+                                         justify='left')
+        self.throughput_label.pack(anchor='w')
+
         # 右側パネル（メインコンテンツ）
         right_panel = tk.Frame(content_frame, bg=self.colors['bg_main'])
         right_panel.pack(side='left', fill='both', expand=True)
@@ -1873,53 +4615,69 @@ class CuteKeywordExtractorGUI:
         self.create_main_right_panel(right_panel)
 
 
-    def display_result(self, result):
-        """結果を表示に追加"""
+    def display_result(self, result) -> Optional[int]:
+        """結果を表示に追加し、追加した行番号を返す"""
         # ウィジェットの存在確認
-        if not hasattr(self, 'result_tree'):
-            return
-
-        try:
-            # ウィジェットが有効かチェック
-            self.result_tree.winfo_exists()
-        except:
-            return
+        if not hasattr(self, 'result_table'):
+            return None
 
         keywords_str = ' '.join(result['keywords'])
         translated_keywords_str = ' '.join(result['translated_keywords'])
 
-        # 交互に背景色を変える
-        try:
-            row_index = len(self.result_tree.get_children())
-        except:
-            return
-        tags = ('oddrow',) if row_index % 2 == 0 else ('evenrow',)
-
         # データの各値にパディングを追加（視覚的な区切り）
         asin_val = result.get('asin', '')  # ASINを取得
         title_val = result['original_title']
         brand_val = result['brand'] or ''
 
-        # フルデータを保存（コピー用）
-        item_id = self.result_tree.insert('', 'end', values=(
+        # 結果テーブルに追加（表示範囲の描画と自動スクロールはテーブル側で行う）
+        row_index = self.result_table.append((
             asin_val,
             title_val,
             brand_val,
             keywords_str,
             translated_keywords_str
-        ), tags=tags)
-
-        # フルデータ配列に追加
-        self.full_data.append({
-            'asin': asin_val,
-            'title': title_val,
-            'brand': brand_val,
-            'keywords': keywords_str,
-            'translated_keywords': translated_keywords_str
-        })
+        ))
+
+        # 翻訳の後追い更新用に行を記録（翻訳はASINの結果にだけ届き、ジョブ内でASINは重複しない）
+        if asin_val:
+            self.result_rows[asin_val] = row_index
+        return row_index
+
+    def apply_filter(self):
+        """絞り込みの文字列を結果テーブルに反映"""
+        query = self.filter_var.get()
+        self.result_table.set_filter(query)
+        self.result_table.render()
+        if query.strip():
+            self.result_status.config(
+                text=f"絞り込み: {self.result_table.display_count()}件 / {len(self.result_table)}件",
+                fg=self.colors['text_primary']
+            )
 
-        # テーブルを自動スクロール
-        self.result_tree.see(item_id)
+    def sort_results(self, column_index):
+        """列見出しのクリックで並べ替え（昇順 → 降順 → 追加順）"""
+        table = self.result_table
+        if table.sort_column != column_index:
+            table.set_sort(column_index)
+        elif not table.sort_descending:
+            table.set_sort(column_index, descending=True)
+        else:
+            table.set_sort(None)
+        table.render()
+
+        # 並べ替え中の列の見出しに向きを表示
+        for i, col in enumerate(self.result_tree['columns']):
+            mark = ''
+            if i == table.sort_column:
+                mark = ' ▼' if table.sort_descending else ' ▲'
+            self.result_tree.heading(col, text=col + mark)
+
+    def update_result_translation(self, result):
+        """表示済みの行の翻訳キーワードを更新"""
+        row_index = self.result_rows.get(result['asin'])
+        if row_index is None:
+            return
+        self.result_table.set_cell(row_index, 4, ' '.join(result['translated_keywords']))
 
     def create_input_area(self, parent):
         """テキスト入力エリアを作成"""
@@ -1965,6 +4723,10 @@ class CuteKeywordExtractorGUI:
         # 一時停止ボタンへの参照を保存
         self.pause_button = self.create_rounded_button(button_container1, "一時停止",
                                   '#ff9800', '#f57c00', self.pause_processing, width=140)
+        self.create_rounded_button(button_container1, "停止",
+                                  '#f44336', '#d32f2f', self.stop_extraction, width=100)
+        self.create_rounded_button(button_container1, "ファイル読込",
+                                  '#607d8b', '#455a64', self.load_input_file, width=140)
 
         # 2行目のボタン（コピー・出力系）
         button_container2 = tk.Frame(right_panel, bg=self.colors['bg_main'])
@@ -1980,8 +4742,10 @@ class CuteKeywordExtractorGUI:
                                   '#2196F3', '#1976D2', lambda: self.copy_column('keywords'), width=150)
         self.create_rounded_button(button_container2, "翻訳キーワードコピー",
                                   '#2196F3', '#1976D2', lambda: self.copy_column('translated_kw'), width=180)
-        self.create_rounded_button(button_container2, "CSV出力",
-                                  '#9c27b0', '#7b1fa2', self.export_csv, width=100)
+        self.create_rounded_button(button_container2, "ファイル出力",
+                                  '#9c27b0', '#7b1fa2', self.export_results, width=130)
+        self.create_rounded_button(button_container2, "ライブ出力",
+                                  '#9c27b0', '#7b1fa2', self.toggle_live_export, width=120)
 
         # 結果エリア
         result_container = tk.Frame(right_panel, bg=self.colors['bg_secondary'])
@@ -1996,6 +4760,24 @@ class CuteKeywordExtractorGUI:
                 bg=self.colors['bg_secondary'],
                 fg=self.colors['text_primary']).pack(side='left')
 
+        # 絞り込み（入力するたびに結果の索引から表示を更新）
+        tk.Label(result_header,
+                text="絞り込み:",
+                font=self.get_scaled_font('small'),
+                bg=self.colors['bg_secondary'],
+                fg=self.colors['text_secondary']).pack(side='left', padx=(20, 5))
+        self.filter_var = tk.StringVar()
+        tk.Entry(result_header,
+                textvariable=self.filter_var,
+                width=30,
+                font=self.get_scaled_font('small'),
+                bg=self.colors['input_bg'],
+                fg=self.colors['text_primary'],
+                insertbackground=self.colors['accent'],
+                relief='solid',
+                bd=1).pack(side='left')
+        self.filter_var.trace_add('write', lambda *args: self.apply_filter())
+
         self.result_status = tk.Label(result_header,
                                      text="準備完了",
                                      font=self.get_scaled_font('small'),
@@ -2015,8 +4797,9 @@ class CuteKeywordExtractorGUI:
 
         # カラムの設定
         widths = [100, 300, 100, 300, 300]
-        for col, width in zip(columns, widths):
-            self.result_tree.heading(col, text=col)
+        for column_index, (col, width) in enumerate(zip(columns, widths)):
+            # 見出しのクリックで並べ替え
+            self.result_tree.heading(col, text=col, command=lambda i=column_index: self.sort_results(i))
             self.result_tree.column(col, width=width, minwidth=80)
 
         # セルハイライト用の変数
@@ -2033,8 +4816,11 @@ class CuteKeywordExtractorGUI:
         # Treeviewを配置
         self.result_tree.place(x=0, y=0, relwidth=1, relheight=1)
 
-        self.result_tree.config(yscrollcommand=tree_scrollbar_y.set, xscrollcommand=tree_scrollbar_x.set)
-        tree_scrollbar_y.config(command=self.result_tree.yview)
+        # 縦方向は仮想化テーブルが表示範囲を管理（全行は self.result_table.rows に保持）
+        self.result_table = VirtualResultTable(self.result_tree, tree_scrollbar_y)
+        self.result_rows = {}
+
+        self.result_tree.config(xscrollcommand=tree_scrollbar_x.set)
         tree_scrollbar_x.config(command=self.result_tree.xview)
 
 
@@ -2047,7 +4833,7 @@ class CuteKeywordExtractorGUI:
             """セルをクリックした際にその内容をコピー"""
             # 前回のハイライトを削除
             if self.highlighted_item and self.original_values:
-                self.result_tree.item(self.highlighted_item, values=self.original_values)
+                self.result_table.render()
                 self.highlighted_item = None
                 self.highlighted_column = None
                 self.original_values = None
@@ -2058,10 +4844,12 @@ class CuteKeywordExtractorGUI:
                 item = self.result_tree.identify_row(event.y)
                 column = self.result_tree.identify_column(event.x)
 
-                if item and column:
+                # 表示中の行IDから元の行番号を引き、Treeviewではなく保持している行の値を使う
+                row_index = self.result_table.item_index(item) if item else None
+                if row_index is not None and column:
                     # 列のインデックスを取得（#1, #2, #3, #4）
                     col_index = int(column.replace('#', '')) - 1
-                    values = self.result_tree.item(item, 'values')
+                    values = self.result_table.rows[row_index]
 
                     if 0 <= col_index < len(values):
 
@@ -2089,13 +4877,13 @@ class CuteKeywordExtractorGUI:
                         # 2秒後にハイライトを削除とメッセージを戻す
                         def remove_highlight_and_message():
                             if self.highlighted_item and self.original_values:
-                                self.result_tree.item(self.highlighted_item, values=self.original_values)
+                                self.result_table.render()
                                 self.highlighted_item = None
                                 self.highlighted_column = None
                                 self.original_values = None
                             # メッセージも同時に戻す
                             self.result_status.config(
-                                text=f"完了: {len(self.result_tree.get_children())}件",
+                                text=f"完了: {len(self.result_table)}件",
                                 fg=self.colors['text_primary']
                             )
                         self.root.after(2000, remove_highlight_and_message)
@@ -2143,6 +4931,60 @@ class CuteKeywordExtractorGUI:
         # セルハイライト用の設定
         self.result_tree.tag_configure('cell_highlight', background='#BBDEFB', foreground='#1976D2')  # より目立つ青色
 
+    def schedule_render(self, progress=None, stats=None, status=None):
+        """進捗・統計・ステータスの変更を予約（RENDER_INTERVAL_MSごとにまとめて描画）
+
+        Args:
+            progress: update_progressの引数 (current, total, start_time)
+            stats: 統計ラベルのテキスト
+            status: ステータスラベルのテキスト
+        """
+        if progress is not None:
+            self.pending_render['progress'] = progress
+        if stats is not None:
+            self.pending_render['stats'] = stats
+        if status is not None:
+            self.pending_render['status'] = status
+
+        if not self.render_scheduled:
+            self.render_scheduled = True
+            self.root.after(self.RENDER_INTERVAL_MS, self.flush_render)
+
+    def flush_render(self):
+        """予約された変更のうち最新のものだけを描画"""
+        self.render_scheduled = False
+        pending, self.pending_render = self.pending_render, {}
+
+        if 'progress' in pending:
+            self.update_progress(*pending['progress'])
+            self.update_throughput()
+        if 'stats' in pending:
+            self.stats_label.config(text=pending['stats'])
+        if 'status' in pending:
+            self.result_status.config(text=pending['status'], fg=self.colors['text_primary'])
+
+        # ライブ出力も描画と同じ間隔でファイルに反映
+        if self.live_exporter:
+            self.live_exporter.flush()
+
+    @staticmethod
+    def rounded_rect_coords(x1, y1, x2, y2, radius=4):
+        """角丸の四角形（smooth=Trueのポリゴン）の座標"""
+        return [
+            x1 + radius, y1,
+            x2 - radius, y1,
+            x2, y1,
+            x2, y1 + radius,
+            x2, y2 - radius,
+            x2, y2,
+            x2 - radius, y2,
+            x1 + radius, y2,
+            x1, y2,
+            x1, y2 - radius,
+            x1, y1 + radius,
+            x1, y1
+        ]
+
     def update_progress(self, current, total, start_time=None):
         """プログレスバーを更新（角丸、細いバー）"""
         # キャンバスの幅を取得
@@ -2161,45 +5003,21 @@ class CuteKeywordExtractorGUI:
         usable_width = canvas_width - (padding * 2)
         fill_width = int(usable_width * progress)
 
-        # 角丸の四角形を描画する関数
-        def create_rounded_rect_coords(x1, y1, x2, y2, radius=4):
-            points = [
-                x1 + radius, y1,
-                x2 - radius, y1,
-                x2, y1,
-                x2, y1 + radius,
-                x2, y2 - radius,
-                x2, y2,
-                x2 - radius, y2,
-                x1 + radius, y2,
-                x1, y2,
-                x1, y2 - radius,
-                x1, y1 + radius,
-                x1, y1
-            ]
-            return points
-
         # 背景バーを更新（角丸）
-        bg_coords = create_rounded_rect_coords(padding, 2, canvas_width - padding, 10, radius=4)
+        bg_coords = self.rounded_rect_coords(padding, 2, canvas_width - padding, 10, radius=4)
         self.progress_canvas.coords(self.progress_bg_rect, *bg_coords)
 
-        # 進捗バーを削除して再描画（角丸）
-        if self.progress_fill_rect:
-            self.progress_canvas.delete(self.progress_fill_rect)
-            self.progress_fill_rect = None
-
-        if fill_width > 8:  # 最小幅8px以上の場合のみ描画
-            fill_coords = create_rounded_rect_coords(
+        # 進捗バーは作り直さず座標だけを更新（角丸）
+        if fill_width > 8:  # 最小幅8px以上の場合のみ表示
+            fill_coords = self.rounded_rect_coords(
                 padding, 2,
                 padding + fill_width, 10,
                 radius=4
             )
-            self.progress_fill_rect = self.progress_canvas.create_polygon(
-                fill_coords,
-                fill=self.colors['accent'],
-                outline='',
-                smooth=True
-            )
+            self.progress_canvas.coords(self.progress_fill_rect, *fill_coords)
+            self.progress_canvas.itemconfig(self.progress_fill_rect, state='normal')
+        else:
+            self.progress_canvas.itemconfig(self.progress_fill_rect, state='hidden')
 
         # テキスト更新
         percentage = int(progress * 100)
@@ -2207,10 +5025,11 @@ class CuteKeywordExtractorGUI:
 
         # 残り時間を計算
         if start_time and current > 0:
-            elapsed_time = time.time() - start_time
-            avg_time_per_item = elapsed_time / current
-            remaining_items = total - current
-            remaining_seconds = avg_time_per_item * remaining_items
+            remaining_seconds = self.estimate_remaining_seconds(total - current)
+            if remaining_seconds is None:
+                # 速度がまだ測れていない間は平均から見積もる
+                elapsed_time = time.time() - start_time
+                remaining_seconds = elapsed_time / current * (total - current)
 
             if remaining_seconds > 60:
                 remaining_minutes = int(remaining_seconds / 60)
@@ -2222,220 +5041,419 @@ class CuteKeywordExtractorGUI:
         else:
             self.time_remaining_label.config(text="")
 
-        self.root.update()
+    def estimate_remaining_seconds(self, remaining: int) -> Optional[float]:
+        """処理速度（EWMA）・残りのクールダウン・現在のレート制限から残り時間を見積もる"""
+        state = getattr(self, 'run_state', None)
+        if not self.processing or not state:
+            return None
+
+        if state['scraping']:
+            # 商品ページの取得は現在の待機倍率より速くはならない
+            min_interval = self.extractor.rate_limiter.expected_delay()
+        else:
+            min_interval = 0.0
+        return state['meter'].estimate_remaining(
+            state['rate_stage'], remaining,
+            cooldown=state['batch_cooldown'], min_interval=min_interval
+        )
+
+    def throughput_tick(self, state):
+        """処理中は一定間隔で残り時間と処理速度パネルを再描画（前回の処理の予約は破棄）"""
+        if not self.processing or state is not self.run_state:
+            return
+        self.schedule_render(progress=(state['processed_count'], state['total_count'], state['start_time']))
+        self.root.after(self.THROUGHPUT_TICK_MS, self.throughput_tick, state)
+
+    def update_throughput(self):
+        """処理速度パネルを更新"""
+        state = getattr(self, 'run_state', None)
+        if not state:
+            self.throughput_label.config(text="")
+            return
+
+        meter = state['meter']
+        lines = []
+
+        rate = meter.rate(state['rate_stage'])
+        speed = f"速度: {rate * 60:.1f}件/分" if rate else "速度: 計測中..."
+        translate_rate = meter.rate('translate')
+        if translate_rate:
+            speed += f"（翻訳 {translate_rate * 60:.1f}件/分）"
+        lines.append(speed)
+
+        cache = self.extractor.translation_cache
+        cache_hits = cache.hits - state['cache_base'][0]
+        cache_lookups = cache_hits + cache.misses - state['cache_base'][1]
+
+        if state['scraping']:
+            # 今回の処理分だけの取得統計
+            stats = {key: value - state['stats_base'].get(key, 0)
+                     for key, value in self.extractor.scraping_stats.items()}
+            fetched = stats['total']
+            if fetched > 0:
+                lines.append(f"成功率: {stats['success'] / fetched * 100:.0f}% / "
+                             f"CAPTCHA: {stats['captcha_count'] / fetched * 100:.0f}%")
+            page_lookups = fetched + stats['not_found_skipped']
+            cache_line = []
+            if page_lookups > 0:
+                cache_line.append(f"ページ {stats['not_found_skipped'] / page_lookups * 100:.0f}%")
+            if cache_lookups > 0:
+                cache_line.append(f"翻訳 {cache_hits / cache_lookups * 100:.0f}%")
+            if cache_line:
+                lines.append("キャッシュ: " + " / ".join(cache_line))
+
+            multiplier = self.extractor.rate_limiter.multiplier
+            if multiplier > 1.0:
+                lines.append(f"待機倍率: ×{multiplier:.1f}")
+        elif cache_lookups > 0:
+            lines.append(f"キャッシュ: 翻訳 {cache_hits / cache_lookups * 100:.0f}%")
+
+        cooldown_left = meter.cooldown_until - time.perf_counter()
+        if cooldown_left > 0:
+            lines.append(f"クールダウン中: 残り {int(cooldown_left)} 秒")
+
+        self.throughput_label.config(text="\n".join(lines))
 
     def extract_keywords(self):
-        """キーワード抽出処理"""
-        # 結果をクリア
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        """キーワード抽出処理（処理はワーカースレッドで行い、GUIはイベントキューから更新）"""
+        # 処理中の二重起動を防止
+        if self.processing:
+            return
 
-        # フルデータもクリア
-        self.full_data = []
+        # 結果をクリア
+        self.result_table.clear()
+        self.extractor.last_job_id = None  # 出力はジョブが作られるまでテーブルから
+        self.result_rows = {}
 
         # ステータス更新
         self.result_status.config(text="処理中...", fg=self.colors['text_primary'])
 
         # プログレスバーを初期化
         self.update_progress(0, 0)
-        self.root.update()
 
-        # 入力取得（ASINを大文字に正規化）
-        input_text = self.input_text.get('1.0', 'end-1c')
-        inputs = [line.strip().upper() for line in input_text.split('\n') if line.strip()]
+        # 入力取得（読み込んだファイルがあればそちらを優先）
+        title_mode = self.process_mode.get() == 'title'
+        if self.input_file is not None:
+            inputs = self.open_input_file(title_mode)
+        else:
+            inputs = self.read_input_text(title_mode)
+        if inputs is None:
+            return
+
+        # 翻訳モードの解析
+        translate_map = {
+            'なし': 'none',
+            'あり': 'auto'
+        }
+
+        # Tkの変数はワーカースレッドから読まないよう、ここで設定を確定
+        settings = {
+            'process_mode': self.process_mode.get(),
+            'region': self.amazon_region.get(),
+            'mode': self.extract_mode.get(),
+            'translate_mode': translate_map[self.translate_mode.get()],
+            'include_brand': self.include_brand.get()
+        }
+        # バッチ間クールダウン（ブランド名取得モードは受信量が少ないため別設定、既定は0秒）
+        if settings['process_mode'] == 'keyword':
+            settings['batch_cooldown'] = self.extractor.scraping_config['batch_cooldown']
+        elif settings['process_mode'] == 'brand':
+            settings['batch_cooldown'] = self.extractor.scraping_config.get('brand_batch_cooldown', 0)
+        else:
+            settings['batch_cooldown'] = 0
+
+        # 処理開始
+        self.processing = True
+        self.is_paused = False
+        self.extractor.cancel_token.reset()
+
+        # ボタンテキストを「一時停止」にリセット
+        if hasattr(self, 'pause_button'):
+            self.pause_button['canvas'].itemconfig(
+                self.pause_button['text_id'],
+                text=f"⏸ 一時停止"
+            )
+
+        # 結果表示準備（入力ファイルの件数はワーカーが数えて'total'イベントで通知）
+        self.run_state = {
+            'total_count': 0 if isinstance(inputs, InputSource) else len(inputs),
+            'processed_count': 0,  # 実際に処理された件数
+            'brand_count': 0,
+            'start_time': time.time(),  # 処理開始時刻を記録
+            # 翻訳をバックグラウンドで行う場合、ライブ出力は翻訳の完了を待つ
+            'translate_later': settings['process_mode'] == 'keyword' and settings['translate_mode'] == 'auto',
+            # 処理速度パネル用（取得統計とキャッシュの件数は今回の処理分だけを表示）
+            'meter': ThroughputMeter(),
+            'rate_stage': 'extract' if settings['process_mode'] == 'title' else 'fetch',
+            'scraping': settings['process_mode'] != 'title',
+            'batch_cooldown': settings['batch_cooldown'],
+            'stats_base': self.extractor.scraping_stats.copy(),
+            'cache_base': (self.extractor.translation_cache.hits, self.extractor.translation_cache.misses),
+            'paused_at': None,
+            'retry_asins': set(),  # 再試行キューで待機中のASIN
+            'translation_failed': 0  # 翻訳に失敗し、原文のキーワードのまま保存した件数
+        }
+
+        # プログレスバーの初期化
+        self.update_progress(0, self.run_state['total_count'], self.run_state['start_time'])
+
+        # ワーカースレッドで処理を開始し、イベントキューの取り出しを予約
+        self.event_queue = queue.Queue()
+        self.worker_thread = threading.Thread(
+            target=self.run_extraction, args=(inputs, settings), daemon=True
+        )
+        self.worker_thread.start()
+        self.root.after(self.EVENT_POLL_INTERVAL_MS, self.drain_events)
+        self.root.after(self.THROUGHPUT_TICK_MS, self.throughput_tick, self.run_state)
+
+    def read_input_text(self, title_mode: bool) -> Optional[List[str]]:
+        """テキストエリアの入力を読み込む（入力がなければ警告してNoneを返す）"""
+        lines = self.input_text.get('1.0', 'end-1c').split('\n')
+
+        if title_mode:
+            # タイトル入力モード: 1行1タイトルをそのまま使う
+            inputs = [line.strip() for line in lines if line.strip()]
+        else:
+            # ASINを大文字に正規化
+            inputs = [line.strip().upper() for line in lines if line.strip()]
 
         if not inputs:
             self.result_status.config(text="入力なし", fg=self.colors['text_primary'])
-            messagebox.showwarning("警告", "ASINを入力してください")
-            return
+            messagebox.showwarning("警告", "タイトルを入力してください" if title_mode else "ASINを入力してください")
+            return None
+
+        if title_mode:
+            return inputs
 
-        # ASINの長さをチェック
+        # ASINの形式（英数字10文字）をチェック
         valid_inputs = []
         for asin in inputs:
-            if len(asin) == 10:
+            if ASIN_PATTERN.match(asin):
                 valid_inputs.append(asin)
             else:
-                print(f"警告: 無効なASIN長さ: {asin} (長さ: {len(asin)})")
+                print(f"警告: 無効なASIN: {asin} (長さ: {len(asin)})")
 
         if not valid_inputs:
             self.result_status.config(text="有効なASINがありません", fg=self.colors['text_primary'])
-            messagebox.showwarning("警告", "有効なASINがありません（ASINは10文字である必要があります）")
-            return
+            messagebox.showwarning("警告", "有効なASINがありません（ASINは英数字10文字である必要があります）")
+            return None
 
-        inputs = valid_inputs
+        return valid_inputs
 
-        # 翻訳モードの解析
-        translate_map = {
-            'なし': 'none',
-            'あり': 'auto'
-        }
-        translate_mode = translate_map[self.translate_mode.get()]
+    def open_input_file(self, title_mode: bool) -> Optional[InputSource]:
+        """読み込んだ入力ファイルのInputSourceを作成（有効な行がなければ警告してNoneを返す）"""
+        source = InputSource(kind='title' if title_mode else 'asin', **self.input_file)
 
+        # 全体は読まず、有効な行が1件でもあるかだけを確認（件数はワーカーが数える）
+        probe = iter(source)
         try:
-            # 処理開始
-            self.processing = True
-            self.is_paused = False
-
-            # ボタンテキストを「一時停止」にリセット
-            if hasattr(self, 'pause_button'):
-                self.pause_button['canvas'].itemconfig(
-                    self.pause_button['text_id'],
-                    text=f"⏸ 一時停止"
-                )
+            has_input = next(probe, None) is not None
+        except OSError as e:
+            messagebox.showerror("エラー", f"ファイルを読み込めませんでした:\n{str(e)}")
+            return None
+        finally:
+            probe.close()  # 読みかけのファイルを閉じる
 
-            # 結果表示準備
-            brand_count = 0
-            total_count = len(inputs)
-            results = []
-            processed_count = 0  # 実際に処理された件数
-
-            # 処理開始時刻を記録
-            start_time = time.time()
-
-            # プログレスバーの初期化
-            self.update_progress(0, total_count, start_time)
-            self.root.update()
-
-            # 処理モードで分岐
-            process_mode = self.process_mode.get()
-            region = self.amazon_region.get()
-
-            # コールバック関数を定義
-            def progress_callback(status, current_index, total, asin, result):
-                """進捗コールバック"""
-                nonlocal processed_count, brand_count
-
-                if status == 'processing':
-                    # 処理開始時
-                    self.result_status.config(
-                        text=f"処理中... {current_index}/{total} (ASIN: {asin})",
-                        fg=self.colors['text_primary']
-                    )
-                    self.root.update()
+        if not has_input:
+            self.result_status.config(text="有効な入力がありません", fg=self.colors['text_primary'])
+            messagebox.showwarning("警告", "ファイルに有効な" + ("タイトル" if title_mode else "ASIN") + "がありません")
+            return None
 
-                elif status in ('completed', 'failed'):
-                    # 処理完了または失敗時
-                    if result:
-                        results.append(result)
-                        processed_count += 1
+        return source
 
-                        # ブランド数カウント
-                        if result.get('brand'):
-                            brand_count += 1
+    def run_extraction(self, inputs, settings):
+        """ワーカースレッドで抽出を実行し、進捗をイベントキューに送る"""
+        events = self.event_queue
 
-                        # リアルタイム表示
-                        self.display_result(result)
+        def progress_callback(status, current_index, total, asin, result):
+            """進捗コールバック（ワーカースレッドから呼ばれる）"""
+            events.put((status, current_index, total, asin, result))
 
-                        # プログレスバーと統計情報を更新
-                        self.update_progress(processed_count, total_count, start_time)
-                        self.stats_label.config(
-                            text=f"件数: {processed_count}/{total_count}\nブランド数: {brand_count}\n処理状況: 処理中..."
-                        )
-                        self.result_status.config(
-                            text=f"処理中... {processed_count}/{total_count}",
-                            fg=self.colors['text_primary']
-                        )
-                        self.root.update()
+        cancel_token = self.extractor.cancel_token
 
-            def should_stop_callback():
-                """停止判定コールバック"""
-                # 一時停止チェック
-                while self.is_paused and self.processing:
-                    self.root.update()
-                    time.sleep(0.1)
+        def should_stop_callback():
+            """停止判定コールバック"""
+            # 一時停止中はワーカースレッドだけが待機する（再開・停止ですぐに戻る）
+            return cancel_token.wait_if_paused()
 
-                return not self.processing
+        try:
+            # 入力ファイルの件数を数えてGUIに通知（数えた結果はジョブ作成でも再利用）
+            if isinstance(inputs, InputSource):
+                events.put(('total', 0, inputs.count(), '', None))
 
+            # どのモードも結果はイベントで1件ずつ受け取るため、抽出側では保持させない（collect_results=False）
             # キーワード抽出モードの場合は新しいprocess_asins()を使用
-            if process_mode == 'keyword':
+            if settings['process_mode'] == 'keyword':
                 print(f"\n[GUI] 新しいバッチ処理モードで実行します")
-                results = self.extractor.process_asins(
+                self.extractor.process_asins(
                     asins=inputs,
-                    mode=self.extract_mode.get(),
-                    translate_mode=translate_mode,
-                    include_brand=self.include_brand.get(),
-                    region=region,
+                    mode=settings['mode'],
+                    translate_mode=settings['translate_mode'],
+                    include_brand=settings['include_brand'],
+                    region=settings['region'],
                     use_ai=None,  # AIはextractor内で自動判定
                     batch_size=self.extractor.scraping_config['batch_size'],
-                    batch_cooldown=self.extractor.scraping_config['batch_cooldown'],
+                    batch_cooldown=settings['batch_cooldown'],
                     enable_progress_save=True,
                     progress_callback=progress_callback,
-                    should_stop_callback=should_stop_callback
+                    should_stop_callback=should_stop_callback,
+                    collect_results=False
+                )
+
+            # タイトル入力モードは商品ページを取得せずに抽出だけを行う
+            elif settings['process_mode'] == 'title':
+                print(f"\n[GUI] タイトル入力モードで実行します")
+                self.extractor.process_titles(
+                    titles=inputs,
+                    mode=settings['mode'],
+                    translate_mode=settings['translate_mode'],
+                    include_brand=settings['include_brand'],
+                    use_ai=None,  # AIはextractor内で自動判定
+                    progress_callback=progress_callback,
+                    should_stop_callback=should_stop_callback,
+                    collect_results=False
                 )
-                processed_count = len(results)
-                for result in results:
-                    if result.get('brand'):
-                        brand_count += 1
 
-            # ブランド名取得モードの場合は従来の処理（特別な待機時間が必要）
+            # ブランド名取得モードも同じバッチ処理で実行（ブランド欄だけを取得し、進捗も保存）
             else:
                 print(f"\n[GUI] ブランド名取得モードで実行します")
-                for i, asin in enumerate(inputs, 1):
-                    if not self.processing:
-                        break
+                self.extractor.process_asins(
+                    asins=inputs,
+                    mode='brand',
+                    translate_mode='none',
+                    include_brand=True,
+                    region=settings['region'],
+                    use_ai=False,  # キーワード抽出をしないためプロンプトはジョブの識別に含めない
+                    batch_size=self.extractor.scraping_config['batch_size'],
+                    batch_cooldown=settings['batch_cooldown'],
+                    enable_progress_save=True,
+                    progress_callback=progress_callback,
+                    should_stop_callback=should_stop_callback,
+                    collect_results=False
+                )
 
-                    # 一時停止チェック
-                    while self.is_paused and self.processing:
-                        self.root.update()
-                        time.sleep(0.1)
+            # 学習したブランドと翻訳キャッシュを保存
+            self.extractor.save_caches()
+            events.put(('done', 0, 0, '', None))
 
-                    if not self.processing:
-                        break
+        except Exception as e:
+            events.put(('error', 0, 0, '', e))
 
-                    # ステータス表示
-                    self.result_status.config(
-                        text=f"処理中... {i}/{total_count} (ASIN: {asin})",
-                        fg=self.colors['text_primary']
-                    )
-                    self.root.update()
-
-                    # ASINから商品タイトルとブランド名を取得
-                    title, brand_from_asin = self.extractor.fetch_product_info_from_asin(asin, region)
-
-                    # ブランド名取得モード: ASINとブランド名だけを表示
-                    result = {
-                        'asin': asin,
-                        'original_title': '',  # 商品タイトルは表示しない
-                        'brand': brand_from_asin if brand_from_asin else '',
-                        'keywords': [],
-                        'translated_keywords': []
-                    }
+    def drain_events(self):
+        """イベントキューを取り出してGUIを更新（メインスレッドで定期実行）"""
+        # 大量のイベントが溜まっても1回の描画間隔を超えないよう件数を制限
+        for _ in range(self.EVENT_BATCH_LIMIT):
+            try:
+                event = self.event_queue.get_nowait()
+            except queue.Empty:
+                break
+            if not self.handle_event(*event):
+                return
 
-                    # 結果を追加
-                    results.append(result)
-                    processed_count += 1
+        self.root.after(self.EVENT_POLL_INTERVAL_MS, self.drain_events)
 
-                    # ブランド数カウント
-                    if result.get('brand'):
-                        brand_count += 1
+    def handle_event(self, status, current_index, total, asin, result) -> bool:
+        """ワーカーからのイベントを1件反映（処理が終わったらFalseを返す）"""
+        state = self.run_state
+        total_count = state['total_count']
 
-                    # リアルタイム表示
-                    self.display_result(result)
+        if status == 'total':
+            # 入力ファイルの件数が確定した時
+            state['total_count'] = total
+            self.schedule_render(progress=(state['processed_count'], total, state['start_time']))
 
-                    # プログレスバーと統計情報を更新
-                    self.update_progress(processed_count, total_count, start_time)
-                    self.stats_label.config(
-                        text=f"件数: {processed_count}/{total_count}\nブランド数: {brand_count}\n処理状況: 処理中..."
-                    )
-                    self.result_status.config(
-                        text=f"処理中... {processed_count}/{total_count}",
-                        fg=self.colors['text_primary']
+        elif status == 'processing':
+            # 処理開始時（タイトル入力モードはASINなし）
+            if asin:
+                self.schedule_render(status=f"処理中... {current_index}/{total} (ASIN: {asin})")
+            else:
+                self.schedule_render(status=f"処理中... {current_index}/{total}")
+
+        elif status == 'batch':
+            # バッチ開始時（このバッチを含め、残りのバッチ間クールダウンの回数を更新）
+            state['meter'].cooldown_until = 0.0
+            state['meter'].remaining_cooldowns = total - current_index
+
+        elif status == 'cooldown':
+            # バッチ間クールダウン開始時（待機時間は速度から除き、残り時間に加算）
+            state['meter'].start_cooldown(result, total - current_index - 1)
+            self.schedule_render(progress=(state['processed_count'], total_count, state['start_time']))
+
+        elif status == 'retry':
+            # 取得に失敗し、再試行キューに入った時（結果は確定していないので件数には含めない）
+            state['retry_asins'].add(asin)
+            self.schedule_render(
+                stats=self.format_run_stats(state, total_count),
+                status=f"再試行待ち: {asin}（{result['attempt']}/{result['max_attempts']}回目失敗・"
+                       f"{result['delay']:.0f}秒後に再試行）"
+            )
+
+        elif status in ('completed', 'failed', 'restored'):
+            # 処理完了・失敗時、または前回の結果を復元した時
+            state['retry_asins'].discard(asin)
+            if result:
+                state['processed_count'] += 1
+                if status != 'restored':
+                    state['meter'].record(state['rate_stage'])
+
+                # ブランド数カウント
+                if result.get('brand'):
+                    state['brand_count'] += 1
+
+                # リアルタイム表示
+                row_index = self.display_result(result)
+                self.export_live_result(
+                    row_index, result.get('asin', ''), wait_translation=status == 'completed' and state['translate_later'] and bool(result['keywords']))
+
+                # プログレスバーと統計情報の更新を予約
+                self.schedule_render(
+                    progress=(state['processed_count'], total_count, state['start_time']),
+                    stats=self.format_run_stats(state, total_count),
+                    status=f"処理中... {state['processed_count']}/{total_count}"
+                )
+
+        elif status in ('translated', 'translation_failed'):
+            # バックグラウンド翻訳の完了時（失敗時は原文のキーワードで行を確定）
+            if result:
+                state['meter'].record('translate')
+                self.update_result_translation(result)
+                if result['asin'] in self.live_pending:
+                    self.export_live_result(self.live_pending[result['asin']], result['asin'])
+                if status == 'translation_failed':
+                    state['translation_failed'] += 1
+                    self.schedule_render(
+                        stats=self.format_run_stats(state, total_count),
+                        status=f"翻訳に失敗: {result['asin']}（原文のキーワードのまま保存）"
                     )
 
-                    # ブランド名取得モードは処理が速いため、追加の待機時間を設ける
-                    import random
-                    wait_time = random.uniform(10, 15)
-                    print(f"次のリクエストまで {wait_time:.1f}秒待機中...")
-                    time.sleep(wait_time)
+        elif status == 'error':
+            # 予約中の描画を先に反映し、最終表示が上書きされないようにする
+            self.flush_render()
+            self.export_live_pending()
+            self.processing = False
+            self.is_paused = False
+            self.result_status.config(text="エラー発生", fg=self.colors['text_primary'])
+            messagebox.showerror("エラー", f"処理中にエラーが発生しました:\n{str(result)}")
+            return False
 
-            # 統計更新（最終）
-            self.stats_label.config(
-                text=f"件数: {processed_count}\nブランド数: {brand_count}\n処理状況: 完了"
-            )
+        elif status == 'done':
+            # 処理終了（予約中の描画を先に反映し、最終表示が上書きされないようにする）
+            self.flush_render()
+            self.export_live_pending()
+            self.processing = False
+            self.is_paused = False
+            processed_count = state['processed_count']
+
+            # 統計更新（最終。翻訳に失敗した件数があれば残す）
+            stats_text = f"件数: {processed_count}\nブランド数: {state['brand_count']}\n処理状況: 完了"
+            if state['translation_failed']:
+                stats_text += f"\n翻訳失敗: {state['translation_failed']}件（原文のまま）"
+            self.stats_label.config(text=stats_text)
 
             # プログレスバーを完了状態に
-            self.update_progress(processed_count, total_count, start_time)
+            self.update_progress(processed_count, total_count, state['start_time'])
             self.time_remaining_label.config(text="")  # 残り時間をクリア
+            self.update_throughput()
 
             # ステータス更新（スキップ件数を表示）
             skipped_count = total_count - processed_count
@@ -2449,53 +5467,53 @@ class CuteKeywordExtractorGUI:
                     text=f"✓ {processed_count}件処理完了",
                     fg=self.colors['text_primary']
                 )
+            return False
 
-        except Exception as e:
-            self.result_status.config(text="エラー発生", fg=self.colors['text_primary'])
-            messagebox.showerror("エラー", f"処理中にエラーが発生しました:\n{str(e)}")
-        finally:
-            # 処理終了
-            self.processing = False
-            self.is_paused = False
+        return True
+
+    @staticmethod
+    def format_run_stats(state, total_count) -> str:
+        """処理中の統計表示（再試行待ちがあれば件数を追加）"""
+        text = f"件数: {state['processed_count']}/{total_count}\nブランド数: {state['brand_count']}\n処理状況: 処理中..."
+        if state['retry_asins']:
+            text += f"\n再試行待ち: {len(state['retry_asins'])}件"
+        if state['translation_failed']:
+            text += f"\n翻訳失敗: {state['translation_failed']}件"
+        return text
 
     def clear_all(self):
         """全てクリア"""
         self.input_text.delete('1.0', 'end')
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
-        self.full_data = []  # フルデータもクリア
+        self.input_file = None
+        self.filter_var.set('')
+        self.result_table.clear()
+        self.extractor.last_job_id = None
+        self.result_rows = {}
         self.result_status.config(text="クリア済み", fg=self.colors['text_secondary'])
         self.stats_label.config(text="件数: 0\nブランド数: 0\n処理状況: 待機中")
-        # プログレスバーもリセット
-        self.progress_bar['value'] = 0
-        self.progress_text.config(text="0 / 0 (0%)")
+        # プログレスバーと処理速度パネルもリセット
+        self.update_progress(0, 0)
+        self.throughput_label.config(text="")
 
     def reset_progress(self):
         """進捗ファイルをリセット"""
         import os
         from tkinter import messagebox
 
-        progress_file = '.progress.json'
+        jobs = self.extractor.list_jobs()
+        legacy_journal = ProgressJournal('.progress.json')
 
-        # 進捗ファイルの存在確認
-        if not os.path.exists(progress_file):
+        # 進捗データの存在確認
+        if not jobs and not legacy_journal.exists() and not os.path.exists('.progress.db'):
             messagebox.showinfo(
                 "進捗リセット",
-                "リセットする進捗データはありません。\n\n進捗ファイル (.progress.json) が見つかりませんでした。"
+                "リセットする進捗データはありません。\n\n保存中のジョブ (.jobs) が見つかりませんでした。"
             )
             return
 
-        # 確認ダイアログ
-        try:
-            # 進捗ファイルの内容を読み込んで件数を表示
-            import json
-            with open(progress_file, 'r', encoding='utf-8') as f:
-                progress_data = json.load(f)
-                processed_count = len(progress_data.get('processed_asins', []))
-
-            message = f"現在の進捗データ（{processed_count}件）を削除します。\n\nこの操作は取り消せません。\n本当に削除しますか？"
-        except:
-            message = "進捗データを削除します。\n\nこの操作は取り消せません。\n本当に削除しますか？"
+        # 確認ダイアログ（ジョブ数と処理済み件数を表示）
+        processed_count = sum(job['processed'] for job in jobs)
+        message = f"現在の進捗データ（{len(jobs)}ジョブ・{processed_count}件）を削除します。\n\nこの操作は取り消せません。\n本当に削除しますか？"
 
         result = messagebox.askyesno(
             "進捗リセット確認",
@@ -2505,13 +5523,13 @@ class CuteKeywordExtractorGUI:
 
         if result:
             try:
-                os.remove(progress_file)
+                self.extractor.clear_progress()
                 messagebox.showinfo(
                     "完了",
                     "進捗データをリセットしました。\n\n次回の処理は最初から開始されます。"
                 )
                 self.result_status.config(text="進捗リセット完了", fg=self.colors['text_primary'])
-                print(f"[INFO] 進捗ファイルを削除しました: {progress_file}")
+                print(f"[INFO] 進捗データを削除しました: {len(jobs)}ジョブ")
             except Exception as e:
                 messagebox.showerror(
                     "エラー",
@@ -2525,13 +5543,20 @@ class CuteKeywordExtractorGUI:
             if self.is_paused:
                 # 再開
                 self.is_paused = False
+                self.extractor.cancel_token.resume()
+                # 一時停止していた時間は処理速度から除く
+                if self.run_state.get('paused_at') is not None:
+                    self.run_state['meter'].add_idle(time.perf_counter() - self.run_state['paused_at'])
+                    self.run_state['paused_at'] = None
                 self.result_status.config(text="処理を再開しました", fg=self.colors['text_primary'])
                 # ボタンテキストを「一時停止」に変更
                 if hasattr(self, 'pause_button') and isinstance(self.pause_button, dict):
                     self.pause_button['canvas'].itemconfig(self.pause_button['text_id'], text="一時停止")
             else:
-                # 一時停止
+                # 一時停止（待機中・受信中の処理も次のリクエスト前に止まる）
                 self.is_paused = True
+                self.extractor.cancel_token.pause()
+                self.run_state['paused_at'] = time.perf_counter()
                 self.result_status.config(text="一時停止中...", fg=self.colors['warning'])
                 # ボタンテキストを「再開」に変更
                 if hasattr(self, 'pause_button') and isinstance(self.pause_button, dict):
@@ -2539,12 +5564,97 @@ class CuteKeywordExtractorGUI:
         else:
             self.result_status.config(text="処理中ではありません", fg=self.colors['text_secondary'])
 
+    def load_input_file(self):
+        """入力ファイル（TXT: 1行に1件 / CSV・TSV: 列を選択）を指定し、テキストエリアの代わりに使う
+
+        ファイルの内容はここでは読み込まず、処理時にワーカーが1行ずつ読み出す
+        """
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(
+            filetypes=[("Text / CSV / TSV", "*.txt *.csv *.tsv"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+
+        source = InputSource(filename)
+        column, skip_header = 0, False
+        if source.delimiter:
+            try:
+                header = source.read_header()
+            except (OSError, UnicodeDecodeError) as e:
+                messagebox.showerror("エラー", f"ファイルを読み込めませんでした:\n{str(e)}")
+                return
+            selection = self.ask_input_column(header)
+            if selection is None:
+                return
+            column, skip_header = selection
+
+        self.input_file = {'path': filename, 'column': column, 'skip_header': skip_header}
+        column_text = f"・{column + 1}列目" if source.delimiter else ""
+        self.result_status.config(
+            text=f"ファイル指定: {os.path.basename(filename)}{column_text}（「全てクリア」で解除）",
+            fg=self.colors['text_primary']
+        )
+
+    def ask_input_column(self, header: List[str]) -> Optional[Tuple[int, bool]]:
+        """CSV/TSVの使用する列と見出し行の有無を選ぶダイアログ（キャンセル時はNone）"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("列の選択")
+        dialog.configure(bg=self.colors['bg_main'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog,
+                text="ASIN・タイトルの列:",
+                font=self.get_scaled_font('label'),
+                bg=self.colors['bg_main'],
+                fg=self.colors['text_primary']).pack(anchor='w', padx=20, pady=(15, 5))
+
+        choices = [f"{i + 1}: {name[:40]}" for i, name in enumerate(header)] or ["1"]
+        # 見出しにASIN・タイトルらしい列があれば初期選択にする
+        default_index = next((i for i, name in enumerate(header)
+                              if re.search(r'asin|title|タイトル|商品名', name, re.IGNORECASE)), 0)
+        column_var = tk.StringVar(value=choices[default_index])
+        ttk.Combobox(dialog,
+                     textvariable=column_var,
+                     values=choices,
+                     state='readonly',
+                     width=40).pack(padx=20, pady=5)
+
+        header_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(dialog,
+                      text="1行目は見出し",
+                      variable=header_var,
+                      bg=self.colors['bg_main'],
+                      fg=self.colors['text_primary'],
+                      selectcolor=self.colors['bg_main'],
+                      font=self.get_scaled_font('label')).pack(anchor='w', padx=20, pady=5)
+
+        selection = {}
+
+        def on_ok():
+            selection['value'] = (choices.index(column_var.get()), header_var.get())
+            dialog.destroy()
+
+        button_frame = tk.Frame(dialog, bg=self.colors['bg_main'])
+        button_frame.pack(pady=(5, 15))
+        tk.Button(button_frame, text="OK", width=10, command=on_ok).pack(side='left', padx=5)
+        tk.Button(button_frame, text="キャンセル", width=10, command=dialog.destroy).pack(side='left', padx=5)
+
+        self.root.wait_window(dialog)
+        return selection.get('value')
+
+    def stop_extraction(self):
+        """処理を停止（待機中・受信中の処理もすぐに中断し、進捗を保存して終了）"""
+        if self.processing:
+            self.extractor.cancel_token.cancel()
+            self.result_status.config(text="停止中...", fg=self.colors['warning'])
+        else:
+            self.result_status.config(text="処理中ではありません", fg=self.colors['text_secondary'])
+
     def copy_results(self):
         """結果をクリップボードにコピー"""
-        results = []
-        for item in self.result_tree.get_children():
-            values = self.result_tree.item(item, 'values')
-            results.append('\t'.join(values))
+        results = ['\t'.join(values) for values in self.result_table.rows]
 
         if results:
             result_text = '\n'.join(results)
@@ -2568,11 +5678,7 @@ class CuteKeywordExtractorGUI:
         if column_index is None:
             return
 
-        results = []
-        for item in self.result_tree.get_children():
-            values = self.result_tree.item(item, 'values')
-            if column_index < len(values):
-                results.append(values[column_index])
+        results = [values[column_index] for values in self.result_table.rows if column_index < len(values)]
 
         if results:
             result_text = '\n'.join(results)
@@ -2594,26 +5700,88 @@ class CuteKeywordExtractorGUI:
         else:
             self.result_status.config(text="コピーするデータがありません", fg=self.colors['text_primary'])
 
-    def export_csv(self):
-        """CSV形式でエクスポート"""
-        results = []
-        for item in self.result_tree.get_children():
-            values = self.result_tree.item(item, 'values')
-            results.append(','.join([f'"{v}"' for v in values]))
+    def export_results(self):
+        """結果をCSV・TSV・JSONL・SQLiteに出力
 
-        if results:
-            from tkinter import filedialog
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSVファイル", "*.csv"), ("すべてのファイル", "*.*")]
-            )
-            if filename:
-                with open(filename, 'w', encoding='utf-8-sig') as f:
-                    f.write("ASIN,商品タイトル,ブランド,キーワード,翻訳キーワード\n")
-                    f.write('\n'.join(results))
-                self.result_status.config(text=f"✓ {filename}に出力しました", fg=self.colors['text_primary'])
-        else:
+        ジョブとして保存した結果（キーワード抽出・ブランド名取得）はジョブストアから少しずつ読み出して
+        書き出す。ジョブのないタイトル入力モードはテーブルの全行を1行ずつ書き出す
+        """
+        if not len(self.result_table):
             self.result_status.config(text="出力する結果がありません", fg=self.colors['text_primary'])
+            return
+
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=self.EXPORT_FILETYPES)
+        if not filename:
+            return
+
+        self.result_status.config(text="出力中...", fg=self.colors['text_primary'])
+        self.root.update_idletasks()
+        job_id = self.extractor.last_job_id
+        try:
+            if job_id:
+                count = self.extractor.export_job(job_id, filename)
+            else:
+                with ResultExporter(filename) as exporter:
+                    count = exporter.write_many(self.result_table.rows)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            messagebox.showerror("エラー", f"出力に失敗しました:\n{str(e)}")
+            self.result_status.config(text="出力に失敗しました", fg=self.colors['text_primary'])
+            return
+        self.result_status.config(text=f"✓ {filename}に{count}件出力しました", fg=self.colors['text_primary'])
+
+    def toggle_live_export(self):
+        """ライブ出力の開始・終了（処理中の結果を届いた順にファイルへ追記）"""
+        if self.live_exporter:
+            self.stop_live_export()
+            return
+
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=self.EXPORT_FILETYPES)
+        if not filename:
+            return
+
+        try:
+            self.live_exporter = ResultExporter(filename)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            messagebox.showerror("エラー", f"出力ファイルを作成できませんでした:\n{str(e)}")
+            return
+
+        # 表示済みの結果を書き出してから、以降の結果を追記
+        self.live_exporter.write_many(self.result_table.rows)
+        self.live_exporter.flush()
+        self.live_pending = {}
+        self.result_status.config(
+            text=f"ライブ出力中: {os.path.basename(filename)}（もう一度押すと終了）",
+            fg=self.colors['text_primary']
+        )
+
+    def stop_live_export(self):
+        """ライブ出力を終了（翻訳待ちの行も書き出して閉じる）"""
+        self.export_live_pending()
+        count = self.live_exporter.count
+        self.live_exporter.close()
+        self.live_exporter = None
+        self.result_status.config(text=f"✓ ライブ出力を終了しました（{count}件）", fg=self.colors['text_primary'])
+
+    def export_live_result(self, row_index: Optional[int], asin: str = '', wait_translation: bool = False):
+        """ライブ出力に1行書き出す（wait_translation=Trueなら翻訳の完了まで保留）"""
+        if not self.live_exporter or row_index is None:
+            return
+        if wait_translation:
+            self.live_pending[asin] = row_index
+        else:
+            self.live_pending.pop(asin, None)
+            self.live_exporter.write(self.result_table.rows[row_index])
+
+    def export_live_pending(self):
+        """翻訳待ちで保留していた行を書き出す"""
+        if not self.live_exporter:
+            return
+        for row_index in self.live_pending.values():
+            self.live_exporter.write(self.result_table.rows[row_index])
+        self.live_pending = {}
+        self.live_exporter.flush()
 
     def open_prompt_editor(self):
         """プロンプト編集ウィンドウを開く"""
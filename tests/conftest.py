@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import keyword_extractor_cute as kec  # noqa: E402
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    """作業ディレクトリを一時ディレクトリにしたKeywordExtractor（待機なし・AIなし）"""
+    monkeypatch.chdir(tmp_path)
+    extractor = kec.KeywordExtractor()
+    extractor.use_ai = False
+    extractor.rate_limiter.min = extractor.rate_limiter.max = 0
+    extractor.translation_rate_limiter.min = extractor.translation_rate_limiter.max = 0
+    return extractor
+
+
+def stub_fetch(titles):
+    """ASIN → (タイトル, ブランド) の辞書から商品ページ取得の代わりを作る"""
+    def fetch(asin, region='jp', brand_only=False):
+        return titles[asin]
+    return fetch
+
+
+# テスト用タイトルの材料（日本語・英語・型番・区切り文字・全角文字などを混ぜる）
+TITLE_WORDS = [
+    'ソニー', 'ワイヤレス', 'イヤホン', 'ノイズキャンセリング', 'ブルートゥース', 'パナソニック',
+    'ドライヤー', 'ナノケア', 'マイナスイオン', 'コーヒー・メーカー', 'ステンレス', 'ボトル',
+    '充電器', '急速充電', '国内正規品', '大容量', '防水', '対応', '日本製', '軽量',
+    'ばね', 'かわいい', 'の', 'と', 'に', 'おしゃれ',
+    'Sony', 'SONY', 'Anker', 'Apple', 'iPhone', 'USB-C', 'Type-C', 'WH-1000XM5', 'PD_65W',
+    'Wireless', 'Earbuds', 'Bluetooth', 'Noise', 'Cancelling', 'with', 'for', 'and', 'Pro',
+    'GIGABYTE', 'NVIDIA', 'RTX4090', '16GB', '2024', '3個', '500ml', '1.5m', 'x2', 'A4',
+    'ＵＳＢ', '１００Ｗ', '®', 'No.1', 'e-Bike', 'co.jp', '&', '+', 'ー', '・', 'ｶﾀｶﾅ',
+]
+TITLE_SEPARATORS = [' ', ' ', ' ', '　', ',', '，', '、', '。', '・', '/', '／', '｜', '|', ' - ', '']
+TITLE_BRACKETS = [('【', '】'), ('[', ']'), ('(', ')'), ('（', '）'), ('「', '」'), ('『', '』')]
+
+
+def generate_titles(count, seed=0):
+    """乱数の種を固定して商品タイトル風の文字列を作る"""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 14)):
+            word = rng.choice(TITLE_WORDS)
+            if rng.random() < 0.1:
+                opening, closing = rng.choice(TITLE_BRACKETS)
+                word = opening + word + closing
+            parts.append(word)
+            parts.append(rng.choice(TITLE_SEPARATORS))
+        titles.append(''.join(parts).strip() if rng.random() < 0.9 else ''.join(parts))
+    return titles
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from conftest import generate_titles, kec
+
+MODES = ['strict', 'moderate', 'loose']
+
+
+def generate_brands(titles, seed):
+    """空・タイトルの単語・単語の一部・大手ブランド（大文字小文字違いを含む）を混ぜたブランド名"""
+    rng = random.Random(seed)
+    brands = []
+    for title in titles:
+        words = kec.extract_words_from_title(title)
+        choice = rng.random()
+        if choice < 0.2 or not words:
+            brand = ''
+        elif choice < 0.5:
+            brand = rng.choice(words)
+        elif choice < 0.7:
+            word = rng.choice(words)
+            brand = word[:rng.randint(1, len(word))]
+        else:
+            brand = rng.choice(kec.LOOSE_MODE_MAJOR_BRANDS + ['sony', 'SONY', 'Anker'])
+        brands.append(brand)
+    return brands
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('include_brand', [True, False])
+def test_extract_many_matches_per_title_extraction(extractor, mode, include_brand):
+    titles = generate_titles(20000, seed=29)
+    brands = generate_brands(titles, seed=29)
+    expected = [extractor.extract_keywords_rule_based(title, mode, include_brand, brand)
+                for title, brand in zip(titles, brands)]
+    actual = extractor.extract_many(titles, mode, include_brand, brands)
+    mismatches = [(title, brand, want, got)
+                  for title, brand, want, got in zip(titles, brands, expected, actual) if want != got]
+    assert mismatches == []
+
+
+def test_extract_many_looks_up_brands(extractor):
+    titles = generate_titles(2000, seed=30)
+    for mode in MODES:
+        expected = [extractor.extract_keywords_rule_based(title, mode, True, extractor.extract_brand(title))
+                    for title in titles]
+        assert extractor.extract_many(titles, mode) == expected
+
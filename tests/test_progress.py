@@ -0,0 +1,88 @@
+import json
+import os
+import tracemalloc
+
+from conftest import kec
+
+
+def recorded(journal):
+    return [asin for batch in journal.iter_processed_asins() for asin in batch]
+
+
+def test_checkpoint_does_not_rewrite_journal(tmp_path):
+    """チェックポイントはジャーナルを書き直さず、スナップショットも件数に比例して大きくならない"""
+    snapshot = str(tmp_path / 'progress.json')
+    journal = kec.ProgressJournal(snapshot, commit_every=50, compact_every=100)
+    snapshot_sizes = []
+    for i in range(5000):
+        journal.append(f'B{i:09d}')
+        if i % 1000 == 999:
+            snapshot_sizes.append(os.path.getsize(snapshot))
+    journal.compact()
+
+    # 最初に書いた行は同じ位置に残っている（追記のみ）
+    with open(journal.journal_path, 'r', encoding='utf-8') as f:
+        assert json.loads(f.readline())['asin'] == 'B000000000'
+    assert max(snapshot_sizes) < 300
+    with open(snapshot, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    assert 'processed_asins' not in checkpoint
+    assert checkpoint['journal_offset'] == os.path.getsize(journal.journal_path)
+
+    reloaded = kec.ProgressJournal(snapshot)
+    assert reloaded.load()['processed_count'] == 5000
+    assert recorded(reloaded) == [f'B{i:09d}' for i in range(5000)]
+
+
+def test_legacy_snapshot_moves_into_journal(tmp_path):
+    """旧形式（ASINの一覧を含むスナップショット）は次のチェックポイントでジャーナルに移す"""
+    snapshot = tmp_path / 'progress.json'
+    snapshot.write_text(json.dumps({'processed_asins': ['B000000001', 'B000000002'], 'stats': {'total': 2}}),
+                        encoding='utf-8')
+    (tmp_path / 'progress.jsonl').write_text(json.dumps({'asin': 'B000000003'}) + '\n', encoding='utf-8')
+
+    journal = kec.ProgressJournal(str(snapshot))
+    assert journal.load()['processed_count'] == 3
+    assert recorded(journal) == ['B000000001', 'B000000002', 'B000000003']
+    journal.append('B000000004')
+    journal.compact()
+
+    assert 'processed_asins' not in json.loads(snapshot.read_text(encoding='utf-8'))
+    reloaded = kec.ProgressJournal(str(snapshot))
+    assert reloaded.load()['stats'] == {'total': 2}
+    assert recorded(reloaded) == ['B000000001', 'B000000002', 'B000000003', 'B000000004']
+
+
+def test_large_resume_streams_journal_into_bloom_filter(extractor, tmp_path):
+    """大きなジャーナルからの再開で処理済みの一覧をメモリに載せずに未処理だけを判定する"""
+    processed_total = 300000
+    asin = 'B{:09d}'.format
+    snapshot = str(tmp_path / 'job' / 'progress.json')
+    os.makedirs(os.path.dirname(snapshot))
+
+    # 処理済みASINをジャーナルとジョブストアの両方に記録（process_asinsと同じ状態）
+    with open(os.path.splitext(snapshot)[0] + '.jsonl', 'w', encoding='utf-8') as f:
+        for i in range(processed_total):
+            f.write(json.dumps({'asin': asin(i)}) + '\n')
+    store = kec.JobStore(str(tmp_path / 'job' / 'progress.db'))
+    store.conn.executemany("INSERT INTO results (asin, status) VALUES (?, 'completed')",
+                           ((asin(i),) for i in range(processed_total)))
+    store.conn.commit()
+
+    tracemalloc.start()
+    try:
+        journal = kec.ProgressJournal(snapshot)
+        assert extractor.load_progress(snapshot, journal)['processed_count'] == processed_total
+        check, processed_count = extractor.processed_checker(
+            store, journal.iter_processed_asins(), bloom_threshold=100000)
+        unprocessed = list(extractor.iter_unprocessed_asins(
+            (asin(i) for i in range(processed_total - 1000, processed_total + 1000)), check))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        store.close()
+
+    assert processed_count == processed_total
+    assert unprocessed == [asin(i) for i in range(processed_total, processed_total + 1000)]
+    # 30万件のASIN文字列を一覧で持つだけで約20MBになる
+    assert peak < 10 * 1024 * 1024
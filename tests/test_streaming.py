@@ -0,0 +1,51 @@
+from conftest import kec, stub_fetch
+
+
+def collect_events(events):
+    return lambda status, index, total, asin, result: events.append((status, index, asin, result))
+
+
+def test_process_titles_streams_results(extractor, monkeypatch):
+    """collect_results=Falseでも保持する場合と同じ結果を順に通知し、重複タイトルは直近の分だけ覚える"""
+    monkeypatch.setattr(kec, 'TITLE_DEDUP_WINDOW', 8)
+    titles = [f'Acme Running Shoes Model{i % 20} Black' for i in range(100)]
+
+    collected = extractor.process_titles(titles, 'moderate', 'none', False, batch_size=7)
+    events = []
+    returned = extractor.process_titles(titles, 'moderate', 'none', False, batch_size=7,
+                                        progress_callback=collect_events(events), collect_results=False)
+
+    assert returned == []
+    completed = [(index, result) for status, index, _, result in events if status == 'completed']
+    assert [index for index, _ in completed] == list(range(1, 101))
+    assert [result for _, result in completed] == collected
+
+
+def test_process_asins_streams_results_to_job_store(extractor):
+    """collect_results=Falseなら結果はジョブストアとイベントにだけ渡し、再開時もストアから少しずつ復元する"""
+    asins = [f'B{i:09d}' for i in range(30)]
+    extractor.fetch_product_info_from_asin = stub_fetch(
+        {asin: (f'Acme Running Shoes {asin}', 'Acme') for asin in asins})
+
+    events = []
+    stop_after = 12
+    returned = extractor.process_asins(
+        asins, 'moderate', 'none', False, batch_size=10, batch_cooldown=0, collect_results=False,
+        progress_callback=collect_events(events),
+        should_stop_callback=lambda: sum(status == 'completed' for status, *_ in events) >= stop_after)
+    assert returned == []
+
+    events = []
+    returned = extractor.process_asins(asins, 'moderate', 'none', False, batch_size=10, batch_cooldown=0,
+                                       collect_results=False, progress_callback=collect_events(events))
+    assert returned == []
+    restored = [asin for status, _, asin, _ in events if status == 'restored']
+    completed = [asin for status, _, asin, _ in events if status == 'completed']
+    assert restored == asins[:stop_after]
+    assert completed == asins[stop_after:]
+
+    store = kec.JobStore(extractor.job_paths(extractor.last_job_id)['store'])
+    try:
+        assert [result['asin'] for result in store.iter_results(batch_size=7)] == asins
+    finally:
+        store.close()
@@ -0,0 +1,41 @@
+import re
+
+from conftest import generate_titles, kec
+
+
+def split_words_from_title(title):
+    """以前の実装（区切り文字で分割し、日本語を含む部分はさらに文字種ごとに分割）"""
+    words = []
+    for part in re.split(r'[\s,，、。・/／｜|\[\]()（）【】「」『』]+', title):
+        if not part:
+            continue
+        if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', part):
+            words.extend(re.findall(r'[\u30A0-\u30FF]+|[\u4E00-\u9FAF]+|[A-Za-z0-9\-_]+', part))
+        else:
+            words.append(part)
+    return list(dict.fromkeys(word for word in words if word))
+
+
+EDGE_CASES = [
+    '', ' ', '・', 'ー', '・・', 'コーヒー・メーカー', '・カタカナ・', 'ソニー・WH-1000XM5',
+    'ばねばかり', 'ばねtypeC', 'USB-Cケーブル1.5m', 'A4コピー用紙500枚', '®ソニー', 'No.1人気',
+    '【Anker】充電器', '[SONY]', '(x2)', 'ＵＳＢケーブル', 'ｶﾀｶﾅと漢字', 'PD_65W急速', 'ー長音',
+    'abc　def', 'e-Bike。電動', 'co.jp/限定', 'a||b', '//', '漢字の連続と々', 'ヴァヷヺ・ヽヾヿ',
+]
+
+
+def test_tokenizer_matches_split_implementation():
+    titles = EDGE_CASES + generate_titles(120000, seed=28)
+    mismatches = [
+        (title, split_words_from_title(title), kec.extract_words_from_title(title))
+        for title in titles
+        if kec.extract_words_from_title(title) != split_words_from_title(title)
+    ]
+    assert mismatches == []
+
+
+def test_tokenizer_offsets_point_at_tokens():
+    for title in EDGE_CASES + generate_titles(5000, seed=29):
+        spans = kec.tokenize_title(title)
+        assert [token for token, _, _ in spans] == split_words_from_title(title)
+        assert all(title[start:end] == token for token, start, end in spans)
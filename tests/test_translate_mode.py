@@ -0,0 +1,24 @@
+import pytest
+
+from conftest import kec
+
+
+def test_normalize_translate_mode():
+    normalize = kec.KeywordExtractor.normalize_translate_mode
+    assert normalize('none') == 'none'
+    assert normalize('auto') == 'auto'
+    assert normalize('ja_to_en') == 'auto'
+    assert normalize('en_to_ja') == 'auto'
+    with pytest.raises(ValueError):
+        normalize('あり')
+
+
+def test_unknown_translate_mode_is_rejected(extractor, tmp_path):
+    with pytest.raises(ValueError):
+        extractor.process_single_title("ソニー ワイヤレスイヤホン", 'normal', 'fr_to_de', False)
+    with pytest.raises(ValueError):
+        extractor.process_titles(["ソニー ワイヤレスイヤホン"], 'normal', 'both', False)
+    with pytest.raises(ValueError):
+        extractor.process_asins(["B000000001"], 'normal', 'both', False)
+    # ジョブを作る前に止まる
+    assert not (tmp_path / '.jobs').exists()
@@ -0,0 +1,119 @@
+import sys
+import threading
+import types
+
+from conftest import kec, stub_fetch
+
+
+def test_translation_stage_delivers_translations(extractor):
+    """ASIN処理の自動判定翻訳がバックグラウンドのステージから届く"""
+    extractor.fetch_product_info_from_asin = stub_fetch({
+        'B000000001': ('ナイキ ランニングシューズ 黒', 'ナイキ'),
+    })
+    calls = []
+
+    def translate_many(texts, dest):
+        calls.append((list(texts), dest))
+        return [f'{dest}:{text}' for text in texts]
+    extractor.translate_many = translate_many
+
+    events = []
+    results = extractor.process_asins(
+        ['B000000001'], 'moderate', 'auto', False, batch_cooldown=0, enable_progress_save=False,
+        progress_callback=lambda status, index, total, asin, result: events.append((status, asin, result)))
+
+    assert len(calls) == 1 and calls[0][1] == 'en'
+    translated = [result for status, _, result in events if status == 'translated']
+    assert len(translated) == 1
+    keywords = results[0]['keywords']
+    assert keywords
+    assert translated[0]['translated_keywords'] == [f'en:{keyword}' for keyword in keywords]
+
+
+class Translated:
+    def __init__(self, text, src, dest):
+        self.text = text
+        self.src = src
+        self.dest = dest
+
+
+class StubTranslator:
+    """googletrans 4.0.0rc1 の Translator.translate と同じ引数（1件の文字列）を受ける翻訳スタブ"""
+
+    instances = []
+
+    def __init__(self):
+        self.calls = []
+        self.thread = threading.current_thread()
+        StubTranslator.instances.append(self)
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        self.calls.append(text)
+        if not isinstance(text, str):
+            # 4.0.0rc1はリストを1つのリクエストにまとめ、反復できない結果を1件だけ返す
+            return Translated(repr(text), src, dest)
+        return Translated(f'<{text}>', src, dest)
+
+
+def install_stub_translator(monkeypatch):
+    StubTranslator.instances = []
+    monkeypatch.setitem(sys.modules, 'googletrans', types.SimpleNamespace(Translator=StubTranslator))
+
+
+def test_translate_many_sends_one_text_per_call(extractor, monkeypatch):
+    """未翻訳のテキストを重複を除いて1件ずつ翻訳し、キャッシュに保存する"""
+    install_stub_translator(monkeypatch)
+
+    texts = ['試験用語その一', '試験用語その二', '試験用語その一']
+    assert extractor.translate_many(texts, 'en') == ['<試験用語その一>', '<試験用語その二>', '<試験用語その一>']
+    translator, = StubTranslator.instances
+    assert translator.calls == ['試験用語その一', '試験用語その二']
+    assert extractor.translation_cache.get('試験用語その二', 'ja', 'en') == '<試験用語その二>'
+
+    # キャッシュ済みのテキストは再送信しない
+    assert extractor.translate_many(['試験用語その二'], 'en') == ['<試験用語その二>']
+    assert len(translator.calls) == 2
+
+
+def test_translator_is_not_shared_between_threads(extractor, monkeypatch):
+    """翻訳ワーカーのスレッドごとに別の翻訳クライアントを使う"""
+    install_stub_translator(monkeypatch)
+
+    def work(index):
+        extractor.translate_many([f'試験用語スレッド{index}'], 'en')
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(StubTranslator.instances) == 2
+    assert {translator.thread for translator in StubTranslator.instances} == set(threads)
+    cache = extractor.translation_cache
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_translation_stage_failure_keeps_results(extractor):
+    """翻訳ステージで失敗した結果も捨てずに原文のキーワードで通知・保存する"""
+    extractor.fetch_product_info_from_asin = stub_fetch({
+        'B000000001': ('ナイキ ランニングシューズ 黒', 'ナイキ'),
+    })
+
+    def translate_many(texts, dest):
+        raise RuntimeError('translator down')
+    extractor.translate_many = translate_many
+
+    events = []
+    results = extractor.process_asins(
+        ['B000000001'], 'moderate', 'auto', False, batch_cooldown=0,
+        progress_callback=lambda status, index, total, asin, result: events.append((status, asin, result)))
+
+    failed = [result for status, _, result in events if status == 'translation_failed']
+    assert len(failed) == 1
+    assert failed[0]['translated_keywords'] == results[0]['keywords']
+
+    store = kec.JobStore(extractor.job_paths(extractor.last_job_id)['store'])
+    try:
+        assert store.load_results()[0]['translated_keywords'] == results[0]['keywords']
+    finally:
+        store.close()
@@ -0,0 +1,62 @@
+import random
+
+from conftest import generate_titles, TITLE_WORDS
+
+
+def nested_loop_validate(keywords, title, title_words):
+    """以前の実装（キーワードの単語ごとにタイトルの全単語を走査）"""
+    title_lower = title.lower()
+    title_words_lower = [word.lower() for word in title_words]
+    validated = []
+    for keyword in keywords:
+        keyword_lower = keyword.lower().strip()
+        if not keyword_lower:
+            continue
+        if any(phrase in keyword for phrase in ['です', 'ます', 'について', 'キーワード', '制造', '製造', 'された', '→', '例:', '例）']):
+            continue
+        if len(keyword) > 100:
+            continue
+        if keyword_lower in title_lower:
+            validated.append(keyword)
+            continue
+        keyword_words = keyword.split()
+        if keyword_words and all(
+            any(kw_word.lower() == title_word or kw_word.lower() in title_word or title_word in kw_word.lower()
+                for title_word in title_words_lower)
+            for kw_word in keyword_words
+        ):
+            validated.append(keyword)
+    return validated
+
+
+def generate_keywords(rng, title_words):
+    """タイトルの単語・その一部・組み合わせ・無関係な単語からAIの出力風のキーワードを作る"""
+    candidates = list(title_words) + rng.sample(TITLE_WORDS, 5) + ['', '  ', 'です', 'x' * 101]
+    keywords = []
+    for _ in range(rng.randint(1, 8)):
+        words = []
+        for _ in range(rng.randint(1, 3)):
+            word = rng.choice(candidates)
+            if word and rng.random() < 0.3:
+                start = rng.randrange(len(word))
+                word = word[start:rng.randint(start + 1, len(word))]
+            if rng.random() < 0.2:
+                word = word.upper() if rng.random() < 0.5 else word.lower()
+            if rng.random() < 0.1:
+                word += rng.choice(['s', 'ケース', '2'])
+            words.append(word)
+        keywords.append(' '.join(words))
+    return keywords
+
+
+def test_indexed_validation_matches_nested_loops(extractor):
+    rng = random.Random(26)
+    mismatches = []
+    for title in generate_titles(20000, seed=26):
+        title_words = extractor._extract_words_from_title(title)
+        keywords = generate_keywords(rng, title_words)
+        expected = nested_loop_validate(keywords, title, title_words)
+        actual = extractor.validate_ai_keywords(keywords, title)
+        if actual != expected:
+            mismatches.append((title, keywords, expected, actual))
+    assert mismatches == []